@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Compares batch and per-frame KISS escape/recover functions.
+
+Usage: python benchmarks/bench_escape.py
+
+Set KISS_SPEEDUPS=0 to compare the pure-Python implementations.
+"""
+
+import random
+import timeit
+
+import traffic  # Also puts the repository's kiss on sys.path.
+
+import kiss  # NOQA pylint: disable=C0411
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+FRAME_COUNT = 10000
+REPEAT = 5
+SEED = 2017
+FRAME_SIZE = 96
+
+
+def main():
+    """Runs the benchmark and prints frames/sec for each function."""
+    print('speedups: {}'.format(kiss.util._speedups is not None))  # NOQA pylint: disable=W0212
+    rng = random.Random(SEED)
+    batches = {
+        'plain': traffic.frames(rng, FRAME_COUNT, FRAME_SIZE),
+        'escaped': traffic.frames(rng, FRAME_COUNT, FRAME_SIZE, 0.03),
+    }
+
+    for label, frames in sorted(batches.items()):
+        escaped = [kiss.escape_special_codes(frame) for frame in frames]
+        cases = [
+            ('escape_special_codes',
+             lambda: [kiss.escape_special_codes(frame) for frame in frames]),
+            ('escape_many', lambda: kiss.escape_many(frames)),
+            ('recover_special_codes',
+             lambda: [kiss.recover_special_codes(frame) for frame in escaped]),
+            ('recover_many', lambda: kiss.recover_many(escaped)),
+        ]
+
+        for name, func in cases:
+            best = min(timeit.repeat(func, number=1, repeat=REPEAT))
+            print('{:<8}{:<24}{:>14,.0f} frames/sec'.format(
+                label, name, FRAME_COUNT / best))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks the KISS encode/decode hot paths.
+
+Each case is run over synthetic APRS traffic for every combination of frame
+size, escape density and read chunk size, and reported in frames/sec and
+bytes/sec as one JSON object per line.
+
+Usage::
+
+    python benchmarks/bench_kiss.py > results.jsonl
+    python benchmarks/bench_kiss.py --compare results.jsonl
+
+With `--compare`, cases more than `--threshold` slower than the baseline
+are reported and the exit status is 1.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import timeit
+
+import traffic  # Also puts the repository's kiss on sys.path.
+
+import kiss  # NOQA pylint: disable=C0411
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+FRAME_COUNT = 2000
+REPEAT = 5
+SEED = 2017
+
+FRAME_SIZES = (32, 128, 256)
+ESCAPE_DENSITIES = (0.0, 0.01, 0.1)
+CHUNK_SIZES = (64, 1000, 4096)
+
+
+def bench_escape(frames, **_):
+    """Times `escape_special_codes` per frame."""
+    escape = kiss.escape_special_codes
+    return lambda: [escape(frame) for frame in frames]
+
+
+def bench_recover(frames, **_):
+    """Times `recover_special_codes` per frame."""
+    recover = kiss.recover_special_codes
+    escaped = [kiss.escape_special_codes(frame) for frame in frames]
+    return lambda: [recover(frame) for frame in escaped]
+
+
+def bench_escape_many(frames, **_):
+    """Times `escape_many` over the whole batch."""
+    return lambda: kiss.escape_many(frames)
+
+
+def bench_read(frames, chunk_size, rng, **_):
+    """Times `KISS.read` deframing a fragmented stream."""
+    chunk_list = traffic.chunks(
+        rng, traffic.kiss_stream(frames), chunk_size, jitter=0.5)
+
+    def run():
+        read_data = iter(chunk_list)
+        ks = kiss.KISS()
+        ks._read_handler = lambda read_bytes=None: next(read_data)  # NOQA pylint: disable=W0212
+        for _ in chunk_list:
+            ks.read(readmode=False)
+    return run
+
+
+def bench_write(frames, **_):
+    """Times `KISS.write` encoding each frame."""
+    ks = kiss.KISS()
+    ks._write_handler = len  # NOQA pylint: disable=W0212
+    write = ks.write
+    return lambda: [write(frame) for frame in frames]
+
+
+def bench_write_many(frames, **_):
+    """Times `KISS.write_many` encoding the whole batch."""
+    ks = kiss.KISS()
+    ks._write_handler = len  # NOQA pylint: disable=W0212
+    return lambda: ks.write_many(frames)
+
+
+# Cases, and whether they depend on the read chunk size.
+CASES = [
+    (bench_escape, False),
+    (bench_recover, False),
+    (bench_escape_many, False),
+    (bench_read, True),
+    (bench_write, False),
+    (bench_write_many, False),
+]
+
+
+def run_benchmarks(cases, frame_count=FRAME_COUNT, repeat=REPEAT):
+    """Runs every case over the parameter grid, yielding result dicts."""
+    for case, chunked in cases:
+        for size in FRAME_SIZES:
+            for density in ESCAPE_DENSITIES:
+                for chunk_size in CHUNK_SIZES if chunked else (None,):
+                    rng = random.Random(SEED)
+                    frames = traffic.frames(rng, frame_count, size, density)
+                    byte_count = sum(map(len, frames))
+                    func = case(frames=frames, chunk_size=chunk_size, rng=rng)
+                    best = min(timeit.repeat(func, number=1, repeat=repeat))
+                    yield {
+                        'case': case.__name__[len('bench_'):],
+                        'frame_size': size,
+                        'escape_density': density,
+                        'chunk_size': chunk_size,
+                        'frames_per_sec': round(frame_count / best),
+                        'bytes_per_sec': round(byte_count / best),
+                        'python': platform.python_version(),
+                        'speedups': kiss.util._speedups is not None,  # NOQA pylint: disable=W0212
+                    }
+
+
+def _key(result):
+    return (result['case'], result['frame_size'], result['escape_density'],
+            result['chunk_size'])
+
+
+def compare(results, baseline_file, threshold):
+    """
+    Reports results slower than the baseline by more than `threshold`.
+
+    :returns: Number of regressions.
+    :rtype: int
+    """
+    with open(baseline_file) as baseline_lines:
+        baseline = {
+            _key(result): result
+            for result in map(json.loads, baseline_lines)}
+
+    regressions = 0
+    for result in results:
+        before = baseline.get(_key(result))
+        if before is None:
+            continue
+        change = result['bytes_per_sec'] / before['bytes_per_sec'] - 1
+        if change < -threshold:
+            regressions += 1
+            print('REGRESSION {} {:+.1%}'.format(
+                json.dumps(result, sort_keys=True), change), file=sys.stderr)
+    return regressions
+
+
+def main():
+    """Parses arguments and runs the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument(
+        '--case', action='append',
+        help='Case to run, e.g. read. May be repeated. Default: all.')
+    parser.add_argument('--frames', type=int, default=FRAME_COUNT)
+    parser.add_argument('--repeat', type=int, default=REPEAT)
+    parser.add_argument('--compare', metavar='BASELINE')
+    parser.add_argument('--threshold', type=float, default=0.1)
+    args = parser.parse_args()
+
+    cases = [
+        (case, chunked) for case, chunked in CASES
+        if not args.case or case.__name__[len('bench_'):] in args.case]
+
+    results = []
+    for result in run_benchmarks(cases, args.frames, args.repeat):
+        results.append(result)
+        print(json.dumps(result, sort_keys=True))
+        sys.stdout.flush()
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
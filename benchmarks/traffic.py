@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Synthetic AX.25/APRS traffic generators for KISS benchmarks.
+
+All generators take a `random.Random` instance so runs are reproducible.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import kiss  # NOQA pylint: disable=C0413
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+CALLSIGNS = ['W2GMD', 'WB2OSZ', 'KF6ABC', 'N0CALL', 'K6BSD', 'AE6EO']
+PATHS = [[], ['WIDE1-1'], ['WIDE1-1', 'WIDE2-1'], ['K6BSD-1*', 'WIDE2-1']]
+APRS_TEXT = (
+    b'!3745.75NI12228.05W#W2GMD-6 Inner Sunset, SF iGate/Digipeater '
+    b'http://w2gmd.org T#939,10.9,4.5,57.0,1.0,18.0,00000000 ')
+
+
+def aprs_frame(rng, size=128, escape_density=0.0):
+    """
+    Builds an AX.25 UI frame of about `size` bytes. `escape_density` is the
+    fraction of information field bytes replaced by FEND or FESC.
+    """
+    header = kiss.ax25.encode_ui(
+        'APRS',
+        '{}-{}'.format(rng.choice(CALLSIGNS), rng.randint(0, 15)),
+        rng.choice(PATHS))
+
+    info_length = max(size - len(header), 1)
+    start = rng.randrange(len(APRS_TEXT))
+    info = bytearray((APRS_TEXT * (info_length // len(APRS_TEXT) + 2))[
+        start:start + info_length])
+    for _ in range(int(info_length * escape_density)):
+        info[rng.randrange(info_length)] = rng.choice((0xC0, 0xDB))
+    return header + bytes(info)
+
+
+def frames(rng, count, size=128, escape_density=0.0):
+    """Builds a list of `count` frames."""
+    return [aprs_frame(rng, size, escape_density) for _ in range(count)]
+
+
+def kiss_stream(frame_list):
+    """Encodes frames as a KISS byte stream, as read from a TNC."""
+    return kiss.Framer().encode_many(frame_list)
+
+
+def chunks(rng, data, chunk_size=1000, jitter=0.0):
+    """
+    Splits a stream into read-sized chunks. With `jitter`, each chunk size
+    varies by up to that fraction, fragmenting frames at random places.
+    """
+    result = []
+    position = 0
+    while position < len(data):
+        size = chunk_size
+        if jitter:
+            size = max(1, int(size * (1 + rng.uniform(-jitter, jitter))))
+        result.append(data[position:position + size])
+        position += size
+    return result
@@ -16,21 +16,44 @@ Python KISS Module.
 """
 
 from .constants import (LOG_FORMAT, LOG_LEVEL, SERIAL_TIMEOUT, READ_BYTES,  # NOQA
+                        MAX_FRAME_SIZE, INTER_BYTE_CHARS, SERIAL_READ_WINDOW,
                         FEND, FESC, TFEND, TFESC, FESC_TFEND, FESC_TFESC,
                         DATA_FRAME, TX_DELAY, PERSISTENCE, SLOT_TIME, TX_TAIL,
                         FULL_DUPLEX, SET_HARDWARE, RETURN, DATAFRAME, TXDELAY,
                         P, SLOTTIME, TXTAIL, FULLDUPLEX, SETHARDWARE,
                         DEFAULT_KISS_CONFIG_VALUES, KISS_ON, KISS_OFF,
-                        NMEA_HEADER, UI_PROTOCOL_ID)
+                        NMEA_HEADER, UI_PROTOCOL_ID, IOV_MAX, TRACE,
+                        TRACE_SAMPLE, READER_POLICIES, RECONNECT_DELAY,
+                        MAX_RECONNECT_DELAY, KEEPALIVE_PROBES, DEDUP_TTL,
+                        DEDUP_SIZE, SPEEDUPS)
 
-from .exceptions import SocketClosetError  # NOQA
+from .exceptions import SocketClosetError, FrameError  # NOQA
 
-from .util import (escape_special_codes, recover_special_codes, extract_ui,  # NOQA
-                   strip_df_start, strip_nmea)
+from .util import (escape_special_codes, recover_special_codes, escape_many,  # NOQA
+                   recover_many, extract_ui, strip_df_start, strip_nmea)
 
-from .classes import KISS, TCPKISS, SerialKISS  # NOQA
+from .stats import Stats, StatsServer  # NOQA
 
+from .dedup import DedupCache  # NOQA
 
+from .classes import (Deframer, Framer, KISS, TCPKISS, AsyncTCPKISS,  # NOQA
+                      SerialKISS, Multiplexer)
+
+from .ax25 import AX25Frame  # NOQA
+
+from .server import KISSServer  # NOQA
+
+from .capture import KISSFileWriter, KISSFileReader  # NOQA
+
+from .igate import IGate, APRSISUplink  # NOQA
+
+from .digi import Digipeater  # NOQA
+
+from .filters import (by_source, by_destination, by_pid, by_port,  # NOQA
+                      compile_filters, filter_frames)
+
+
+__version__ = '7.0.0'
 __author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
 __copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
 __license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
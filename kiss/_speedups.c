@@ -0,0 +1,577 @@
+/*
+ * Python KISS Module Speedups.
+ *
+ * Optional C implementations of the KISS escape codecs, single and batch,
+ * and the Deframer's per-chunk state machine. See kiss/util.py and
+ * kiss.classes.Deframer for the pure-Python implementations they must
+ * match.
+ *
+ * Author: Greg Albrecht W2GMD <oss@undef.net>
+ * Copyright 2017 Greg Albrecht and Contributors
+ * License: Apache License, Version 2.0
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <string.h>
+
+#define FEND 0xC0
+#define FESC 0xDB
+#define TFEND 0xDC
+#define TFESC 0xDD
+
+
+PyDoc_STRVAR(escape_special_codes__doc__,
+"escape_special_codes(raw_codes)\n"
+"--\n"
+"\n"
+"Escape special codes, per KISS spec, in one pass. Returns bytes.");
+
+static PyObject *
+escape_special_codes(PyObject *module, PyObject *arg)
+{
+    Py_buffer view;
+    const unsigned char *src;
+    unsigned char *dst;
+    Py_ssize_t i, extra = 0;
+    PyObject *result;
+
+    if (PyObject_GetBuffer(arg, &view, PyBUF_SIMPLE) < 0)
+        return NULL;
+    src = (const unsigned char *)view.buf;
+    for (i = 0; i < view.len; i++) {
+        if (src[i] == FEND || src[i] == FESC)
+            extra++;
+    }
+
+    if (!extra && PyBytes_CheckExact(arg)) {
+        PyBuffer_Release(&view);
+        Py_INCREF(arg);
+        return arg;
+    }
+
+    result = PyBytes_FromStringAndSize(NULL, view.len + extra);
+    if (result == NULL) {
+        PyBuffer_Release(&view);
+        return NULL;
+    }
+    dst = (unsigned char *)PyBytes_AS_STRING(result);
+    for (i = 0; i < view.len; i++) {
+        if (src[i] == FEND) {
+            *dst++ = FESC;
+            *dst++ = TFEND;
+        } else if (src[i] == FESC) {
+            *dst++ = FESC;
+            *dst++ = TFESC;
+        } else {
+            *dst++ = src[i];
+        }
+    }
+    PyBuffer_Release(&view);
+    return result;
+}
+
+
+PyDoc_STRVAR(recover_special_codes__doc__,
+"recover_special_codes(escaped_codes)\n"
+"--\n"
+"\n"
+"Recover special codes, per KISS spec, in one pass. Returns bytes.");
+
+static PyObject *
+recover_special_codes(PyObject *module, PyObject *arg)
+{
+    Py_buffer view;
+    const unsigned char *src;
+    unsigned char *dst, *start;
+    Py_ssize_t i;
+    PyObject *result;
+
+    if (PyObject_GetBuffer(arg, &view, PyBUF_SIMPLE) < 0)
+        return NULL;
+    src = (const unsigned char *)view.buf;
+
+    if (PyBytes_CheckExact(arg) && memchr(src, FESC, view.len) == NULL) {
+        PyBuffer_Release(&view);
+        Py_INCREF(arg);
+        return arg;
+    }
+
+    result = PyBytes_FromStringAndSize(NULL, view.len);
+    if (result == NULL) {
+        PyBuffer_Release(&view);
+        return NULL;
+    }
+    start = dst = (unsigned char *)PyBytes_AS_STRING(result);
+    for (i = 0; i < view.len; i++) {
+        if (src[i] == FESC && i + 1 < view.len) {
+            if (src[i + 1] == TFEND) {
+                *dst++ = FEND;
+                i++;
+                continue;
+            }
+            if (src[i + 1] == TFESC) {
+                *dst++ = FESC;
+                i++;
+                continue;
+            }
+        }
+        *dst++ = src[i];
+    }
+    PyBuffer_Release(&view);
+    if (_PyBytes_Resize(&result, dst - start) < 0)
+        return NULL;
+    return result;
+}
+
+
+/* Gets a writable view of `offsets`, an array('L') of `count` items. */
+static int
+offsets_view(PyObject *offsets, Py_buffer *view, Py_ssize_t count)
+{
+    if (PyObject_GetBuffer(offsets, view, PyBUF_WRITABLE | PyBUF_FORMAT) < 0)
+        return -1;
+    if (view->itemsize != sizeof(unsigned long) || view->format == NULL ||
+            strcmp(view->format, "L") != 0 ||
+            view->len / view->itemsize != count) {
+        PyBuffer_Release(view);
+        PyErr_SetString(PyExc_ValueError,
+                        "offsets must be an array('L') of len(frames) + 1");
+        return -1;
+    }
+    return 0;
+}
+
+
+/* Gets the bytes of one frame of a batch: directly for bytes, else through
+   the buffer protocol, in which case `view->obj` is set to be released. */
+static int
+frame_bytes(PyObject *frame, Py_buffer *view, const unsigned char **buf,
+            Py_ssize_t *len)
+{
+    view->obj = NULL;
+    if (PyBytes_CheckExact(frame)) {
+        *buf = (const unsigned char *)PyBytes_AS_STRING(frame);
+        *len = PyBytes_GET_SIZE(frame);
+        return 0;
+    }
+    if (PyObject_GetBuffer(frame, view, PyBUF_SIMPLE) < 0)
+        return -1;
+    *buf = (const unsigned char *)view->buf;
+    *len = view->len;
+    return 0;
+}
+
+
+PyDoc_STRVAR(escape_many__doc__,
+"escape_many(frames, offsets)\n"
+"--\n"
+"\n"
+"Escape special codes in a sequence of frames into one buffer, per KISS\n"
+"spec. Fills `offsets`, an array('L') of len(frames) + 1, with the frame\n"
+"boundaries. Returns bytes.");
+
+static PyObject *
+escape_many(PyObject *module, PyObject *args)
+{
+    PyObject *frames, *offsets, *seq, **items, *result = NULL;
+    Py_buffer offsets_buf, view;
+    unsigned long *off;
+    const unsigned char *src;
+    unsigned char *dst;
+    Py_ssize_t count, k, i, len, extra;
+
+    if (!PyArg_ParseTuple(args, "OO:escape_many", &frames, &offsets))
+        return NULL;
+    seq = PySequence_Fast(frames, "frames must be a sequence");
+    if (seq == NULL)
+        return NULL;
+    count = PySequence_Fast_GET_SIZE(seq);
+    items = PySequence_Fast_ITEMS(seq);
+    if (offsets_view(offsets, &offsets_buf, count + 1) < 0) {
+        Py_DECREF(seq);
+        return NULL;
+    }
+    off = (unsigned long *)offsets_buf.buf;
+
+    /* First pass: the escaped length of each frame. */
+    off[0] = 0;
+    for (k = 0; k < count; k++) {
+        if (frame_bytes(items[k], &view, &src, &len) < 0)
+            goto release;
+        extra = 0;
+        for (i = 0; i < len; i++)
+            extra += (src[i] == FEND) | (src[i] == FESC);
+        PyBuffer_Release(&view);
+        off[k + 1] = off[k] + len + extra;
+    }
+
+    /* Second pass: copy frames without special codes, escape the rest. */
+    result = PyBytes_FromStringAndSize(NULL, off[count]);
+    if (result == NULL)
+        goto release;
+    dst = (unsigned char *)PyBytes_AS_STRING(result);
+    for (k = 0; k < count; k++) {
+        if (frame_bytes(items[k], &view, &src, &len) < 0)
+            goto error;
+        if (view.obj != NULL) {
+            /* Other objects could have been resized by a finalizer. */
+            extra = 0;
+            for (i = 0; i < len; i++)
+                extra += (src[i] == FEND) | (src[i] == FESC);
+            if (len + extra != (Py_ssize_t)(off[k + 1] - off[k])) {
+                PyBuffer_Release(&view);
+                PyErr_SetString(PyExc_RuntimeError, "frames changed size");
+                goto error;
+            }
+        }
+        if ((Py_ssize_t)(off[k + 1] - off[k]) == len) {
+            memcpy(dst, src, len);
+            dst += len;
+        } else {
+            for (i = 0; i < len; i++) {
+                if (src[i] == FEND) {
+                    *dst++ = FESC;
+                    *dst++ = TFEND;
+                } else if (src[i] == FESC) {
+                    *dst++ = FESC;
+                    *dst++ = TFESC;
+                } else {
+                    *dst++ = src[i];
+                }
+            }
+        }
+        PyBuffer_Release(&view);
+    }
+    goto release;
+
+error:
+    Py_CLEAR(result);
+release:
+    PyBuffer_Release(&offsets_buf);
+    Py_DECREF(seq);
+    return result;
+}
+
+
+PyDoc_STRVAR(recover_many__doc__,
+"recover_many(frames, offsets)\n"
+"--\n"
+"\n"
+"Recover special codes in a sequence of frames into one buffer, per KISS\n"
+"spec, each frame on its own. Fills `offsets`, an array('L') of\n"
+"len(frames) + 1, with the frame boundaries. Returns bytes.");
+
+static PyObject *
+recover_many(PyObject *module, PyObject *args)
+{
+    PyObject *frames, *offsets, *seq, **items, *result = NULL;
+    Py_buffer offsets_buf, view;
+    unsigned long *off;
+    const unsigned char *src, *end, *next;
+    unsigned char *dst, *start;
+    Py_ssize_t count, total = 0, k, len;
+
+    if (!PyArg_ParseTuple(args, "OO:recover_many", &frames, &offsets))
+        return NULL;
+    seq = PySequence_Fast(frames, "frames must be a sequence");
+    if (seq == NULL)
+        return NULL;
+    count = PySequence_Fast_GET_SIZE(seq);
+    items = PySequence_Fast_ITEMS(seq);
+    if (offsets_view(offsets, &offsets_buf, count + 1) < 0) {
+        Py_DECREF(seq);
+        return NULL;
+    }
+    off = (unsigned long *)offsets_buf.buf;
+
+    /* Recovering never lengthens a frame. */
+    for (k = 0; k < count; k++) {
+        if (frame_bytes(items[k], &view, &src, &len) < 0)
+            goto release;
+        total += len;
+        PyBuffer_Release(&view);
+    }
+    result = PyBytes_FromStringAndSize(NULL, total);
+    if (result == NULL)
+        goto release;
+    start = dst = (unsigned char *)PyBytes_AS_STRING(result);
+
+    off[0] = 0;
+    for (k = 0; k < count; k++) {
+        if (frame_bytes(items[k], &view, &src, &len) < 0)
+            goto error;
+        end = src + len;
+        if (dst - start + len > total) {
+            PyBuffer_Release(&view);
+            PyErr_SetString(PyExc_RuntimeError, "frames changed size");
+            goto error;
+        }
+        while (src < end) {
+            next = memchr(src, FESC, end - src);
+            if (next == NULL)
+                next = end;
+            memcpy(dst, src, next - src);
+            dst += next - src;
+            src = next;
+            if (src == end)
+                break;
+            if (src + 1 < end && src[1] == TFEND) {
+                *dst++ = FEND;
+                src += 2;
+            } else if (src + 1 < end && src[1] == TFESC) {
+                *dst++ = FESC;
+                src += 2;
+            } else {
+                *dst++ = *src++;
+            }
+        }
+        PyBuffer_Release(&view);
+        off[k + 1] = dst - start;
+    }
+
+    if (_PyBytes_Resize(&result, dst - start) < 0)
+        result = NULL;
+    goto release;
+
+error:
+    Py_CLEAR(result);
+release:
+    PyBuffer_Release(&offsets_buf);
+    Py_DECREF(seq);
+    return result;
+}
+
+
+/* State of the frame being reassembled by deframe(). */
+typedef struct {
+    const unsigned char *prefix;  /* Frame carried over from earlier chunks. */
+    Py_ssize_t prefix_len;        /* Bytes of `prefix` still part of it. */
+    unsigned char *out;           /* Bytes of it from this chunk. */
+    Py_ssize_t out_len;
+    Py_ssize_t length;            /* prefix_len + out_len. */
+    Py_ssize_t max_frame_size;    /* Or 0 for no limit. */
+    int discard;
+    Py_ssize_t aborted;
+    Py_ssize_t escape_errors;
+    Py_ssize_t overflows;
+} deframe_state;
+
+static void
+deframe_reset(deframe_state *state)
+{
+    state->prefix_len = 0;
+    state->out_len = 0;
+    state->length = 0;
+}
+
+static void
+deframe_append(deframe_state *state, const unsigned char *run, Py_ssize_t len)
+{
+    if (state->max_frame_size && state->length + len > state->max_frame_size) {
+        state->overflows++;
+        state->discard = 1;
+        deframe_reset(state);
+        return;
+    }
+    memcpy(state->out + state->out_len, run, len);
+    state->out_len += len;
+    state->length += len;
+}
+
+static void
+deframe_unescape(deframe_state *state, unsigned char code)
+{
+    unsigned char recovered;
+
+    if (code == TFEND) {
+        recovered = FEND;
+    } else if (code == TFESC) {
+        recovered = FESC;
+    } else {
+        state->escape_errors++;
+        return;
+    }
+    deframe_append(state, &recovered, 1);
+}
+
+/* Appends the frame, if any, to `frames`. Returns -1 on error, else 1 if a
+   frame was appended. */
+static int
+deframe_end(deframe_state *state, PyObject *frames)
+{
+    PyObject *frame;
+    char *dst;
+    int appended = 0;
+
+    if (state->length && !state->discard) {
+        frame = PyBytes_FromStringAndSize(NULL, state->length);
+        if (frame == NULL)
+            return -1;
+        dst = PyBytes_AS_STRING(frame);
+        memcpy(dst, state->prefix, state->prefix_len);
+        memcpy(dst + state->prefix_len, state->out, state->out_len);
+        appended = PyList_Append(frames, frame) < 0 ? -1 : 1;
+        Py_DECREF(frame);
+    }
+    state->discard = 0;
+    deframe_reset(state);
+    return appended;
+}
+
+
+PyDoc_STRVAR(deframe__doc__,
+"deframe(data, buffer, length, escape, discard, max_frame_size)\n"
+"--\n"
+"\n"
+"Deframes one chunk of KISS data, continuing the frame held in the first\n"
+"`length` bytes of `buffer`. Returns a tuple of:\n"
+"\n"
+"    frames: list of completed frames;\n"
+"    tail: unescaped bytes of the frame left incomplete, to append;\n"
+"    reset: True if the held frame ended or was discarded, so `tail`\n"
+"        starts a new frame;\n"
+"    carried: True if the first frame of `frames` was the held frame;\n"
+"    escape, discard: the new Deframer state;\n"
+"    aborted, escape_errors, overflows: counts for the Deframer stats.");
+
+static PyObject *
+deframe(PyObject *module, PyObject *args)
+{
+    Py_buffer data, buffer;
+    Py_ssize_t length, max_frame_size, i, j, len;
+    int escape, discard, appended, carried = 0, reset = 0, first = 1;
+    const unsigned char *src;
+    deframe_state state;
+    PyObject *frames = NULL, *tail = NULL, *result = NULL;
+
+    if (!PyArg_ParseTuple(args, "y*y*nppn:deframe", &data, &buffer, &length,
+                          &escape, &discard, &max_frame_size))
+        return NULL;
+    if (length < 0 || length > buffer.len) {
+        PyErr_SetString(PyExc_ValueError, "length out of range");
+        goto release;
+    }
+
+    src = (const unsigned char *)data.buf;
+    len = data.len;
+    state.prefix = (const unsigned char *)buffer.buf;
+    state.prefix_len = length;
+    state.out = PyMem_Malloc(len ? len : 1);
+    if (state.out == NULL) {
+        PyErr_NoMemory();
+        goto release;
+    }
+    state.out_len = 0;
+    state.length = length;
+    state.max_frame_size = max_frame_size > 0 ? max_frame_size : 0;
+    state.discard = discard;
+    state.aborted = 0;
+    state.escape_errors = 0;
+    state.overflows = 0;
+
+    frames = PyList_New(0);
+    if (frames == NULL)
+        goto cleanup;
+
+    i = 0;
+    /* An FESC ended the previous chunk. */
+    if (escape && len) {
+        escape = 0;
+        if (src[0] == FEND) {
+            state.aborted++;
+            deframe_reset(&state);
+        } else {
+            if (!state.discard)
+                deframe_unescape(&state, src[0]);
+            i = 1;
+        }
+    }
+
+    while (i < len) {
+        if (src[i] == FEND) {
+            appended = deframe_end(&state, frames);
+            if (appended < 0)
+                goto cleanup;
+            if (first && appended)
+                carried = 1;
+            first = 0;
+            reset = 1;
+            i++;
+        } else if (src[i] == FESC) {
+            if (i + 1 == len) {
+                escape = 1;
+                i = len;
+            } else if (src[i + 1] == FEND) {
+                /* Aborted frame: FEND following FESC. */
+                state.aborted++;
+                deframe_reset(&state);
+                i++;
+            } else {
+                /* Invalid escapes are dropped along with the FESC. */
+                if (!state.discard)
+                    deframe_unescape(&state, src[i + 1]);
+                i += 2;
+            }
+        } else {
+            j = i + 1;
+            while (j < len && src[j] != FEND && src[j] != FESC)
+                j++;
+            if (!state.discard)
+                deframe_append(&state, src + i, j - i);
+            i = j;
+        }
+    }
+
+    /* The held frame was discarded without ending. */
+    if (state.prefix_len < length && !reset)
+        reset = 1;
+
+    tail = PyBytes_FromStringAndSize((const char *)state.out, state.out_len);
+    if (tail == NULL)
+        goto cleanup;
+    result = Py_BuildValue(
+        "(OOOOOOnnn)", frames, tail, reset ? Py_True : Py_False,
+        carried ? Py_True : Py_False, escape ? Py_True : Py_False,
+        state.discard ? Py_True : Py_False, state.aborted,
+        state.escape_errors, state.overflows);
+
+cleanup:
+    PyMem_Free(state.out);
+    Py_XDECREF(frames);
+    Py_XDECREF(tail);
+release:
+    PyBuffer_Release(&data);
+    PyBuffer_Release(&buffer);
+    return result;
+}
+
+
+static PyMethodDef speedups_methods[] = {
+    {"escape_special_codes", escape_special_codes, METH_O,
+     escape_special_codes__doc__},
+    {"recover_special_codes", recover_special_codes, METH_O,
+     recover_special_codes__doc__},
+    {"escape_many", escape_many, METH_VARARGS, escape_many__doc__},
+    {"recover_many", recover_many, METH_VARARGS, recover_many__doc__},
+    {"deframe", deframe, METH_VARARGS, deframe__doc__},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef speedups_module = {
+    PyModuleDef_HEAD_INIT,
+    "kiss._speedups",
+    "Python KISS Module Speedups.",
+    -1,
+    speedups_methods,
+    NULL,
+    NULL,
+    NULL,
+    NULL
+};
+
+PyMODINIT_FUNC
+PyInit__speedups(void)
+{
+    return PyModule_Create(&speedups_module);
+}
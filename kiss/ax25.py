@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Python KISS Module AX.25 Frame Definitions."""
+
+import kiss
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+# AX.25 addresses are 7 bytes: 6 left-shifted ASCII callsign characters,
+# then an SSID byte: H/C bit, 2 reserved bits, 4 SSID bits, extension bit.
+ADDRESS_LENGTH = 7
+MAX_ADDRESSES = 10
+
+# Translation table from encoded callsign bytes to ASCII characters.
+CALLSIGN_TABLE = bytes(x >> 1 for x in range(256))
+
+# SSID suffix for each SSID byte, e.g. '' for SSID 0, '-6' for SSID 6.
+SSID_TABLE = tuple(
+    '-{}'.format((x >> 1) & 0x0F) if (x >> 1) & 0x0F else ''
+    for x in range(256))
+
+# Has-been-repeated / command-response bit of the SSID byte.
+H_BIT = 0x80
+
+UI_CONTROL = 0x03
+
+
+def decode_address(address):
+    """
+    Decodes one 7-byte AX.25 address into a callsign, e.g. 'W2GMD-6'.
+
+    :param address: Encoded address.
+    :type address: bytes or memoryview
+    :rtype: str
+    """
+    callsign = bytes(address[:6]).translate(CALLSIGN_TABLE).decode('ascii')
+    return callsign.rstrip() + SSID_TABLE[address[6]]
+
+
+def encode_address(callsign, last=False):
+    """
+    Encodes a callsign, e.g. 'W2GMD-6', into a 7-byte AX.25 address. A
+    trailing '*' sets the has-been-repeated bit.
+
+    :param callsign: Callsign with optional SSID and '*'.
+    :param last: Set the extension bit, marking the last address.
+    :rtype: bytes
+    """
+    repeated = callsign.endswith('*')
+    callsign = callsign.rstrip('*').upper()
+    ssid = 0
+    if '-' in callsign:
+        callsign, ssid = callsign.split('-')
+    address = bytearray(ord(char) << 1 for char in callsign.ljust(6)[:6])
+    address.append(
+        0x60 | (int(ssid) & 0x0F) << 1 | (H_BIT if repeated else 0) |
+        int(last))
+    return bytes(address)
+
+
+def encode_ui(destination, source, path=None, info=b''):
+    """
+    Encodes an AX.25 UI frame, e.g. an APRS packet.
+
+    :param destination: Destination callsign.
+    :param source: Source callsign.
+    :param path: List of digipeater callsigns.
+    :param info: Information field.
+    :rtype: bytes
+    """
+    addresses = [destination, source] + list(path or [])
+    return b''.join(
+        [encode_address(address) for address in addresses[:-1]] +
+        [encode_address(addresses[-1], last=True),
+         bytes([UI_CONTROL]), kiss.UI_PROTOCOL_ID, info])
+
+
+class AX25Frame(object):
+
+    """
+    AX.25 Frame.
+
+    Wraps a frame buffer without copying it. Addresses, control and PID are
+    only decoded when first accessed, so frames that are dropped early cost
+    little more than the wrapper itself. Accessing a field that a malformed
+    or truncated frame lacks raises `kiss.FrameError`.
+    """
+
+    __slots__ = ('frame', '_address_count', '_destination', '_source',
+                 '_path')
+
+    def __init__(self, frame) -> None:
+        self.frame = memoryview(frame)
+        self._address_count = None
+        self._destination = None
+        self._source = None
+        self._path = None
+
+    @classmethod
+    def from_kiss(cls, frame):
+        """
+        Wraps a KISS data frame that still starts with its command byte.
+        """
+        return cls(memoryview(frame)[1:])
+
+    def __len__(self):
+        return len(self.frame)
+
+    def __str__(self):
+        return '{}>{}:{}'.format(
+            self.source,
+            ','.join([self.destination] + self.path),
+            bytes(self.info).decode('utf-8', 'replace'))
+
+    @property
+    def address_count(self):
+        """Number of addresses in the header, including digipeaters."""
+        if self._address_count is None:
+            frame = self.frame
+            for count in range(1, MAX_ADDRESSES + 1):
+                end = count * ADDRESS_LENGTH
+                if end > len(frame):
+                    break
+                if frame[end - 1] & 0x01:
+                    if count < 2:
+                        break
+                    self._address_count = count
+                    return count
+            raise kiss.FrameError('Invalid AX.25 address field.')
+        return self._address_count
+
+    @property
+    def header_length(self):
+        """Length of the address field, control and PID bytes."""
+        length = self.address_count * ADDRESS_LENGTH + 1
+        if self.pid is not None:
+            length += 1
+        return length
+
+    def _check_addresses(self):
+        """Raises FrameError if the frame is too short for two addresses."""
+        if len(self.frame) < 2 * ADDRESS_LENGTH:
+            raise kiss.FrameError('AX.25 frame too short.')
+
+    @property
+    def destination(self):
+        """Destination callsign."""
+        if self._destination is None:
+            self._check_addresses()
+            self._destination = decode_address(self.frame[0:7])
+        return self._destination
+
+    @property
+    def source(self):
+        """Source callsign."""
+        if self._source is None:
+            self._check_addresses()
+            self._source = decode_address(self.frame[7:14])
+        return self._source
+
+    @property
+    def path(self):
+        """
+        Digipeater callsigns, with '*' marking those that have repeated the
+        frame.
+        """
+        if self._path is None:
+            frame = self.frame
+            path = []
+            for start in range(
+                    14, self.address_count * ADDRESS_LENGTH, ADDRESS_LENGTH):
+                callsign = decode_address(frame[start:start + 7])
+                if frame[start + 6] & H_BIT:
+                    callsign += '*'
+                path.append(callsign)
+            self._path = path
+        return self._path
+
+    @property
+    def control(self):
+        """Control field."""
+        offset = self.address_count * ADDRESS_LENGTH
+        if offset >= len(self.frame):
+            raise kiss.FrameError('AX.25 frame has no control field.')
+        return self.frame[offset]
+
+    @property
+    def pid(self):
+        """Protocol ID, or None for frames without one."""
+        control = self.control
+        # Only I and UI frames carry a PID.
+        if control & 0x01 == 0 or control & 0xEF == UI_CONTROL:
+            offset = self.address_count * ADDRESS_LENGTH + 1
+            if offset < len(self.frame):
+                return self.frame[offset]
+        return None
+
+    @property
+    def info(self):
+        """Information field, as a memoryview of the frame."""
+        return self.frame[self.header_length:]
+
+
+def decode_frames(frames):
+    """
+    Generator stage wrapping frames, starting with their KISS command byte,
+    as AX25Frames, e.g. over `KISS.frames()`. Only data frames are yielded.
+
+    :param frames: Iterable of frames.
+    """
+    for frame in frames:
+        if not frame[0] & 0x0F:
+            yield AX25Frame.from_kiss(frame)
@@ -0,0 +1,399 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Python KISS Module Capture Files.
+
+An append-only capture of KISS traffic. The file starts with a header,
+followed by one record per frame::
+
+    timestamp (int64, microseconds) | length (uint32) | port (uint8) |
+    direction (uint8) | frame (length bytes)
+
+all little-endian. Every `index_interval` frames, the timestamp and offset
+of a record are appended to a sparse index in a `.idx` file alongside, so
+readers can seek by time without scanning the whole capture. Timestamps are
+expected to be non-decreasing.
+
+Usage::
+
+    with kiss.KISSFileWriter('tnc.kisscap') as capture:
+        kiss_conn.read(callback=lambda f: capture.write(f[1:], f[0] >> 4))
+
+    with kiss.KISSFileReader('tnc.kisscap') as capture:
+        for timestamp, port, direction, frame in capture.frames(start):
+            ...
+
+Captures can be imported from and exported to raw KISS byte streams and
+pcap files with the DLT_AX25_KISS link type.
+"""
+
+import bisect
+import mmap
+import os
+import struct
+import time
+
+import kiss
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+MAGIC = b'KISSCAP\x00'
+VERSION = 1
+
+# Frame directions.
+RX = 0
+TX = 1
+
+# Frames between sparse index entries.
+INDEX_INTERVAL = 1000
+
+# pcap link type for a KISS command byte followed by an AX.25 frame.
+DLT_AX25_KISS = 202
+
+_HEADER = struct.Struct('<8sH')
+_RECORD = struct.Struct('<qIBB')
+_INDEX = struct.Struct('<qQ')
+
+_PCAP_HEADER = struct.Struct('<IHHiIII')
+_PCAP_RECORD = struct.Struct('<IIII')
+_PCAP_MAGIC = 0xA1B2C3D4
+_PCAP_MAGIC_NS = 0xA1B23C4D
+
+
+def _index_path(path):
+    return path + '.idx'
+
+
+def _scan(view, index_interval):
+    """
+    Yields the timestamp and offset of every `index_interval`th record.
+    """
+    offset = _HEADER.size
+    count = 0
+    while offset + _RECORD.size <= len(view):
+        timestamp, length, _, _ = _RECORD.unpack_from(view, offset)
+        if not count % index_interval:
+            yield timestamp, offset
+        count += 1
+        offset += _RECORD.size + length
+
+
+class KISSFileWriter(object):
+
+    """
+    Appends frames to a capture file, creating it if needed.
+
+    :param path: Capture file path.
+    :param index_interval: Frames between sparse index entries.
+    """
+
+    def __init__(self, path, index_interval: int=INDEX_INTERVAL) -> None:
+        self.path = path
+        self.index_interval = index_interval
+        self._count = 0
+        self._file = open(path, 'ab')
+        if not self._file.tell():
+            self._file.write(_HEADER.pack(MAGIC, VERSION))
+        self._offset = self._file.tell()
+        self._index = open(_index_path(path), 'ab')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def write(self, frame, port: int=0, direction: int=RX, timestamp=None):
+        """
+        Appends a frame.
+
+        :param frame: Frame, without its KISS command byte.
+        :param port: KISS port the frame was read from or written to.
+        :param direction: RX or TX.
+        :param timestamp: Seconds since the epoch, or None for now.
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        timestamp = int(round(timestamp * 1000000))
+        if not self._count % self.index_interval:
+            self._index.write(_INDEX.pack(timestamp, self._offset))
+        self._count += 1
+        self._file.write(_RECORD.pack(timestamp, len(frame), port, direction))
+        self._file.write(frame)
+        self._offset += _RECORD.size + len(frame)
+
+    def flush(self):
+        """Flushes written frames to the file."""
+        self._file.flush()
+        self._index.flush()
+
+    def close(self):
+        """Closes the capture file."""
+        self._file.close()
+        self._index.close()
+
+
+class KISSFileReader(object):
+
+    """
+    Reads frames from a capture file, without copying them.
+
+    The file is memory-mapped, and frames are returned as memoryviews into
+    it, valid until the reader is closed. If the capture's index is missing
+    it is rebuilt in memory.
+
+    :param path: Capture file path.
+    """
+
+    def __init__(self, path) -> None:
+        self.path = path
+        self._file = open(path, 'rb')
+        # mmap refuses empty files, e.g. one whose writer hasn't flushed yet.
+        if os.fstat(self._file.fileno()).st_size < _HEADER.size:
+            self._file.close()
+            raise kiss.FrameError(
+                '{} is too short for a KISS capture'.format(path))
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        magic, version = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise kiss.FrameError(
+                '{} is not a version {} KISS capture'.format(path, VERSION))
+        self.index_timestamps, self.index_offsets = self._read_index()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __iter__(self):
+        return self.frames()
+
+    def _read_index(self):
+        timestamps = []
+        offsets = []
+        size = len(self._mmap)
+        try:
+            with open(_index_path(self.path), 'rb') as index:
+                data = index.read()
+        except FileNotFoundError:
+            data = None
+
+        if data is None:
+            entries = _scan(self._view, INDEX_INTERVAL)
+        else:
+            end = len(data) - len(data) % _INDEX.size
+            entries = _INDEX.iter_unpack(data[:end])
+
+        for timestamp, offset in entries:
+            # Ignore entries for records lost from the capture.
+            if offset < size:
+                timestamps.append(timestamp)
+                offsets.append(offset)
+        return timestamps, offsets
+
+    def seek(self, timestamp):
+        """
+        Returns the offset of an indexed record no later than the first
+        record at or after `timestamp`.
+
+        :param timestamp: Seconds since the epoch.
+        :rtype: int
+        """
+        i = bisect.bisect_left(
+            self.index_timestamps, int(round(timestamp * 1000000)))
+        if i == 0:
+            return _HEADER.size
+        return self.index_offsets[i - 1]
+
+    def frames(self, start=None, end=None):
+        """
+        Iterates over frames as (timestamp, port, direction, frame) tuples,
+        with `frame` a memoryview into the capture.
+
+        :param start: If set, skips frames before this time, seeking with the
+            index.
+        :param end: If set, stops at the first frame at or after this time.
+        """
+        view = self._view
+        size = len(view)
+        unpack_from = _RECORD.unpack_from
+        header_size = _RECORD.size
+        offset = _HEADER.size
+        start_us = end_us = None
+        if start is not None:
+            offset = self.seek(start)
+            start_us = int(round(start * 1000000))
+        if end is not None:
+            end_us = int(round(end * 1000000))
+
+        while offset + header_size <= size:
+            timestamp, length, port, direction = unpack_from(view, offset)
+            data_offset = offset + header_size
+            offset = data_offset + length
+            if offset > size:
+                # Truncated by an interrupted write.
+                return
+            if start_us is not None:
+                if timestamp < start_us:
+                    continue
+                start_us = None
+            if end_us is not None and timestamp >= end_us:
+                return
+            yield (timestamp / 1000000, port, direction,
+                   view[data_offset:offset])
+
+    def close(self):
+        """
+        Closes the capture. Frames returned by the reader must be released
+        first.
+        """
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
+
+
+def import_kiss(source, writer, timestamp=None, direction: int=RX):
+    """
+    Imports frames from a file containing a raw KISS byte stream.
+
+    :param source: Raw KISS file path.
+    :param writer: KISSFileWriter to write the frames to.
+    :param timestamp: Timestamp for all frames, or None for now.
+    :return: Number of frames imported.
+    :rtype: int
+    """
+    if timestamp is None:
+        timestamp = time.time()
+    deframer = kiss.Deframer(max_frame_size=None)
+    count = 0
+    with open(source, 'rb') as stream:
+        while 1:
+            data = stream.read(mmap.PAGESIZE * 16)
+            if not data:
+                return count
+            for frame in deframer.feed(data):
+                writer.write(frame[1:], frame[0] >> 4, direction, timestamp)
+                count += 1
+
+
+def export_kiss(reader, destination, direction=None):
+    """
+    Exports frames as a raw KISS byte stream of data frames.
+
+    :param reader: KISSFileReader to read frames from.
+    :param destination: Raw KISS file path.
+    :param direction: If set, only exports frames in this direction.
+    :return: Number of frames exported.
+    :rtype: int
+    """
+    framers = {}
+    count = 0
+    with open(destination, 'wb') as stream:
+        for _, port, frame_direction, frame in reader:
+            if direction is not None and frame_direction != direction:
+                continue
+            framer = framers.get(port)
+            if framer is None:
+                framer = framers[port] = kiss.Framer(port)
+            stream.write(framer.encode(bytes(frame)))
+            count += 1
+    return count
+
+
+def import_pcap(source, writer, direction: int=RX):
+    """
+    Imports frames from a pcap file with the DLT_AX25_KISS link type.
+
+    :param source: pcap file path.
+    :param writer: KISSFileWriter to write the frames to.
+    :return: Number of frames imported.
+    :rtype: int
+    """
+    count = 0
+    with open(source, 'rb') as pcap:
+        data = pcap.read()
+
+    if len(data) < _PCAP_HEADER.size:
+        raise kiss.FrameError('{} is not a pcap file'.format(source))
+    magic = struct.unpack_from('<I', data)[0]
+    if magic in (_PCAP_MAGIC, _PCAP_MAGIC_NS):
+        order = '<'
+    else:
+        order = '>'
+        magic = struct.unpack_from('>I', data)[0]
+    if magic not in (_PCAP_MAGIC, _PCAP_MAGIC_NS):
+        raise kiss.FrameError('{} is not a pcap file'.format(source))
+    divisor = 1000000000 if magic == _PCAP_MAGIC_NS else 1000000
+
+    header = struct.Struct(order + _PCAP_HEADER.format[1:])
+    record = struct.Struct(order + _PCAP_RECORD.format[1:])
+    link_type = header.unpack_from(data)[6]
+    if link_type != DLT_AX25_KISS:
+        raise kiss.FrameError(
+            '{} has link type {}, not DLT_AX25_KISS'.format(
+                source, link_type))
+
+    view = memoryview(data)
+    offset = header.size
+    while offset + record.size <= len(data):
+        seconds, fraction, length, _ = record.unpack_from(data, offset)
+        offset += record.size
+        frame = view[offset:offset + length]
+        offset += length
+        if len(frame) < length:
+            break
+        if not length:
+            continue
+        writer.write(frame[1:], frame[0] >> 4, direction,
+                     seconds + fraction / divisor)
+        count += 1
+    return count
+
+
+def export_pcap(reader, destination, direction=None):
+    """
+    Exports frames as a pcap file with the DLT_AX25_KISS link type, each
+    frame preceded by a data frame command byte for its port.
+
+    :param reader: KISSFileReader to read frames from.
+    :param destination: pcap file path.
+    :param direction: If set, only exports frames in this direction.
+    :return: Number of frames exported.
+    :rtype: int
+    """
+    count = 0
+    with open(destination, 'wb') as pcap:
+        pcap.write(_PCAP_HEADER.pack(
+            _PCAP_MAGIC, 2, 4, 0, 0, 65535, DLT_AX25_KISS))
+        for timestamp, port, frame_direction, frame in reader:
+            if direction is not None and frame_direction != direction:
+                continue
+            microseconds = int(round(timestamp * 1000000))
+            pcap.write(_PCAP_RECORD.pack(
+                microseconds // 1000000, microseconds % 1000000,
+                len(frame) + 1, len(frame) + 1))
+            pcap.write(bytes([port << 4]))
+            pcap.write(frame)
+            count += 1
+    return count
+
+
+def rebuild_index(path, index_interval: int=INDEX_INTERVAL):
+    """
+    Rewrites the sparse index of a capture file, e.g. after it was lost.
+
+    :param path: Capture file path.
+    """
+    with KISSFileReader(path) as reader:
+        entries = list(_scan(reader._view, index_interval))  # NOQA pylint: disable=W0212
+    with open(_index_path(path) + '.tmp', 'wb') as index:
+        for entry in entries:
+            index.write(_INDEX.pack(*entry))
+    os.replace(_index_path(path) + '.tmp', _index_path(path))
@@ -3,8 +3,17 @@
 
 """Python KISS Module Class Definitions."""
 
+import asyncio
+import collections
 import logging
+import queue
+import random
+import re
+import select
+import selectors
 import socket
+import threading
+import time
 
 import serial
 
@@ -15,9 +24,393 @@ __copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint:
 __license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
 
 
+# Matches either of the two bytes the deframer has to act upon.
+_SPECIAL_CODES = re.compile(b''.join([b'[', kiss.FEND, kiss.FESC, b']']))
+
+# Searchable in bytes and memoryview read data alike.
+_NMEA_HEADER = re.compile(re.escape(kiss.NMEA_HEADER))
+_CRLF = re.compile(b'\r\n')
+
+# Sampled frame trace, see `KISS.trace_sample`. Propagates to the handlers
+# of the `kiss.classes` logger unless given its own.
+_TRACE_LOGGER = logging.getLogger(__name__ + '.trace')
+
+# Seconds between checks for `stop_reader()` while blocked on a full queue.
+_READER_POLL = 0.1
+
+# The compiled deframer, if available.
+_speedups = kiss.util._speedups  # NOQA pylint: disable=W0212
+
+_FEND = ord(kiss.FEND)
+_FESC = ord(kiss.FESC)
+_TFEND = ord(kiss.TFEND)
+_TFESC = ord(kiss.TFESC)
+
+
+class Deframer(object):
+
+    """
+    Incremental KISS Deframer.
+
+    Finds frame boundaries and recovers FESC/TFEND/TFESC escapes in a single
+    pass over each chunk of data, accumulating frame contents in one
+    preallocated reassembly buffer. Partial frames and escapes split across
+    chunk boundaries are carried over to the next call to `feed()`.
+
+    If a `frame_filter` is set (see `kiss.filters.compile_filters`), it is
+    checked as soon as enough of a frame has been reassembled, and the rest
+    of a rejected frame is skipped without being unescaped or copied.
+
+    The buffer doubles as needed, up to `max_frame_size` bytes. A frame
+    that would exceed it is discarded, and the Deframer resynchronizes at the
+    next FEND. Set `max_frame_size` to None for no limit.
+
+    If `stats` is set to a `kiss.Stats`, the Deframer counts frames, bytes,
+    drops and errors, and records frame latency.
+
+    Without a `frame_filter`, chunks are deframed by the `kiss._speedups`
+    extension when it is available, with the same results.
+    """
+
+    def __init__(self, buffer_size: int=None, frame_filter=None,
+                 stats=None,
+                 max_frame_size: int=kiss.MAX_FRAME_SIZE) -> None:
+        self.frame_filter = frame_filter
+        self.stats = stats
+        self._max_frame_size = max_frame_size
+        self._buffer = bytearray(buffer_size or kiss.READ_BYTES)
+        if max_frame_size and len(self._buffer) > max_frame_size:
+            del self._buffer[max_frame_size:]
+        self._view = memoryview(self._buffer)
+        self._length = 0
+        self._escape = False
+        self._discard = False
+        self._screening = frame_filter is not None
+        self._started = 0.0
+        self._observed = 0
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def max_frame_size(self):
+        """Largest frame to reassemble, in bytes, or None for no limit."""
+        return self._max_frame_size
+
+    @max_frame_size.setter
+    def max_frame_size(self, value):
+        self._max_frame_size = value
+        if value and len(self._buffer) > value:
+            if self._length > value:
+                self._overflow()
+            self._view.release()
+            del self._buffer[value:]
+            self._view = memoryview(self._buffer)
+
+    def reset(self):
+        """
+        Discards any partially reassembled frame.
+        """
+        self._length = 0
+        self._escape = False
+        self._discard = False
+        self._screening = self.frame_filter is not None
+
+    def _overflow(self):
+        """
+        Discards the frame being reassembled up to the next FEND.
+        """
+        if self.stats is not None:
+            self.stats.buffer_overflows += 1
+        self._discard = True
+        self._screening = False
+        self._length = 0
+
+    def _grow(self, needed):
+        """
+        Grows the buffer to hold `needed` bytes. Returns False, discarding
+        the frame, if that exceeds `max_frame_size`.
+        """
+        max_frame_size = self._max_frame_size
+        if max_frame_size and needed > max_frame_size:
+            self._overflow()
+            return False
+        size = len(self._buffer)
+        while size < needed:
+            size *= 2
+        if max_frame_size:
+            size = min(size, max_frame_size)
+        self._view.release()
+        self._buffer.extend(bytes(size - len(self._buffer)))
+        self._view = memoryview(self._buffer)
+        return True
+
+    def _append(self, chunk):
+        end = self._length + len(chunk)
+        if end > len(self._buffer) and not self._grow(end):
+            return
+        self._view[self._length:end] = chunk
+        self._length = end
+
+    def _append_code(self, code):
+        if (self._length == len(self._buffer) and
+                not self._grow(self._length + 1)):
+            return
+        self._buffer[self._length] = code
+        self._length += 1
+
+    def _unescape(self, code):
+        """
+        Handles the byte following a FESC. Returns False if the escape
+        sequence is invalid.
+        """
+        if code == _TFEND:
+            self._append_code(_FEND)
+        elif code == _TFESC:
+            self._append_code(_FESC)
+        else:
+            return False
+        return True
+
+    def _escape_error(self):
+        if self.stats is not None:
+            self.stats.escape_errors += 1
+
+    def _abort(self):
+        if self.stats is not None:
+            self.stats.frames_aborted += 1
+        self._length = 0
+
+    def _screen(self):
+        """
+        Checks the partial frame against the frame filter, once it has
+        enough bytes to decide.
+        """
+        accepted = self.frame_filter(self._view, self._length)
+        if accepted is not None:
+            self._screening = False
+            if not accepted:
+                if self.stats is not None:
+                    self.stats.frames_dropped += 1
+                self._discard = True
+                self._length = 0
+
+    def _end_frame(self, frames, now):
+        if self._length and not self._discard:
+            if (not self._screening or
+                    self.frame_filter(self._view, self._length)):
+                frames.append(bytes(self._view[:self._length]))
+                # Only the first frame ended in a chunk can have started in
+                # an earlier one; `feed()` counts the rest as zero latency.
+                if self._started != now:
+                    self.stats.latency.observe(now - self._started)
+                    self._observed = 1
+            elif self.stats is not None:
+                self.stats.frames_dropped += 1
+        self._started = now
+        self._length = 0
+        self._discard = False
+        self._screening = self.frame_filter is not None
+
+    def feed(self, data):
+        """
+        Feeds a chunk of KISS data into the Deframer.
+
+        :param data: Bytes read from a KISS interface.
+        :type data: bytes, bytearray or memoryview
+        :return: Unescaped frames completed by this chunk.
+        :rtype: list
+        """
+        if _speedups is not None and self.frame_filter is None:
+            return self._feed_speedups(data)
+        return self._feed_python(data)
+
+    def _feed_speedups(self, data):
+        """Deframes a chunk with `kiss._speedups`."""
+        stats = self.stats
+        now = 0.0
+        if stats is not None:
+            now = time.perf_counter()
+            if not self._length and not self._escape:
+                self._started = now
+
+        (frames, tail, reset, carried, self._escape, self._discard,
+         aborted, escape_errors, overflows) = _speedups.deframe(
+             data, self._buffer, self._length, self._escape, self._discard,
+             self._max_frame_size or 0)
+        if reset:
+            self._length = 0
+        if tail:
+            self._append(tail)
+
+        if stats is not None:
+            stats.bytes_in += len(data)
+            stats.frames_aborted += aborted
+            stats.escape_errors += escape_errors
+            stats.buffer_overflows += overflows
+            if frames:
+                stats.frames_in += len(frames)
+                if carried and self._started != now:
+                    stats.latency.observe(now - self._started)
+                    stats.latency.observe(0.0, len(frames) - 1)
+                else:
+                    stats.latency.observe(0.0, len(frames))
+            if reset:
+                self._started = now
+        return frames
+
+    def _feed_python(self, data):
+        """Deframes a chunk in pure Python."""
+        frames = []
+        view = memoryview(data)
+        end = len(view)
+        start = 0
+
+        stats = self.stats
+        now = 0.0
+        if stats is not None:
+            stats.bytes_in += end
+            now = time.perf_counter()
+            if not self._length and not self._escape:
+                self._started = now
+
+        # An FESC ended the previous chunk.
+        if self._escape and end:
+            self._escape = False
+            if view[0] == _FEND:
+                self._abort()
+            else:
+                if not self._discard and not self._unescape(view[0]):
+                    self._escape_error()
+                start = 1
+
+        for match in _SPECIAL_CODES.finditer(data, start):
+            i = match.start()
+            if i < start:
+                # Already consumed as the second byte of an escape.
+                continue
+
+            if not self._discard:
+                self._append(view[start:i])
+
+            if view[i] == _FEND:
+                self._end_frame(frames, now)
+                start = i + 1
+                continue
+            elif i + 1 == end:
+                self._escape = True
+                start = end
+            elif view[i + 1] == _FEND:
+                # Aborted frame: FEND following FESC.
+                self._abort()
+                start = i + 1
+            else:
+                # Invalid escapes are dropped along with the FESC.
+                if not self._discard and not self._unescape(view[i + 1]):
+                    self._escape_error()
+                start = i + 2
+
+            if self._screening:
+                self._screen()
+
+        if start < end and not self._discard:
+            self._append(view[start:end])
+            if self._screening:
+                self._screen()
+
+        if stats is not None and frames:
+            stats.frames_in += len(frames)
+            stats.latency.observe(0.0, len(frames) - self._observed)
+            self._observed = 0
+
+        view.release()
+        return frames
+
+
+class Framer(object):
+
+    """
+    KISS Framer.
+
+    Encodes frames for one port and command code. The FEND and command byte
+    header is built once, and each encoded frame is assembled with a single,
+    exactly sized allocation.
+    """
+
+    def __init__(self, port: int=0, command: bytes=kiss.DATA_FRAME) -> None:
+        if not 0 <= port <= 15:
+            raise ValueError('KISS port must be 0-15, not {}'.format(port))
+        self.port = port
+        self.command = command
+
+        # RETURN is the only command code without a port nibble.
+        if command == kiss.RETURN:
+            code = command
+        else:
+            code = bytes([port << 4 | ord(command)])
+        self._header = b''.join([kiss.FEND, code])
+        self._separator = b''.join([kiss.FEND, self._header])
+
+    def encode(self, frame):
+        """
+        Encodes a frame: FEND, command byte, escaped frame, FEND.
+
+        :param frame: Frame to encode.
+        :type frame: bytes
+        :rtype: bytes
+        """
+        return b''.join((
+            self._header,
+            frame.replace(kiss.FESC, kiss.FESC_TFESC).replace(
+                kiss.FEND, kiss.FESC_TFEND),
+            kiss.FEND
+        ))
+
+    def encode_many(self, frames):
+        """
+        Encodes frames back-to-back into a single buffer.
+
+        :param frames: List of frames to encode.
+        :type frames: list
+        :rtype: bytes
+        """
+        if not frames:
+            return b''
+        return b''.join((
+            self._header,
+            self._separator.join([
+                frame.replace(kiss.FESC, kiss.FESC_TFESC).replace(
+                    kiss.FEND, kiss.FESC_TFEND)
+                for frame in frames
+            ]),
+            kiss.FEND
+        ))
+
+
 class KISS(object):
 
-    """KISS Object Class."""
+    """
+    KISS Object Class.
+
+    Frames received on a KISS port with a callback in `port_callbacks` are
+    passed to that callback instead of being returned by `read()`.
+
+    Writes are queued and flushed together once `flush_size` bytes are
+    queued, or `flush_interval` seconds after the first queued write. The
+    default `flush_size` of 0 flushes every write immediately.
+
+    Traffic, error and frame latency counters are kept in `stats`, see
+    `kiss.Stats`.
+
+    If `dedup` is set to a `kiss.DedupCache`, repeats of a data frame heard
+    within its `ttl` are dropped before dispatch, and counted in
+    `stats.frames_duplicate`.
+
+    DEBUG logging of each chunk read and frame written is only done when
+    `trace` is set, so that it costs nothing otherwise. For production
+    debugging, `trace_sample` logs 1 in every N frames read and written at
+    INFO to the `kiss.classes.trace` logger, as key=value pairs.
+    """
 
     _logger = logging.getLogger(__name__)  # pylint: disable=R0801
     if not _logger.handlers:  # pylint: disable=R0801
@@ -31,12 +424,38 @@ class KISS(object):
     def __init__(self, strip_df_start: bool=False) -> None:
         self.strip_df_start = strip_df_start
         self.interface = None
+        self.port_callbacks = {}
+        self.flush_size = 0
+        self.flush_interval = None
+        self.stats = kiss.Stats()
+        self.dedup = None
+        self.trace = kiss.TRACE
+        self.trace_sample = kiss.TRACE_SAMPLE
+        self._trace_skip = 0
+        self._deframer = Deframer(stats=self.stats)
+        # Frames read but not yet consumed by a stopped `frames()`.
+        self._unread = collections.deque()
+        self._reader = None
+        self._reader_queue = None
+        self._reader_stopped = threading.Event()
+        # Set while registered with a Multiplexer, which handles closing.
+        self._multiplexed = False
+        self._workers = []
+        self._framers = {0: Framer()}
+        self._write_lock = threading.Lock()
+        self._write_queue = []
+        self._write_queued = 0
+        self._flush_timer = None
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.flush()
+        self._reader_stopped.set()
         self.stop()
+        self.stop_reader()
 
     def __del__(self):
         self.stop()
@@ -53,6 +472,75 @@ class KISS(object):
         """
         del frame
 
+    def _flush_handler(self, buffers):
+        """
+        Helper method to call when flushing queued frames to KISS interface.
+
+        :param buffers: List of encoded frames.
+        """
+        if len(buffers) == 1:
+            self._write_handler(buffers[0])
+        else:
+            self._write_handler(b''.join(buffers))
+
+    @property
+    def trace(self):
+        """
+        If True, and the logger is enabled for DEBUG when this is set, logs
+        every chunk read and frame written.
+        """
+        return self._trace
+
+    @trace.setter
+    def trace(self, value):
+        # Cached, rather than checked on every chunk and frame.
+        self._trace = bool(value) and self._logger.isEnabledFor(logging.DEBUG)
+
+    def _trace_frames(self, direction, frames, port=None):
+        """
+        Logs 1 in every `trace_sample` frames. Without a `port`, frames start
+        with their command byte.
+        """
+        skip = self._trace_skip
+        while skip < len(frames):
+            frame = frames[skip]
+            if port is None:
+                _TRACE_LOGGER.info(
+                    'direction=%s port=%d command=0x%02x length=%d frame=%r',
+                    direction, frame[0] >> 4, frame[0] & 0x0F,
+                    len(frame) - 1, bytes(frame[1:]))
+            else:
+                _TRACE_LOGGER.info(
+                    'direction=%s port=%d length=%d frame=%r',
+                    direction, port, len(frame), bytes(frame))
+            skip += self.trace_sample
+        self._trace_skip = skip - len(frames)
+
+    @property
+    def max_frame_size(self):
+        """
+        Largest frame to reassemble, in bytes, or None for no limit. Larger
+        frames are discarded and counted in `stats.buffer_overflows`.
+        """
+        return self._deframer.max_frame_size
+
+    @max_frame_size.setter
+    def max_frame_size(self, value):
+        self._deframer.max_frame_size = value
+
+    def fileno(self):
+        """
+        Returns the file descriptor of the KISS interface, for use with
+        `select` and `selectors`.
+        """
+        return self.interface.fileno()
+
+    def setblocking(self, flag):
+        """
+        Sets blocking or non-blocking reads on the KISS interface.
+        """
+        pass
+
     def stop(self):
         """
         Helper method to call when stopping KISS interface.
@@ -65,7 +553,23 @@ class KISS(object):
         """
         pass
 
-    def write_setting(self, name, value):
+    def set_filters(self, filters):
+        """
+        Sets filters that received frames must all match, see
+        `kiss.filters`. Frames that don't match are discarded by the
+        Deframer before being fully reassembled.
+
+        :param filters: List of filters, or None to accept all frames.
+        """
+        self._deframer.frame_filter = kiss.filters.compile_filters(filters)
+
+    def _framer(self, port):
+        framer = self._framers.get(port)
+        if framer is None:
+            framer = self._framers[port] = Framer(port)
+        return framer
+
+    def write_setting(self, name, value, port=0):
         """
         Writes KISS Command Codes to attached device.
 
@@ -73,180 +577,756 @@ class KISS(object):
 
         :param name: KISS Command Code Name as a string.
         :param value: KISS Command Code Value to write.
+        :param port: KISS port (0-15) to configure.
         """
-        self._logger.debug('Configuring %s=%s', name, repr(value))
+        self._logger.debug('Configuring %s=%s port=%s', name, value, port)
 
         # Do the reasonable thing if a user passes an int
         if isinstance(value, int):
-            value = chr(value)
+            value = bytes([value])
+
+        framer = Framer(port, getattr(kiss, name.upper()))
+        self.stats.frames_out += 1
+        self._queue_writes([framer.encode(value)])
+        self.flush()
 
-        return self.interface.write(
-            b''.join([
-                kiss.FEND,
-                bytes(getattr(kiss, name.upper())),
-                kiss.escape_special_codes(value),
-                kiss.FEND
-            ])
-        )
+    def _read_frames(self, read_bytes=None):
+        """
+        Reads one chunk from the KISS interface.
 
-    def read(self, read_bytes=None, callback=None, readmode=True):  # NOQA pylint: disable=R0912
+        :return: Frames completed by the chunk, preceded by the whole chunk
+            if it is NMEA passthrough data, or None if nothing was read.
+            Frames left over from `frames()` are returned first, without
+            reading.
+        :rtype: list
+        """
+        if self._unread:
+            frames = list(self._unread)
+            self._unread.clear()
+            return frames
+
+        read_data = self._read_handler(read_bytes)
+        if read_data is None or not len(read_data):
+            return None
+        if self._trace:
+            self._logger.debug(
+                'read_data(%s)="%s"', len(read_data), read_data)
+
+        # Handle NMEAPASS on T3-Micro
+        if len(read_data) >= 900:
+            if _NMEA_HEADER.search(read_data) and _CRLF.search(read_data):
+                self.stats.nmea_passthrough += 1
+                return [bytes(read_data)] + self._decode_frames(read_data)
+
+        return self._decode_frames(read_data)
+
+    def read(self, read_bytes=None, callback=None, readmode=True,
+             filters=None):
         """
         Reads data from KISS device.
 
+        Frames for ports in `port_callbacks` are passed to those callbacks.
+
         :param callback: Callback to call with decoded data.
-        :param readmode: If False, immediately returns frames.
+        :param readmode: If False, returns the frames completed by the next
+            chunk read, possibly none. Partial frames are kept for the next
+            call.
+        :param filters: If set, replaces filters set with `set_filters()`.
         :type callback: func
         :type readmode: bool
+        :type filters: list
         :return: List of frames (if readmode=False).
         :rtype: list
         """
-        self._logger.debug(
-            'read_bytes=%s callback="%s" readmode=%s',
-            read_bytes, callback, readmode)
+        if self._trace:
+            self._logger.debug(
+                'read_bytes=%s callback="%s" readmode=%s',
+                read_bytes, callback, readmode)
+
+        if filters is not None:
+            self.set_filters(filters)
+
+        while 1:
+            frames = self._read_frames(read_bytes)
+            if frames is None:
+                continue
+            if not readmode:
+                return frames
+            if callback:
+                for frame in frames:
+                    callback(frame)
+
+    def frames(self, read_bytes=None, filters=None):
+        """
+        Iterates over frames as they are read, until the connection is
+        closed.
+
+        Reassembly state, and frames read but not yet yielded, are kept on
+        the KISS object, so iteration can be stopped and restarted, or mixed
+        with `read()`, without losing frames. Frames for ports in
+        `port_callbacks` are passed to those callbacks instead.
+
+        Generator stages compose over the frames, which start with their
+        KISS command byte unless `strip_df_start` is set::
+
+            frames = kiss.dedup.drop_duplicates(kiss_conn.frames())
+            for frame in kiss.ax25.decode_frames(frames):
+                ...
+
+        :param filters: If set, replaces filters set with `set_filters()`.
+            Filtering in the Deframer is cheaper than `kiss.filter_frames()`.
+        """
+        if filters is not None:
+            self.set_filters(filters)
+
+        unread = self._unread
+        while 1:
+            while unread:
+                yield unread.popleft()
+            try:
+                frames = self._read_frames(read_bytes)
+            except kiss.SocketClosetError as exc:
+                self._logger.info('Stopped reading frames: %s', exc)
+                return
+            if frames:
+                unread.extend(frames)
+
+    def start_reader(self, callback, queue_size: int=1000,
+                     policy: str='block', workers: int=1, read_bytes=None):
+        """
+        Starts reading frames on a dedicated thread, passing them to
+        `callback` on a pool of `workers` threads, so that a slow callback
+        doesn't hold up reads from the KISS interface. Frames for ports in
+        `port_callbacks` are passed to those callbacks on the pool too.
+
+        Frames are handed to the pool on a queue of up to `queue_size`
+        frames. When it is full, the `policy` is to:
+
+        * 'block': Stop reading until there is room.
+        * 'drop_oldest': Drop the oldest queued frame.
+        * 'drop_newest': Drop the frame just read.
+
+        Dropped frames are counted in `stats.queue_drops`. With more than one
+        worker, callbacks may complete out of order.
+
+        :param callback: Callback to call with each frame.
+        :param queue_size: Most frames to queue for the workers.
+        :param policy: One of `kiss.READER_POLICIES`.
+        :param workers: Number of callback threads.
+        """
+        if policy not in kiss.READER_POLICIES:
+            raise ValueError('policy must be one of {}, not {!r}'.format(
+                ', '.join(kiss.READER_POLICIES), policy))
+        if self._reader is not None:
+            raise RuntimeError('Reader already started.')
+
+        self._reader_queue = queue.Queue(queue_size)
+        self._reader_stopped.clear()
+        enqueue = getattr(self, '_enqueue_' + policy)
+
+        self._workers = [
+            threading.Thread(target=self._worker_loop)
+            for _ in range(workers)]
+        self._reader = threading.Thread(
+            target=self._reader_loop, args=(callback, enqueue, read_bytes))
+        for thread in self._workers + [self._reader]:
+            thread.daemon = True
+            thread.start()
+
+    def stop_reader(self, timeout=None):
+        """
+        Stops the reader thread started by `start_reader()`, then stops the
+        workers once they have called back with all queued frames.
+
+        The reader only checks for stopping between reads, so call `stop()`
+        first to interrupt a blocking read.
 
-        read_buffer = bytes()
+        :param timeout: Most seconds to wait in all, or None to wait until
+            every queued frame has been called back. Workers still busy then
+            are left to finish on their own.
+        """
+        if self._reader is None:
+            return
+        deadline = None if timeout is None else time.monotonic() + timeout
 
+        def remaining():
+            if deadline is None:
+                return None
+            return max(0.0, deadline - time.monotonic())
+
+        self._reader_stopped.set()
+        self._reader.join(remaining())
+        try:
+            for _ in self._workers:
+                self._reader_queue.put(None, timeout=remaining())
+        except queue.Full:
+            self._logger.warning(
+                'Reader workers busy after %ss, not waiting for them.',
+                timeout)
+        else:
+            for worker in self._workers:
+                worker.join(remaining())
+        self._reader = None
+        self._workers = []
+
+    def _reader_loop(self, callback, enqueue, read_bytes):
+        while not self._reader_stopped.is_set():
+            try:
+                read_data = self._read_handler(read_bytes)
+            except Exception as exc:  # pylint: disable=W0703
+                # Including errors from an interface closed by `stop()`.
+                if not self._reader_stopped.is_set():
+                    self._logger.warning('Reader stopped: %s', exc)
+                return
+            if read_data:
+                for frame in self._decode_frames(read_data, enqueue):
+                    enqueue(callback, frame)
+
+    def _enqueue_block(self, callback, frame):
+        while not self._reader_stopped.is_set():
+            try:
+                self._reader_queue.put((callback, frame), timeout=_READER_POLL)
+                return
+            except queue.Full:
+                continue
+
+    def _enqueue_drop_newest(self, callback, frame):
+        try:
+            self._reader_queue.put_nowait((callback, frame))
+        except queue.Full:
+            self.stats.queue_drops += 1
+
+    def _enqueue_drop_oldest(self, callback, frame):
+        while 1:
+            try:
+                self._reader_queue.put_nowait((callback, frame))
+                return
+            except queue.Full:
+                try:
+                    self._reader_queue.get_nowait()
+                    self.stats.queue_drops += 1
+                except queue.Empty:
+                    pass
+
+    def _worker_loop(self):
         while 1:
-            read_data = self._read_handler(read_bytes)
-
-            if read_data is not None and len(read_data):
-                self._logger.debug(
-                    'read_data(%s)="%s"', len(read_data), read_data)
-
-                frames = []
-
-                split_data = read_data.split(kiss.FEND)
-                fends = len(split_data)
-
-                self._logger.debug(
-                    'split_data(fends=%s)="%s"', fends, split_data)
-
-                # Handle NMEAPASS on T3-Micro
-                if len(read_data) >= 900:
-                    if kiss.NMEA_HEADER in read_data and '\r\n' in read_data:
-                        if callback:
-                            callback(read_data)
-                        elif not readmode:
-                            return [read_data]
-
-                # No FEND in frame
-                if fends == 1:
-                    read_buffer += split_data[0]
-                # Single FEND in frame
-                elif fends == 2:
-                    # Closing FEND found
-                    if split_data[0]:
-                        # Partial frame continued, otherwise drop
-                        frames.append(b''.join([read_buffer, split_data[0]]))
-                        read_buffer = bytes()
-                    # Opening FEND found
-                    else:
-                        frames.append(read_buffer)
-                        read_buffer = split_data[1]
-
-                # At least one complete frame received: [FEND, xxx, FEND]
-                elif fends >= 3:
-
-                    # Iterate through split_data and extract just the frames.
-                    for i in range(0, fends - 1):
-                        buf = bytearray(b''.join([read_buffer, split_data[i]]))
-                        self._logger.debug('i=%s buf="%s"', i, buf)
-                        if buf:
-                            self._logger.debug('Frame Found: "%s"', buf)
-                            frames.append(buf)
-                            read_buffer = bytearray()
-
-                    # TODO: What do I do?
-                    if split_data[fends - 1]:
-                        self._logger.debug('Mystery Conditional')
-                        read_buffer = bytearray(split_data[fends - 1])
-
-                # Fixup T3-Micro NMEA Sentences
-                frames = list(map(kiss.strip_nmea, frames))
-                # Remove None frames.
-                frames = [_f for _f in frames if _f]
-
-                # Maybe.
-                frames = list(map(kiss.recover_special_codes, frames))
-
-                if self.strip_df_start:
-                    frames = list(map(kiss.strip_df_start, frames))
-
-                if readmode:
-                    for frame in frames:
-                        callback(frame)
-                elif not readmode:
-                    return frames
-
-    def write(self, frame):
+            item = self._reader_queue.get()
+            if item is None:
+                return
+            callback, frame = item
+            try:
+                callback(frame)
+            except Exception:  # pylint: disable=W0703
+                self._logger.exception('Callback failed for %r', frame)
+
+    def _decode_frames(self, read_data, dispatch=None):
+        """
+        Deframes read data and applies per-frame fixups.
+
+        :param read_data: Bytes read from the KISS interface.
+        :param dispatch: If set, called with each `port_callbacks` callback
+            and frame instead of calling the callback.
+        :return: List of complete frames.
+        :rtype: list
+        """
+        frames = []
+        port_callbacks = self.port_callbacks
+        deframed = self._deframer.feed(read_data)
+        if self.trace_sample:
+            self._trace_frames('rx', deframed)
+        dedup = self.dedup
+        if dedup is not None and deframed:
+            now = time.monotonic()
+        for frame in deframed:
+            if dedup is not None and dedup.check(frame, now):
+                self.stats.frames_duplicate += 1
+                continue
+            port = frame[0] >> 4
+            # Fixup T3-Micro NMEA Sentences
+            frame = kiss.strip_nmea(frame)
+            if not frame:
+                continue
+            if self.strip_df_start:
+                frame = kiss.strip_df_start(frame, port)
+            if port in port_callbacks:
+                if dispatch is None:
+                    port_callbacks[port](frame)
+                else:
+                    dispatch(port_callbacks[port], frame)
+            else:
+                frames.append(frame)
+        return frames
+
+    def write(self, frame, port=0):
         """
         Writes frame to KISS interface.
 
         :param frame: Frame to write.
+        :param port: KISS port (0-15) to write to.
+        """
+        frame_kiss = self._framer(port).encode(frame)
+        if self._trace:
+            self._logger.debug(
+                'frame_kiss(%s)="%s"', len(frame_kiss), frame_kiss)
+        if self.trace_sample:
+            self._trace_frames('tx', [frame], port)
+        self.stats.frames_out += 1
+        self._queue_writes([frame_kiss])
+
+    def write_many(self, frames, port=0):
         """
-        self._logger.debug('frame(%s)="%s"', len(frame), frame)
+        Writes frames to KISS interface. Unless write buffering is enabled,
+        all frames are written together in one flush.
 
-        frame_escaped = kiss.escape_special_codes(frame)
-        self._logger.debug(
-            'frame_escaped(%s)="%s"', len(frame_escaped), frame_escaped)
+        :param frames: List of frames to write.
+        :param port: KISS port (0-15) to write to.
+        """
+        if self.trace_sample:
+            self._trace_frames('tx', frames, port)
+        self.stats.frames_out += len(frames)
+        self._queue_writes([self._framer(port).encode_many(frames)])
+
+    def _queue_writes(self, buffers):
+        with self._write_lock:
+            self._write_queue.extend(buffers)
+            self._write_queued += sum(map(len, buffers))
+
+            if self._write_queued >= self.flush_size:
+                self._flush()
+            elif self.flush_interval and self._flush_timer is None:
+                self._flush_timer = self._start_flush_timer()
+
+    def _start_flush_timer(self):
+        """
+        Calls `flush()` in `flush_interval` seconds. Returns a timer with a
+        `cancel()` method.
+        """
+        timer = threading.Timer(self.flush_interval, self.flush)
+        timer.daemon = True
+        timer.start()
+        return timer
 
-        frame_kiss = ''.join([
-            kiss.FEND,
-            kiss.DATA_FRAME,
-            frame_escaped,
-            kiss.FEND
-        ])
-        self._logger.debug(
-            'frame_kiss(%s)="%s"', len(frame_kiss), frame_kiss)
+    def flush(self):
+        """
+        Writes any queued frames to KISS interface.
+        """
+        with self._write_lock:
+            self._flush()
 
-        self._write_handler(frame_kiss)
+    def _flush(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
 
+        if not self._write_queue:
+            return
+
+        buffers = self._write_queue
+        self.stats.bytes_out += self._write_queued
+        self._write_queue = []
+        self._write_queued = 0
+        if self._trace:
+            self._logger.debug('Flushing %s frames', len(buffers))
+        self._flush_handler(buffers)
 
-class TCPKISS(KISS):
 
-    """KISS TCP Class."""
+class TCPKISS(KISS):
 
-    def __init__(self, host, port, strip_df_start=False):
+    """
+    KISS TCP Class.
+
+    With `zero_copy=True`, data is received with `recv_into` into one reusable
+    buffer and handed to the Deframer as a memoryview, so the only copies
+    made of received data are the frames themselves.
+
+    When the peer closes the connection, or nothing is received for
+    `idle_timeout` seconds, reads raise `SocketClosetError`. With
+    `reconnect=True`, the connection is instead re-established, backing off
+    exponentially with random jitter between `reconnect_delay` and
+    `max_reconnect_delay` seconds. Frames being flushed when the connection
+    fails are sent again once reconnected, so a frame may be delivered
+    twice but is never lost. Reconnecting is for `read()` and
+    `start_reader()`: while registered with a Multiplexer, the interface
+    does not reconnect, and is unregistered when its connection is lost.
+
+    `keepalive` enables TCP keepalive probes after that many idle seconds,
+    to notice a peer that went away without closing the connection.
+    """
+
+    def __init__(self, host, port, strip_df_start=False,
+                 zero_copy: bool=False, reconnect: bool=False,
+                 keepalive: int=None, idle_timeout: float=None) -> None:
         self.address = (host, int(port))
         self.strip_df_start = strip_df_start
+        self.zero_copy = zero_copy
+        self.reconnect = reconnect
+        self.reconnect_delay = kiss.RECONNECT_DELAY
+        self.max_reconnect_delay = kiss.MAX_RECONNECT_DELAY
+        self.keepalive = keepalive
+        self.idle_timeout = idle_timeout
+        self._recv_buffer = bytearray()
+        self._recv_view = memoryview(self._recv_buffer)
+        self._connect_lock = threading.Lock()
+        self._stopped = threading.Event()
         super(TCPKISS, self).__init__(strip_df_start)
 
+    def _recv(self, read_bytes):
+        """
+        Receives into the reusable buffer. The returned memoryview is only
+        valid until the next read.
+        """
+        if len(self._recv_buffer) < read_bytes:
+            self._recv_buffer = bytearray(read_bytes)
+            self._recv_view = memoryview(self._recv_buffer)
+        read_len = self.interface.recv_into(self._recv_view, read_bytes)
+        return self._recv_view[:read_len]
+
     def _read_handler(self, read_bytes=None):
         read_bytes = read_bytes or kiss.READ_BYTES
-        read_data = self.interface.recv(read_bytes)
-        self._logger.debug('len(read_data)=%s', len(read_data))
+        interface = self.interface
+        try:
+            if self.zero_copy:
+                read_data = self._recv(read_bytes)
+            else:
+                read_data = interface.recv(read_bytes)
+        except BlockingIOError:
+            return None
+        except OSError as exc:
+            # Including socket.timeout after `idle_timeout`.
+            self._connection_lost(interface, exc)
+            return None
+        if not len(read_data):
+            self._connection_lost(interface, 'closed by peer')
+            return None
+        if self._trace:
+            self._logger.debug('len(read_data)=%s', len(read_data))
         return read_data
 
+    def _connection_lost(self, interface, reason):
+        """
+        Reconnects, or raises SocketClosetError if not reconnecting.
+        """
+        if not self.reconnect or self._multiplexed or self._stopped.is_set():
+            raise kiss.SocketClosetError(
+                'Connection to {} lost: {}'.format(self.address, reason))
+        self._logger.warning(
+            'Connection to %s lost: %s', self.address, reason)
+        self._reconnect(interface)
+
+    def _reconnect(self, interface):
+        """
+        Replaces the failed `interface`, unless another thread already has.
+        """
+        with self._connect_lock:
+            if interface is not self.interface:
+                return
+            interface.close()
+            self._deframer.reset()
+            self._connect()
+            self.stats.reconnects += 1
+
+    def _connect(self):
+        """
+        Connects, retrying with backoff if `reconnect` is set.
+        """
+        attempt = 0
+        while 1:
+            interface = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._logger.debug('Conntecting to %s', self.address)
+            try:
+                interface.connect(self.address)
+                break
+            except OSError as exc:
+                interface.close()
+                if not self.reconnect or self._stopped.is_set():
+                    raise
+                delay = random.uniform(0, min(
+                    self.max_reconnect_delay,
+                    self.reconnect_delay * 2 ** attempt))
+                attempt += 1
+                self._logger.warning(
+                    'Connecting to %s failed: %s, retrying in %.1fs',
+                    self.address, exc, delay)
+                if self._stopped.wait(delay):
+                    raise kiss.SocketClosetError(
+                        'Stopped connecting to {}'.format(self.address))
+
+        if self.keepalive:
+            interface.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            for option, value in (('TCP_KEEPIDLE', self.keepalive),
+                                  ('TCP_KEEPINTVL', self.keepalive),
+                                  ('TCP_KEEPCNT', kiss.KEEPALIVE_PROBES)):
+                if hasattr(socket, option):
+                    interface.setsockopt(
+                        socket.IPPROTO_TCP, getattr(socket, option), value)
+        if self.idle_timeout:
+            interface.settimeout(self.idle_timeout)
+
+        self.interface = interface
+        self._write_handler = interface.sendall
+        self._logger.info('Connected to %s', self.address)
+
+    def setblocking(self, flag):
+        self.interface.setblocking(flag)
+
+    def _flush_handler(self, buffers):
+        """
+        Sends all buffers with scatter/gather `sendmsg`, resuming after
+        partial sends.
+        """
+        if not hasattr(self.interface, 'sendmsg'):
+            data = b''.join(buffers)
+            while 1:
+                interface = self.interface
+                try:
+                    interface.sendall(data)
+                    return
+                except OSError as exc:
+                    self._connection_lost(interface, exc)
+
+        buffers = list(map(memoryview, buffers))
+        # The first buffer in full, to resend on a new connection.
+        head = buffers[0]
+        while buffers:
+            interface = self.interface
+            try:
+                sent = interface.sendmsg(buffers[:kiss.IOV_MAX])
+            except BlockingIOError:
+                select.select([], [interface], [])
+                continue
+            except OSError as exc:
+                self._connection_lost(interface, exc)
+                buffers[0] = head
+                continue
+
+            # Drop whatever was sent, keeping the unsent part of the last.
+            while sent:
+                if sent >= len(buffers[0]):
+                    sent -= len(buffers.pop(0))
+                    if buffers:
+                        head = buffers[0]
+                else:
+                    buffers[0] = buffers[0][sent:]
+                    sent = 0
+
     def stop(self):
+        self._stopped.set()
         if self.interface:
-            self.interface.shutdown(socket.SHUT_RDWR)
+            try:
+                self.interface.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
 
     def start(self):
         """
         Initializes the KISS device and commits configuration.
         """
-        self.interface = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self._logger.debug('Conntecting to %s', self.address)
-        self.interface.connect(self.address)
+        self._stopped.clear()
+        self._connect()
+
+
+class AsyncTCPKISS(KISS, asyncio.Protocol):
+
+    """
+    KISS TCP Class for asyncio.
+
+    Received data is deframed as it arrives in `data_received`, so one event
+    loop can service many KISS TCP links without a thread each. Reading is
+    paused once `max_queued` frames are waiting to be consumed, and resumed
+    when at most half as many are.
+    """
+
+    def __init__(self, host, port, strip_df_start=False,
+                 max_queued: int=1000) -> None:
+        self.address = (host, int(port))
+        self.max_queued = max_queued
+        self.transport = None
+        self._loop = None
+        self._frame_queue = None
+        self._can_write = None
+        self._reading_paused = False
+        super(AsyncTCPKISS, self).__init__(strip_df_start)
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.interface = transport
         self._logger.info('Connected to %s', self.address)
-        self._write_handler = self.interface.send
+
+    def data_received(self, data):
+        for frame in self._decode_frames(data):
+            self._frame_queue.put_nowait(frame)
+
+        if (self.max_queued and not self._reading_paused and
+                self._frame_queue.qsize() >= self.max_queued):
+            self._reading_paused = True
+            self.transport.pause_reading()
+
+    def connection_lost(self, exc):
+        self._logger.info('Disconnected from %s: %s', self.address, exc)
+        self.transport = None
+        # Wake any pending writers and end any frame iterators.
+        self._can_write.set()
+        self._frame_queue.put_nowait(None)
+
+    def pause_writing(self):
+        self._can_write.clear()
+
+    def resume_writing(self):
+        self._can_write.set()
+
+    async def start(self):  # pylint: disable=W0221
+        """
+        Connects to the KISS TCP host.
+        """
+        loop = self._loop = asyncio.get_event_loop()
+        self._frame_queue = asyncio.Queue()
+        self._can_write = asyncio.Event()
+        self._can_write.set()
+        self._logger.debug('Conntecting to %s', self.address)
+        await loop.create_connection(lambda: self, *self.address)
+
+    def stop(self):
+        # Also called from `__del__`, possibly after the loop has closed.
+        if self._loop is not None and self._loop.is_closed():
+            return
+        if self.transport and not self.transport.is_closing():
+            self.transport.close()
+
+    def _start_flush_timer(self):
+        """
+        Flushes on the event loop, as transports are not thread-safe.
+        """
+        if self._loop is None:
+            raise kiss.SocketClosetError(
+                'Not connected to {}'.format(self.address))
+        return self._loop.call_later(self.flush_interval, self.flush)
+
+    def _flush_handler(self, buffers):
+        """
+        Hands queued frames, e.g. from `write_many` or `write_setting`, to
+        the transport. Call from the event loop's thread.
+        """
+        if self.transport is None:
+            raise kiss.SocketClosetError(
+                'Not connected to {}'.format(self.address))
+        self.transport.writelines(buffers)
+
+    async def frames(self):
+        """
+        Iterates over frames as they are received, until the connection is
+        closed.
+
+        Usage: `async for frame in kiss_conn.frames(): ...`
+        """
+        while 1:
+            frame = await self._frame_queue.get()
+            if frame is None:
+                return
+
+            if (self._reading_paused and self.transport and
+                    self._frame_queue.qsize() <= self.max_queued // 2):
+                self._reading_paused = False
+                self.transport.resume_reading()
+
+            yield frame
+
+    async def write(self, frame, port=0):  # pylint: disable=W0236
+        """
+        Writes frame to KISS interface, waiting while the transport's write
+        buffer is above its high-water mark.
+
+        :param frame: Frame to write.
+        :param port: KISS port (0-15) to write to.
+        """
+        if self.transport is None:
+            raise kiss.SocketClosetError(
+                'Not connected to {}'.format(self.address))
+
+        frame_kiss = self._framer(port).encode(frame)
+        if self.trace_sample:
+            self._trace_frames('tx', [frame], port)
+        self.stats.frames_out += 1
+        self.stats.bytes_out += len(frame_kiss)
+        self.transport.write(frame_kiss)
+
+        await self._can_write.wait()
+
+    def write_threadsafe(self, frame, port=0):
+        """
+        Schedules `write()` on the connection's event loop, from any thread,
+        e.g. from synchronous callbacks.
+
+        :param frame: Frame to write.
+        :param port: KISS port (0-15) to write to.
+        :return: Future of the write.
+        :rtype: concurrent.futures.Future
+        """
+        if self._loop is None:
+            raise kiss.SocketClosetError(
+                'Not connected to {}'.format(self.address))
+        return asyncio.run_coroutine_threadsafe(
+            self.write(frame, port), self._loop)
 
 
 class SerialKISS(KISS):
 
-    """KISS Serial Class."""
+    """
+    KISS Serial Class.
+
+    By default, reads poll the port every SERIAL_TIMEOUT seconds. With
+    `blocking_read=True`, reads instead block until data arrives, then
+    `select` on the port to drain it until the line goes quiet, as set by
+    INTER_BYTE_CHARS. An idle port costs no CPU, and latency follows the
+    data rather than the polling interval. `read_bytes` then defaults to
+    SERIAL_READ_WINDOW seconds of data at `speed`. Blocking reads need a
+    port that supports `select`, i.e. not on Windows.
+    """
 
     def __init__(self, port: str, speed: str,
-                 strip_df_start: bool=False) -> None:
+                 strip_df_start: bool=False, blocking_read: bool=False,
+                 read_bytes: int=None) -> None:
         self.port = port
         self.speed = speed
         self.strip_df_start = strip_df_start
+        self.blocking_read = blocking_read
+        # 10 bits per character with 8N1 framing.
+        char_time = 10.0 / int(speed)
+        self.inter_byte_timeout = kiss.INTER_BYTE_CHARS * char_time
+        if read_bytes is None and blocking_read:
+            read_bytes = max(1, int(kiss.SERIAL_READ_WINDOW / char_time))
+        self.read_bytes = read_bytes or kiss.READ_BYTES
         super(SerialKISS, self).__init__(strip_df_start)
 
+    def _read_blocking(self, read_bytes):
+        """
+        Blocks for the first byte, then reads until `read_bytes` are read or
+        nothing arrives for `inter_byte_timeout`.
+        """
+        interface = self.interface
+        # Returns nothing if woken by `cancel_read()`.
+        read_data = interface.read(1)
+        while read_data and len(read_data) < read_bytes:
+            waiting = interface.in_waiting
+            if not waiting:
+                ready, _, _ = select.select(
+                    [interface.fileno()], [], [], self.inter_byte_timeout)
+                if not ready:
+                    break
+                waiting = 1
+            read_data += interface.read(
+                min(waiting, read_bytes - len(read_data)))
+        return read_data
+
     def _read_handler(self, read_bytes=None):
-        read_bytes = read_bytes or kiss.READ_BYTES
+        read_bytes = read_bytes or self.read_bytes
+        if self.blocking_read and self.interface.timeout is None:
+            read_data = self._read_blocking(read_bytes)
+            if self._trace:
+                self._logger.debug('len(read_data)=%s', len(read_data))
+            return read_data
+
         read_data = self.interface.read(read_bytes)
-        if len(read_data) > 0:
+        if self._trace and read_data:
             self._logger.debug('len(read_data)=%s', len(read_data))
 
         try:
@@ -255,10 +1335,23 @@ class SerialKISS(KISS):
             waiting_data = self.interface.outWaiting()
 
         if waiting_data:
-            self._logger.debug('waiting_data=%s', waiting_data)
+            if self._trace:
+                self._logger.debug('waiting_data=%s', waiting_data)
             read_data += self.interface.read(waiting_data)
         return read_data
 
+    def setblocking(self, flag):
+        if flag:
+            self._set_timeouts()
+        else:
+            self.interface.timeout = 0
+
+    def _set_timeouts(self):
+        if self.blocking_read:
+            self.interface.timeout = None
+        else:
+            self.interface.timeout = kiss.SERIAL_TIMEOUT
+
     def _write_defaults(self, **kwargs):
         """
         Previous verious defaulted to Xastir-friendly configs. Unfortunately
@@ -285,6 +1378,9 @@ class SerialKISS(KISS):
         self.interface.write(kiss.KISS_OFF)
 
     def stop(self):
+        if self.blocking_read and hasattr(self.interface, 'cancel_read'):
+            # Wakes a reader blocked waiting for data.
+            self.interface.cancel_read()
         try:
             if self.interface and self.interface.isOpen():
                 self.interface.close()
@@ -303,7 +1399,7 @@ class SerialKISS(KISS):
         """
         self._logger.debug('kwargs=%s', kwargs)
         self.interface = serial.Serial(self.port, self.speed)
-        self.interface.timeout = kiss.SERIAL_TIMEOUT
+        self._set_timeouts()
         self._write_handler = self.interface.write
         self._write_defaults(**kwargs)
 
@@ -312,5 +1408,130 @@ class SerialKISS(KISS):
         Initializes the KISS device without writing configuration.
         """
         self.interface = serial.Serial(self.port, self.speed)
-        self.interface.timeout = kiss.SERIAL_TIMEOUT
+        self._set_timeouts()
         self._write_handler = self.interface.write
+
+
+class Multiplexer(object):
+
+    """
+    Services many KISS interfaces from one thread.
+
+    Interfaces are registered with a selector and switched to non-blocking
+    reads; data is only read when an interface's file descriptor is
+    readable, and decoded frames are passed to that interface's callback.
+    Interfaces whose connection is lost are unregistered, even TCPKISS
+    interfaces with `reconnect` set.
+    """
+
+    _logger = logging.getLogger(__name__)  # pylint: disable=R0801
+
+    def __init__(self, read_bytes: int=None) -> None:
+        self.read_bytes = read_bytes
+        self._selector = selectors.DefaultSelector()
+        self._stopping = False
+        # Lets `stop()` wake a blocked `select()` from another thread.
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._selector.register(self._wakeup_r, selectors.EVENT_READ)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        return len(self._selector.get_map()) - 1
+
+    def register(self, kiss_interface, callback, filters=None):
+        """
+        Registers a started KISS interface.
+
+        :param kiss_interface: TCPKISS or SerialKISS instance.
+        :param callback: Callback to call with each decoded frame.
+        :param filters: If set, filters for the interface's frames.
+        """
+        if filters is not None:
+            kiss_interface.set_filters(filters)
+        kiss_interface.setblocking(False)
+        self._selector.register(
+            kiss_interface, selectors.EVENT_READ, callback)
+        # Reconnecting would block every other interface in `poll()`.
+        kiss_interface._multiplexed = True  # pylint: disable=W0212
+
+    def unregister(self, kiss_interface):
+        """
+        Unregisters a KISS interface, restoring blocking reads.
+        """
+        self._selector.unregister(kiss_interface)
+        kiss_interface._multiplexed = False  # pylint: disable=W0212
+        try:
+            kiss_interface.setblocking(True)
+        except OSError:
+            pass
+
+    def poll(self, timeout=None):
+        """
+        Waits for readable interfaces and dispatches their frames.
+
+        :param timeout: Seconds to wait, or None to wait indefinitely.
+        :return: Number of frames dispatched.
+        :rtype: int
+        """
+        dispatched = 0
+        for key, _ in self._selector.select(timeout):
+            if key.fileobj is self._wakeup_r:
+                try:
+                    self._wakeup_r.recv(kiss.READ_BYTES)
+                except BlockingIOError:
+                    pass
+                continue
+
+            kiss_interface = key.fileobj
+            try:
+                read_data = kiss_interface._read_handler(self.read_bytes)  # NOQA pylint: disable=W0212
+            except kiss.SocketClosetError:
+                read_data = b''
+            if read_data is None:
+                continue
+            if not read_data:
+                # Readable but empty: the peer has gone away.
+                self._logger.warning(
+                    'No data from readable interface %s, unregistering.',
+                    kiss_interface)
+                self.unregister(kiss_interface)
+                continue
+
+            for frame in kiss_interface._decode_frames(read_data):  # NOQA pylint: disable=W0212
+                key.data(frame)
+                dispatched += 1
+        return dispatched
+
+    def run(self):
+        """
+        Dispatches frames until `stop()` is called or no interfaces remain.
+        """
+        try:
+            while not self._stopping and len(self):
+                self.poll()
+        finally:
+            self._stopping = False
+
+    def stop(self):
+        """
+        Stops `run()`. Safe to call from another thread.
+        """
+        self._stopping = True
+        self._wakeup_w.send(b'\x00')
+
+    def close(self):
+        """
+        Unregisters all interfaces and releases the selector.
+        """
+        for key in list(self._selector.get_map().values()):
+            if key.fileobj is not self._wakeup_r:
+                self.unregister(key.fileobj)
+        self._selector.close()
+        self._wakeup_r.close()
+        self._wakeup_w.close()
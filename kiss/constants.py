@@ -13,10 +13,19 @@ __license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
 
 if bool(os.environ.get('DEBUG')):
     LOG_LEVEL = logging.DEBUG
-    logging.debug('Debugging Enabled via DEBUG Environment Variable.')
 else:
     LOG_LEVEL = logging.INFO
 
+# Per-chunk and per-frame DEBUG logging, see `KISS.trace`.
+TRACE = bool(os.environ.get('KISS_TRACE'))
+
+# Log 1 in every N frames read and written, see `KISS.trace_sample`.
+TRACE_SAMPLE = int(os.environ.get('KISS_TRACE_SAMPLE') or 0)
+
+# Use the compiled `kiss._speedups` extension if it was built. Set
+# KISS_SPEEDUPS=0 to use the pure-Python implementations.
+SPEEDUPS = os.environ.get('KISS_SPEEDUPS', '1') != '0'
+
 LOG_FORMAT = logging.Formatter(
     '%(asctime)s kiss %(levelname)s %(name)s.%(funcName)s:%(lineno)d'
     ' - %(message)s')
@@ -24,6 +33,35 @@ LOG_FORMAT = logging.Formatter(
 SERIAL_TIMEOUT = 0.01
 READ_BYTES = 1000
 
+# With `SerialKISS(blocking_read=True)`, a read returns once the line has
+# been quiet for INTER_BYTE_CHARS character times, or after reading up to
+# SERIAL_READ_WINDOW seconds worth of data at the port's speed.
+INTER_BYTE_CHARS = 4
+SERIAL_READ_WINDOW = 0.1
+
+# Largest frame the Deframer will reassemble, in bytes. Anything larger,
+# e.g. noise on a line with no FENDs, is discarded up to the next FEND.
+MAX_FRAME_SIZE = 65536
+
+# Policies for `KISS.start_reader()` when its queue is full.
+READER_POLICIES = ('block', 'drop_oldest', 'drop_newest')
+
+# Seconds during which a repeat of a frame is a duplicate, and most frames
+# to remember, see `kiss.DedupCache`.
+DEDUP_TTL = 30.0
+DEDUP_SIZE = 4096
+
+# Seconds to back off before the first TCP reconnect attempt, doubling up
+# to MAX_RECONNECT_DELAY, see `TCPKISS.reconnect`.
+RECONNECT_DELAY = 1.0
+MAX_RECONNECT_DELAY = 60.0
+
+# Unanswered TCP keepalive probes before a connection is dropped.
+KEEPALIVE_PROBES = 3
+
+# Most buffers to pass to one scatter/gather sendmsg call.
+IOV_MAX = 1024
+
 # KISS Special Characters
 # http://en.wikipedia.org/wiki/KISS_(TNC)#Special_Characters
 # http://k4kpk.com/content/notes-aprs-kiss-and-setting-tnc-x-igate-and-digipeater
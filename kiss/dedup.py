@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Python KISS Module Duplicate Suppression.
+
+Digipeated packets are heard several times, through different paths and on
+several ports. A `DedupCache` set as a KISS interface's `dedup` drops
+repeats of a frame heard within `ttl` seconds, before they are dispatched
+to callbacks or returned by `read()`. Frames are compared by a hash of
+their source, destination, control, PID and information field, ignoring
+the digipeater path.
+
+Usage::
+
+    kiss_conn.dedup = kiss.DedupCache(ttl=30)
+    kiss_conn.read(callback=p)
+    kiss_conn.dedup.hits, kiss_conn.dedup.misses
+
+"""
+
+import time
+
+import kiss
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+# SSID bits of an AX.25 address SSID byte, without the H/C and extension bits.
+SSID_MASK = 0x1E
+
+
+def frame_key(frame):
+    """
+    Hashes a frame's source, destination and everything after its address
+    field, ignoring the digipeater path.
+
+    :param frame: AX.25 frame, starting with its KISS command byte.
+    :return: The hash, or None if the frame has no valid address field.
+    :rtype: int
+    """
+    # The extension bit marks the last address; digipeaters start at 15.
+    end = 14
+    limit = min(len(frame), kiss.ax25.MAX_ADDRESSES * 7 + 1)
+    while end < limit and not frame[end] & 0x01:
+        end += 7
+    if end >= limit:
+        return None
+    return hash((frame[1:7], frame[7] & SSID_MASK,
+                 frame[8:14], frame[14] & SSID_MASK, frame[end + 1:]))
+
+
+class DedupCache(object):
+
+    """
+    Bounded, time-evicted cache of frame hashes.
+
+    Hashes are kept in a ring of `size` slots in arrival order, with a dict
+    from hash to slot. Each lookup first evicts the expired slots at the
+    head of the ring, so the cost per frame is constant, amortized. When
+    more than `size` distinct frames arrive within `ttl` seconds, the oldest
+    are evicted early.
+
+    Not thread-safe: share one cache only between interfaces read from the
+    same thread, e.g. a `Multiplexer`.
+
+    :param ttl: Seconds after a frame is first seen during which it is a
+        duplicate.
+    :param size: Most hashes to keep.
+    """
+
+    __slots__ = ('ttl', 'size', 'hits', 'misses', '_times', '_keys', '_slots',
+                 '_head', '_count')
+
+    def __init__(self, ttl: float=kiss.DEDUP_TTL,
+                 size: int=kiss.DEDUP_SIZE) -> None:
+        self.ttl = ttl
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._times = [0.0] * size
+        self._keys = [None] * size
+        self._slots = {}
+        self._head = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, key):
+        return key in self._slots
+
+    def clear(self):
+        """Forgets all hashes, keeping the hit and miss counts."""
+        self._keys = [None] * self.size
+        self._slots.clear()
+        self._head = 0
+        self._count = 0
+
+    def _evict(self):
+        """Drops the slot at the head of the ring."""
+        head = self._head
+        key = self._keys[head]
+        if self._slots.get(key) == head:
+            del self._slots[key]
+        self._keys[head] = None
+        self._head = (head + 1) % self.size
+        self._count -= 1
+
+    def seen(self, key, now):
+        """
+        Checks and records `key`.
+
+        :param key: Frame hash, see `frame_key()`.
+        :param now: Current `time.monotonic()`.
+        :return: True if `key` was seen within `ttl` seconds.
+        :rtype: bool
+        """
+        times = self._times
+        expired = now - self.ttl
+        while self._count and times[self._head] <= expired:
+            self._evict()
+
+        if key in self._slots:
+            self.hits += 1
+            return True
+        self.misses += 1
+
+        if self._count == self.size:
+            self._evict()
+        slot = (self._head + self._count) % self.size
+        times[slot] = now
+        self._keys[slot] = key
+        self._slots[key] = slot
+        self._count += 1
+        return False
+
+    def check(self, frame, now):
+        """
+        Checks and records a frame, starting with its KISS command byte.
+        Frames other than data frames, and frames without a valid address
+        field, are never duplicates.
+
+        :param now: Current `time.monotonic()`.
+        :rtype: bool
+        """
+        if frame[0] & 0x0F:
+            return False
+        key = frame_key(frame)
+        if key is None:
+            return False
+        return self.seen(key, now)
+
+
+def drop_duplicates(frames, cache=None):
+    """
+    Generator stage yielding the frames, starting with their KISS command
+    byte, that are not duplicates, e.g. over `KISS.frames()`.
+
+    :param frames: Iterable of frames.
+    :param cache: `DedupCache` to use, or None for a new one.
+    """
+    if cache is None:
+        cache = DedupCache()
+    monotonic = time.monotonic
+    for frame in frames:
+        if not cache.check(frame, monotonic()):
+            yield frame
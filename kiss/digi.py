@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Python KISS Module Digipeater.
+
+An APRS digipeater for any KISS interface. Each frame heard is checked
+against a lookup table built once from the digipeater's callsign, aliases
+and WIDEn-N settings, keyed by the encoded address of the next unused hop
+in its path. A frame to digipeat is copied once, and only the bytes of that
+one address are rewritten before it is sent back out the port it was heard
+on:
+
+* our callsign has its has-been-repeated bit set;
+* an alias, e.g. RELAY, or a WIDEn-N on its last hop, e.g. WIDE1-1 or
+  WIDE2-1, is replaced with our callsign, marked repeated;
+* any other WIDEn-N has its SSID decremented, e.g. WIDE2-2 to WIDE2-1.
+
+Callsigns are not inserted, so the frame keeps its length.
+
+Usage::
+
+    digi = kiss.digi.Digipeater(kiss_conn, 'N0CALL-1', aliases=['RELAY'])
+    digi.run()
+
+"""
+
+import logging
+import threading
+import time
+
+import kiss
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+# Path aliases decremented as WIDEn-N, and the largest n digipeated.
+WIDE_ALIASES = ('WIDE',)
+MAX_HOPS = 2
+
+# Offset of the first digipeater address in a frame without its KISS
+# command byte.
+PATH_OFFSET = 2 * kiss.ax25.ADDRESS_LENGTH
+
+
+def _key(callsign):
+    """
+    Encodes a callsign as a lookup table key: its six encoded callsign bytes
+    and SSID bits.
+    """
+    address = kiss.ax25.encode_address(callsign)
+    return address[:6], address[6] & kiss.dedup.SSID_MASK
+
+
+class Digipeater(object):
+
+    """
+    APRS Digipeater.
+
+    Frames already digipeated within `dupe_window` seconds, through any path,
+    are not digipeated again. With `viscous_delay`, frames are held for that
+    many seconds first, and dropped if another digipeater is heard repeating
+    them meanwhile.
+
+    Frames and duplicates are counted in `stats.frames_in`,
+    `stats.frames_out` and `stats.frames_duplicate`.
+
+    On an `AsyncTCPKISS` interface, pass each frame from `frames()` to
+    `digipeat()`; frames are then sent with its `write_threadsafe()`.
+
+    :param kiss_interface: KISS interface to digipeat on.
+    :param callsign: Our callsign, e.g. 'N0CALL-1'.
+    :param aliases: Aliases replaced with our callsign, e.g. ['RELAY'].
+    :param wide_aliases: Aliases digipeated as WIDEn-N, e.g. ['WIDE', 'NJ'].
+    :param max_hops: Largest n of WIDEn-N to digipeat.
+    :param dupe_window: Seconds during which a frame is a duplicate.
+    :param viscous_delay: Seconds to hold frames before sending, or 0.
+    """
+
+    _logger = logging.getLogger(__name__)  # pylint: disable=R0801
+
+    def __init__(self, kiss_interface, callsign, aliases=(),
+                 wide_aliases=WIDE_ALIASES, max_hops: int=MAX_HOPS,
+                 dupe_window: float=kiss.DEDUP_TTL,
+                 viscous_delay: float=0.0) -> None:
+        self.kiss = kiss_interface
+        self.callsign = callsign.upper()
+        self.viscous_delay = viscous_delay
+        self.stats = kiss.Stats()
+        self.dedup = kiss.DedupCache(dupe_window)
+        self._table = self._build_table(aliases, wide_aliases, max_hops)
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+
+    def __call__(self, frame):
+        self.digipeat(frame)
+
+    def _build_table(self, aliases, wide_aliases, max_hops):
+        """
+        Maps each address key to digipeat to its replacement: the six
+        callsign bytes to write, or None to keep them, the SSID bits, and
+        whether to set the has-been-repeated bit.
+        """
+        address = kiss.ax25.encode_address(self.callsign)
+        ours = (address[:6], address[6] & kiss.dedup.SSID_MASK, True)
+        table = {_key(self.callsign): (None, ours[1], True)}
+        for alias in aliases:
+            table[_key(alias)] = ours
+        for alias in wide_aliases:
+            for hops in range(1, max_hops + 1):
+                table[_key('{}{}-1'.format(alias, hops))] = ours
+                for remaining in range(2, hops + 1):
+                    table[_key('{}{}-{}'.format(alias, hops, remaining))] = (
+                        None, (remaining - 1) << 1, False)
+        return table
+
+    def run(self):
+        """Digipeats frames read from the KISS interface, indefinitely."""
+        self.kiss.strip_df_start = False
+        self.kiss.read(callback=self.digipeat)
+
+    def start(self):
+        """Digipeats frames on the KISS interface's reader thread."""
+        self.kiss.strip_df_start = False
+        self.kiss.start_reader(self.digipeat)
+
+    def stop(self):
+        """Stops the reader thread and drops frames held by viscous delay."""
+        self.kiss.stop_reader()
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        for timer in pending.values():
+            timer.cancel()
+
+    def digipeat(self, frame):
+        """
+        Digipeats a frame, starting with its KISS command byte, if its next
+        hop is us.
+
+        :return: True if the frame was sent or held to be sent.
+        :rtype: bool
+        """
+        if frame[0] & 0x0F:
+            return False
+        self.stats.frames_in += 1
+        key = kiss.dedup.frame_key(frame)
+        if key is None:
+            return False
+
+        if self._pending:
+            with self._pending_lock:
+                timer = self._pending.pop(key, None)
+            if timer is not None:
+                # Another digipeater got there first.
+                timer.cancel()
+                self.stats.frames_duplicate += 1
+                return False
+
+        # Find the first digipeater that has not repeated the frame.
+        offset = PATH_OFFSET + 1
+        ssid = frame[offset - 1]
+        while not ssid & 0x01:
+            if offset + kiss.ax25.ADDRESS_LENGTH > len(frame):
+                return False
+            ssid = frame[offset + 6]
+            if not ssid & kiss.ax25.H_BIT:
+                break
+            offset += kiss.ax25.ADDRESS_LENGTH
+        else:
+            # No path, or every digipeater has repeated the frame.
+            return False
+
+        replacement = self._table.get(
+            (frame[offset:offset + 6], ssid & kiss.dedup.SSID_MASK))
+        if replacement is None:
+            return False
+        if self.dedup.seen(key, time.monotonic()):
+            self.stats.frames_duplicate += 1
+            return False
+
+        # The frame without its command byte, with the one address updated.
+        buffer = bytearray(memoryview(frame)[1:])
+        callsign, ssid_bits, repeated = replacement
+        offset -= 1
+        if callsign is not None:
+            buffer[offset:offset + 6] = callsign
+        buffer[offset + 6] = (
+            ssid & ~(kiss.dedup.SSID_MASK | kiss.ax25.H_BIT) | ssid_bits |
+            (kiss.ax25.H_BIT if repeated else 0))
+
+        port = frame[0] >> 4
+        if not self.viscous_delay:
+            self._send(buffer, port)
+            return True
+        timer = threading.Timer(
+            self.viscous_delay, self._send_held, (key, buffer, port))
+        timer.daemon = True
+        with self._pending_lock:
+            self._pending[key] = timer
+        timer.start()
+        return True
+
+    def _send(self, buffer, port):
+        if isinstance(self.kiss, kiss.AsyncTCPKISS):
+            self.kiss.write_threadsafe(buffer, port).add_done_callback(
+                self._sent_async)
+            return
+        self.kiss.write(buffer, port)
+        self.stats.frames_out += 1
+
+    def _sent_async(self, future):
+        exc = future.exception()
+        if exc is not None:
+            self._logger.warning('Dropped digipeated frame: %s', exc)
+            return
+        self.stats.frames_out += 1
+
+    def _send_held(self, key, buffer, port):
+        with self._pending_lock:
+            if self._pending.pop(key, None) is None:
+                return
+        try:
+            self._send(buffer, port)
+        except (OSError, kiss.SocketClosetError) as exc:
+            self._logger.warning('Dropped digipeated frame: %s', exc)
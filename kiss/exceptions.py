@@ -11,3 +11,8 @@ __license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
 class SocketClosetError(Exception):
     """Socket Closed Error."""
     pass
+
+
+class FrameError(Exception):
+    """Malformed Frame Error."""
+    pass
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Python KISS Module Frame Filters.
+
+Filters match raw KISS frames, starting with their command byte, against the
+encoded AX.25 header. Each filter's `check(frame, length)` returns True or
+False once `length` bytes of the frame are enough to decide, or None if it
+needs more.
+
+Usage::
+
+    kiss_conn.read(callback=p, filters=[
+        kiss.by_source('W2GMD*'), kiss.by_pid(0xF0), kiss.by_port(1)])
+
+"""
+
+import kiss
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+# Offsets of the AX.25 addresses within a KISS frame.
+DESTINATION_OFFSET = 1
+SOURCE_OFFSET = DESTINATION_OFFSET + kiss.ax25.ADDRESS_LENGTH
+
+# SSID bits of an AX.25 address SSID byte.
+SSID_MASK = 0x1E
+
+# Translation table from ASCII callsign characters to encoded bytes.
+_ENCODE_TABLE = bytes((x << 1) & 0xFF for x in range(256))
+
+
+class PrefixFilter(object):
+
+    """
+    Matches `value` at `offset`, with an optional `ssid` compared under
+    SSID_MASK in the byte following `value`.
+    """
+
+    __slots__ = ('offset', 'value', 'ssid', 'needed')
+
+    def __init__(self, offset, value, ssid=None) -> None:
+        self.offset = offset
+        self.value = value
+        self.ssid = ssid
+        self.needed = offset + len(value) + (ssid is not None)
+
+    def check(self, frame, length):
+        """Matches the frame prefix."""
+        if length < self.needed:
+            return None
+        offset = self.offset
+        end = offset + len(self.value)
+        if frame[offset:end] != self.value:
+            return False
+        if self.ssid is not None:
+            return frame[end] & SSID_MASK == self.ssid
+        return True
+
+
+class PortFilter(object):
+
+    """Matches the KISS port in the command byte."""
+
+    __slots__ = ('port',)
+
+    def __init__(self, port) -> None:
+        self.port = port
+
+    def check(self, frame, length):
+        """Matches the command byte's port nibble."""
+        if length < 1:
+            return None
+        return frame[0] >> 4 == self.port
+
+
+class PIDFilter(object):
+
+    """Matches the AX.25 Protocol ID, following a variable-length path."""
+
+    __slots__ = ('pid',)
+
+    def __init__(self, pid) -> None:
+        self.pid = pid
+
+    def check(self, frame, length):
+        """Finds the end of the address field and matches the PID."""
+        address_length = kiss.ax25.ADDRESS_LENGTH
+        end = DESTINATION_OFFSET + address_length
+        for _ in range(kiss.ax25.MAX_ADDRESSES):
+            if length < end:
+                return None
+            if frame[end - 1] & 0x01:
+                # The PID follows the control byte.
+                if length < end + 2:
+                    return None
+                return frame[end + 1] == self.pid
+            end += address_length
+        return False
+
+
+def _address_filter(offset, callsign):
+    """
+    Builds a PrefixFilter for an address: 'W2GMD-6' matches that callsign
+    and SSID, 'W2GMD-*' any SSID, and 'W2GMD*' any callsign starting with
+    'W2GMD'.
+    """
+    callsign = callsign.upper()
+    ssid = None
+    if callsign.endswith('-*'):
+        callsign = callsign[:-2].ljust(6)
+    elif callsign.endswith('*'):
+        callsign = callsign[:-1]
+    else:
+        if '-' in callsign:
+            callsign, ssid = callsign.split('-')
+        callsign = callsign.ljust(6)
+        ssid = int(ssid or 0) << 1
+    return PrefixFilter(
+        offset, callsign.encode('ascii').translate(_ENCODE_TABLE), ssid)
+
+
+def by_source(callsign):
+    """Matches frames from `callsign`; see `_address_filter`."""
+    return _address_filter(SOURCE_OFFSET, callsign)
+
+
+def by_destination(callsign):
+    """Matches frames to `callsign`; see `_address_filter`."""
+    return _address_filter(DESTINATION_OFFSET, callsign)
+
+
+def by_pid(pid):
+    """Matches frames with AX.25 Protocol ID `pid`, e.g. 0xF0."""
+    return PIDFilter(pid)
+
+
+def by_port(port):
+    """Matches frames received on KISS port `port`."""
+    return PortFilter(port)
+
+
+def compile_filters(filters):
+    """
+    Combines filters into one check that all of them match, for use as a
+    Deframer `frame_filter`.
+
+    :param filters: List of filters.
+    :returns: Combined check function, or None if there are no filters.
+    """
+    if not filters:
+        return None
+
+    checks = tuple(frame_filter.check for frame_filter in filters)
+
+    def check(frame, length):
+        """Returns False on any mismatch, None until all have decided."""
+        result = True
+        for _check in checks:
+            matched = _check(frame, length)
+            if matched is False:
+                return False
+            if matched is None:
+                result = None
+        return result
+
+    return check
+
+
+def filter_frames(frames, filters):
+    """
+    Generator stage yielding the frames, starting with their KISS command
+    byte, that match all `filters`, e.g. over `KISS.frames()`.
+
+    :param frames: Iterable of frames.
+    :param filters: List of filters.
+    """
+    check = compile_filters(filters)
+    for frame in frames:
+        if check is None or check(frame, len(frame)):
+            yield frame
@@ -0,0 +1,379 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Python KISS Module APRS-IS IGate.
+
+Gates APRS packets heard on a KISS interface to APRS-IS. An `IGate` is a
+read callback that converts each AX.25 UI frame to a TNC2 text line,
+suppresses duplicates heard within `kiss.DEDUP_TTL` seconds, and queues the
+line to an `APRSISUplink`. The uplink keeps one persistent connection to
+the first reachable server of its pool, reconnecting with backoff, and
+sends queued lines in batches.
+
+Usage::
+
+    uplink = kiss.igate.APRSISUplink('N0CALL-10', kiss.igate.passcode('N0CALL'))
+    with uplink:
+        kiss_conn.read(callback=kiss.igate.IGate(uplink))
+
+Several IGates, e.g. one per TNC, can share one uplink.
+"""
+
+import collections
+import logging
+import random
+import select
+import socket
+import threading
+import time
+
+import kiss
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+# APRS-IS servers to try, in order.
+APRSIS_SERVERS = (('rotate.aprs2.net', 14580),)
+
+# Seconds to wait for more lines before sending a batch.
+BATCH_INTERVAL = 0.05
+
+# APRS-IS servers send a keepalive comment every 20 seconds, so a connection
+# with nothing received for this long is dead.
+IDLE_TIMEOUT = 120.0
+
+# Path elements of packets that must not be gated.
+NOGATE = (b'TCPIP', b'TCPXX', b'NOGATE', b'RFONLY')
+
+# Suffix for each address SSID byte, e.g. b'' for SSID 0, b'-6' for SSID 6.
+_SSID_TABLE = tuple(
+    suffix.encode('ascii') for suffix in kiss.ax25.SSID_TABLE)
+
+
+def passcode(callsign):
+    """
+    Computes the APRS-IS passcode for a callsign, ignoring any SSID.
+
+    :rtype: int
+    """
+    callsign = callsign.split('-')[0].upper()
+    code = 0x73E2
+    for i, char in enumerate(callsign):
+        code ^= ord(char) << (8 if not i % 2 else 0)
+    return code & 0x7FFF
+
+
+def to_tnc2(frame, igate_call=None):
+    """
+    Formats an APRS packet as a TNC2 line, e.g. b'W2GMD-6>APRS,WIDE1-1*:>',
+    with '*' after the last digipeater that repeated it. The information
+    field is cut at the first CR or LF.
+
+    All addresses are decoded with one translate of the address field.
+
+    :param frame: AX.25 frame, without its KISS command byte.
+    :param igate_call: If set, appends a qAR construct naming this IGate to
+        the path.
+    :return: The TNC2 line, or None if the frame is not an APRS packet.
+    :rtype: bytes
+    """
+    end = kiss.AX25Frame(frame).address_count * kiss.ax25.ADDRESS_LENGTH
+    if (len(frame) < end + 2 or
+            frame[end] & 0xEF != kiss.ax25.UI_CONTROL or
+            frame[end + 1] != kiss.UI_PROTOCOL_ID[0]):
+        return None
+
+    text = bytes(frame[:end]).translate(kiss.ax25.CALLSIGN_TABLE)
+    calls = [text[start:start + 6].rstrip(b' ') + _SSID_TABLE[frame[start + 6]]
+             for start in range(0, end, kiss.ax25.ADDRESS_LENGTH)]
+    for i in range(len(calls) - 1, 1, -1):
+        if frame[i * kiss.ax25.ADDRESS_LENGTH + 6] & kiss.ax25.H_BIT:
+            calls[i] += b'*'
+            break
+    if igate_call is not None:
+        calls.extend((b'qAR', igate_call.encode('ascii')))
+
+    info = bytes(frame[end + 2:])
+    for char in (b'\r', b'\n'):
+        if char in info:
+            info = info[:info.index(char)]
+    return b''.join((calls[1], b'>', b','.join([calls[0]] + calls[2:]),
+                     b':', info))
+
+
+class IGate(object):
+
+    """
+    APRS-IS IGate stage, a read callback for frames with their KISS command
+    byte.
+
+    Frames that are not APRS packets, or whose path asks not to be gated,
+    are counted in `stats.frames_dropped`. Packets heard again within
+    `dupe_window` seconds, through any path, are counted in
+    `stats.frames_duplicate`; `dedup` holds the hit and miss counts.
+
+    :param uplink: `APRSISUplink` to queue lines to.
+    :param dupe_window: Seconds within which a packet is a duplicate.
+    """
+
+    def __init__(self, uplink, dupe_window: float=kiss.DEDUP_TTL) -> None:
+        self.uplink = uplink
+        self.stats = kiss.Stats()
+        self.dedup = kiss.DedupCache(dupe_window)
+
+    def __call__(self, frame):
+        self.gate(frame)
+
+    def gate(self, frame):
+        """
+        Gates a frame, starting with its KISS command byte.
+
+        :return: True if the frame was queued to the uplink.
+        :rtype: bool
+        """
+        self.stats.frames_in += 1
+        if frame[0] & 0x0F != 0:
+            self.stats.frames_dropped += 1
+            return False
+        try:
+            line = to_tnc2(memoryview(frame)[1:], self.uplink.callsign)
+        except kiss.FrameError:
+            line = None
+        if line is None or self._nogate(line):
+            self.stats.frames_dropped += 1
+            return False
+        if self.dedup.check(frame, time.monotonic()):
+            self.stats.frames_duplicate += 1
+            return False
+        self.uplink.send(line)
+        return True
+
+    @staticmethod
+    def _nogate(line):
+        path = line[:line.index(b':')].split(b',')[1:]
+        return any(call.rstrip(b'*') in NOGATE for call in path)
+
+
+class APRSISUplink(object):
+
+    """
+    Persistent, batched APRS-IS uplink.
+
+    `send()` queues lines to a sender thread, which connects to the first
+    reachable server in `servers`, logs in, and sends everything queued
+    within `batch_interval` seconds of the first line in one write. A
+    failed connection is replaced, trying each server in turn and backing
+    off exponentially with random jitter between `reconnect_delay` and
+    `max_reconnect_delay` seconds. A batch that failed to send is sent again
+    once reconnected, relying on APRS-IS to drop any duplicates.
+
+    While disconnected, up to `max_queued` lines are queued; older lines
+    are dropped first and counted in `stats.queue_drops`.
+
+    :param callsign: IGate callsign to log in with.
+    :param passcode: APRS-IS passcode for `callsign`, see `passcode()`.
+    :param servers: Sequence of (host, port) servers to connect to.
+    :param aprs_filter: Optional APRS-IS server-side filter.
+    :param max_queued: Most lines to queue.
+    :param batch_interval: Seconds to wait for more lines before sending.
+    :param idle_timeout: Seconds without data from the server before
+        reconnecting.
+    """
+
+    _logger = logging.getLogger(__name__)  # pylint: disable=R0801
+
+    def __init__(self, callsign, passcode, servers=APRSIS_SERVERS,  # NOQA pylint: disable=W0621
+                 aprs_filter: str=None, max_queued: int=1000,
+                 batch_interval: float=BATCH_INTERVAL,
+                 idle_timeout: float=IDLE_TIMEOUT) -> None:
+        self.callsign = callsign.upper()
+        self.passcode = passcode
+        self.servers = list(servers)
+        self.aprs_filter = aprs_filter
+        self.max_queued = max_queued
+        self.batch_interval = batch_interval
+        self.idle_timeout = idle_timeout
+        self.reconnect_delay = kiss.RECONNECT_DELAY
+        self.max_reconnect_delay = kiss.MAX_RECONNECT_DELAY
+        self.stats = kiss.Stats()
+        self.server = None
+        self._sock = None
+        self._server_index = 0
+        self._lines = collections.deque(maxlen=max_queued)
+        self._thread = None
+        self._stopped = threading.Event()
+        self._connected = threading.Event()
+        self._wakeup_r = None
+        self._wakeup_w = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @property
+    def connected(self):
+        """True while logged in to a server."""
+        return self._connected.is_set()
+
+    def wait_connected(self, timeout=None):
+        """
+        Waits until logged in to a server.
+
+        :return: True if connected.
+        :rtype: bool
+        """
+        return self._connected.wait(timeout)
+
+    def start(self):
+        """Starts the sender thread, which connects in the background."""
+        # Lets `send()` and `stop()` wake the sender thread's `select()`.
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._wakeup_w.setblocking(False)
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stops the sender thread and disconnects. Unsent lines are kept."""
+        self._stopped.set()
+        self._wakeup()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._close()
+        if self._wakeup_r is not None:
+            self._wakeup_r.close()
+            self._wakeup_w.close()
+            self._wakeup_r = self._wakeup_w = None
+
+    def send(self, line):
+        """
+        Queues a TNC2 line, without its line ending. Safe to call from any
+        thread.
+        """
+        if len(self._lines) >= self.max_queued:
+            self.stats.queue_drops += 1
+        self._lines.append(line)
+        self._wakeup()
+
+    def _wakeup(self):
+        wakeup_w = self._wakeup_w
+        if wakeup_w is None:
+            return
+        try:
+            wakeup_w.send(b'\x00')
+        except OSError:
+            # Already more than enough wakeups pending, or stopped.
+            pass
+
+    def _login(self):
+        login = 'user {} pass {} vers kiss {}'.format(
+            self.callsign, self.passcode, kiss.__version__)
+        if self.aprs_filter:
+            login += ' filter {}'.format(self.aprs_filter)
+        return login.encode('ascii') + b'\r\n'
+
+    def _connect(self):
+        """Connects and logs in to the next server of the pool."""
+        server = self.servers[self._server_index % len(self.servers)]
+        self._server_index += 1
+        self._logger.debug('Conntecting to %s', server)
+        sock = socket.create_connection(server, timeout=self.idle_timeout)
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.sendall(self._login())
+        except OSError:
+            sock.close()
+            raise
+        # Start over from the first server on the next failure.
+        self._server_index = 0
+        self._sock = sock
+        self.server = server
+        self._connected.set()
+        self._logger.info('Connected to APRS-IS server %s', server)
+
+    def _close(self):
+        self._connected.clear()
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def _run(self):
+        attempt = 0
+        while not self._stopped.is_set():
+            if self._sock is None:
+                reconnecting = self.server is not None
+                try:
+                    self._connect()
+                except OSError as exc:
+                    # Back off once every server has been tried.
+                    if self._server_index < len(self.servers):
+                        continue
+                    delay = random.uniform(0, min(
+                        self.max_reconnect_delay,
+                        self.reconnect_delay * 2 ** attempt))
+                    attempt += 1
+                    self._server_index = 0
+                    self._logger.warning(
+                        'Connecting to APRS-IS failed: %s, retrying in %.1fs',
+                        exc, delay)
+                    self._stopped.wait(delay)
+                    continue
+                if reconnecting:
+                    self.stats.reconnects += 1
+                attempt = 0
+
+            try:
+                self._poll()
+            except OSError as exc:
+                self._logger.warning(
+                    'Connection to APRS-IS server %s lost: %s',
+                    self.server, exc)
+                self._close()
+
+    def _poll(self):
+        """
+        Reads from the server until lines are queued, then sends a batch.
+        """
+        sock = self._sock
+        if not self._lines:
+            readable, _, _ = select.select(
+                [sock, self._wakeup_r], [], [], self.idle_timeout)
+            if not readable:
+                raise socket.timeout(
+                    'Nothing received for {}s'.format(self.idle_timeout))
+            if sock in readable:
+                data = sock.recv(kiss.READ_BYTES)
+                if not data:
+                    raise ConnectionResetError('Closed by server')
+                self.stats.bytes_in += len(data)
+            if self._wakeup_r in readable:
+                try:
+                    self._wakeup_r.recv(kiss.READ_BYTES)
+                except BlockingIOError:
+                    pass
+            if not self._lines:
+                return
+            if self.batch_interval:
+                self._stopped.wait(self.batch_interval)
+        self._send_batch(sock)
+
+    def _send_batch(self, sock):
+        lines = self._lines
+        batch = [lines.popleft() for _ in range(len(lines))]
+        try:
+            sock.sendall(b''.join(line + b'\r\n' for line in batch))
+        except OSError:
+            # Keep the batch for the next connection.
+            lines.extendleft(reversed(batch))
+            raise
+        self.stats.frames_out += len(batch)
+        self.stats.bytes_out += sum(len(line) + 2 for line in batch)
@@ -0,0 +1,313 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Python KISS Module TCP Server.
+
+Shares one TNC among many KISS-over-TCP client applications.
+
+Usage::
+
+    tnc = kiss.SerialKISS('/dev/ttyUSB0', 9600)
+    tnc.start()
+    with kiss.KISSServer(tnc, port=8001):
+        ...
+
+"""
+
+import collections
+import itertools
+import logging
+import selectors
+import socket
+import threading
+
+import kiss
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+def _encode(frame):
+    """Encodes a frame that starts with its command byte."""
+    return b''.join((kiss.FEND, kiss.escape_special_codes(frame), kiss.FEND))
+
+
+class _Client(object):
+
+    """A downstream client connection."""
+
+    __slots__ = ('sock', 'address', 'deframer', 'queue', 'pending', 'events',
+                 'dropped')
+
+    def __init__(self, sock, address) -> None:
+        self.sock = sock
+        self.address = address
+        self.deframer = kiss.Deframer()
+        # Encoded frames to send, shared with the other clients.
+        self.queue = collections.deque()
+        # Frames received, waiting for their turn upstream.
+        self.pending = collections.deque()
+        self.events = selectors.EVENT_READ
+        self.dropped = 0
+
+    def fileno(self):
+        """Returns the client socket's file descriptor."""
+        return self.sock.fileno()
+
+
+class KISSServer(object):
+
+    """
+    KISS TCP Server.
+
+    Owns one started `upstream` KISS interface, e.g. a `SerialKISS` or
+    `TCPKISS`, and serves it to any number of KISS-over-TCP clients.
+
+    Each frame read from the upstream is encoded once, and the same buffer
+    is queued to every client. A client with `max_queued` frames still
+    queued has further frames dropped, rather than holding up the others;
+    drops are counted in `stats.queue_drops`. Frames written by clients are
+    passed upstream as-is, taking one frame from each client in turn.
+
+    Clients are serviced by a single thread, see `start()`, or by calling
+    `poll()` after `listen()`.
+
+    :param upstream: Started KISS interface to share.
+    :param host: Address to listen on.
+    :param port: Port to listen on, or 0 for any free port; `port` is updated
+        once listening.
+    :param max_queued: Most frames to queue for each client.
+    """
+
+    _logger = logging.getLogger(__name__)  # pylint: disable=R0801
+
+    def __init__(self, upstream, host: str='127.0.0.1', port: int=8001,
+                 max_queued: int=1000) -> None:
+        self.upstream = upstream
+        self.host = host
+        self.port = port
+        self.max_queued = max_queued
+        self.stats = kiss.Stats()
+        self._selector = None
+        self._server = None
+        self._thread = None
+        self._stopping = False
+        # Replaced, not modified, so the upstream reader can iterate it.
+        self._clients = ()
+        self._wakeup_r = None
+        self._wakeup_w = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def __len__(self):
+        return len(self._clients)
+
+    def listen(self):
+        """
+        Starts listening for clients, without starting any threads.
+        """
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind((self.host, self.port))
+        self._server.listen(5)
+        self._server.setblocking(False)
+        self.port = self._server.getsockname()[1]
+
+        # Lets `broadcast()` and `stop()` wake a blocked `select()`.
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._wakeup_w.setblocking(False)
+
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._server, selectors.EVENT_READ)
+        self._selector.register(self._wakeup_r, selectors.EVENT_READ)
+        self._logger.info('Serving KISS on %s:%s', self.host, self.port)
+
+    def start(self):
+        """
+        Starts listening, reading frames from the upstream on its reader
+        thread, and servicing clients on another thread.
+        """
+        self.listen()
+        self._stopping = False
+        # Clients need the command byte of each frame.
+        self.upstream.strip_df_start = False
+        self.upstream.start_reader(self.broadcast)
+        self._thread = threading.Thread(target=self.run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the upstream interface and disconnects all clients.
+        """
+        self.upstream.stop()
+        self.upstream.stop_reader()
+        self._stopping = True
+        self._wakeup()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for client in self._clients:
+            self._close_client(client)
+        if self._server is not None:
+            self._selector.unregister(self._wakeup_r)
+            self._selector.close()
+            self._server.close()
+            self._server = None
+            self._wakeup_r.close()
+            self._wakeup_w.close()
+            self._wakeup_r = self._wakeup_w = None
+
+    def run(self):
+        """
+        Services clients until `stop()` is called.
+        """
+        try:
+            while not self._stopping:
+                self.poll()
+        finally:
+            self._stopping = False
+
+    def _wakeup(self):
+        wakeup_w = self._wakeup_w
+        if wakeup_w is None:
+            return
+        try:
+            wakeup_w.send(b'\x00')
+        except OSError:
+            # Already more than enough wakeups pending, or stopped.
+            pass
+
+    def broadcast(self, frame):
+        """
+        Queues a frame, starting with its command byte, to every client.
+        Safe to call from another thread.
+        """
+        buffer = _encode(frame)
+        for client in self._clients:
+            if len(client.queue) >= self.max_queued:
+                client.dropped += 1
+                self.stats.queue_drops += 1
+            else:
+                client.queue.append(buffer)
+        self.stats.frames_out += 1
+        self._wakeup()
+
+    def poll(self, timeout=None):
+        """
+        Waits for client activity, sends queued frames, and writes frames
+        received from clients to the upstream.
+
+        :param timeout: Seconds to wait, or None to wait indefinitely.
+        """
+        for client in self._clients:
+            events = selectors.EVENT_READ
+            if client.queue:
+                events |= selectors.EVENT_WRITE
+            if events != client.events:
+                client.events = events
+                self._selector.modify(client, events, client)
+
+        for key, events in self._selector.select(timeout):
+            if key.fileobj is self._wakeup_r:
+                try:
+                    self._wakeup_r.recv(kiss.READ_BYTES)
+                except BlockingIOError:
+                    pass
+            elif key.fileobj is self._server:
+                self._accept()
+            else:
+                client = key.data
+                if events & selectors.EVENT_READ:
+                    self._read_client(client)
+                if events & selectors.EVENT_WRITE and client in self._clients:
+                    self._send_client(client)
+
+        self._write_upstream()
+
+    def _accept(self):
+        try:
+            sock, address = self._server.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        client = _Client(sock, address)
+        self._selector.register(client, client.events, client)
+        self._clients += (client,)
+        self._logger.info('Client connected from %s', address)
+
+    def _close_client(self, client):
+        self._clients = tuple(c for c in self._clients if c is not client)
+        try:
+            self._selector.unregister(client)
+        except (KeyError, ValueError):
+            pass
+        client.sock.close()
+        self._logger.info(
+            'Client %s disconnected, %s frames dropped.',
+            client.address, client.dropped)
+
+    def _read_client(self, client):
+        try:
+            read_data = client.sock.recv(kiss.READ_BYTES)
+        except BlockingIOError:
+            return
+        except OSError:
+            read_data = b''
+        if not read_data:
+            self._close_client(client)
+            return
+        self.stats.bytes_in += len(read_data)
+        client.pending.extend(client.deframer.feed(read_data))
+
+    def _send_client(self, client):
+        queue = client.queue
+        try:
+            sent = client.sock.sendmsg(
+                list(itertools.islice(queue, kiss.IOV_MAX)))
+        except BlockingIOError:
+            return
+        except OSError:
+            self._close_client(client)
+            return
+        self.stats.bytes_out += sent
+
+        # Drop whatever was sent, keeping the unsent part of the last.
+        while sent:
+            if sent >= len(queue[0]):
+                sent -= len(queue.popleft())
+            else:
+                queue[0] = memoryview(queue[0])[sent:]
+                sent = 0
+
+    def _write_upstream(self):
+        """
+        Writes frames received from clients upstream, one from each client
+        in turn.
+        """
+        pending = [client.pending for client in self._clients
+                   if client.pending]
+        buffers = []
+        while pending:
+            for frames in pending:
+                buffers.append(_encode(frames.popleft()))
+            pending = [frames for frames in pending if frames]
+        if not buffers:
+            return
+
+        self.stats.frames_in += len(buffers)
+        try:
+            self.upstream._queue_writes(buffers)  # NOQA pylint: disable=W0212
+            self.upstream.flush()
+        except (OSError, kiss.SocketClosetError) as exc:
+            self._logger.warning(
+                'Dropped %s frames for upstream: %s', len(buffers), exc)
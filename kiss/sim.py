@@ -0,0 +1,298 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Python KISS Module TNC Simulator.
+
+Simulated TNCs for driving `TCPKISS` and `SerialKISS` in load and soak tests
+without a radio. A simulated TNC sends frames to its client at a configurable
+rate, with optional timing jitter and fragmentation of the byte stream, and
+records everything the client writes.
+
+Usage::
+
+    with kiss.sim.TCPTNC(frames, rate=50) as tnc:
+        ks = kiss.TCPKISS('127.0.0.1', tnc.port)
+        ...
+
+    with kiss.sim.PTYTNC(frames) as tnc:
+        ks = kiss.SerialKISS(tnc.port, 9600)
+        ...
+
+"""
+
+import abc
+import logging
+import os
+import pty
+import random
+import select
+import socket
+import threading
+import tty
+
+import kiss
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+# Seconds between checks for `stop()` while waiting on I/O.
+POLL_INTERVAL = 0.1
+
+
+def read_kiss_stream(path):
+    """
+    Reads the frames from a file containing a raw KISS byte stream, as
+    captured from a TNC.
+
+    :param path: Path of the capture file.
+    :returns: List of frames, without their command byte.
+    :rtype: list
+    """
+    with open(path, 'rb') as capture:
+        return [frame[1:] for frame in kiss.Deframer().feed(capture.read())]
+
+
+def beacon_frames(source='N0CALL', destination='APRS', path=None,
+                  count=None):
+    """
+    Generates numbered APRS status beacons.
+
+    :param count: Number of frames, or None for an endless generator.
+    """
+    sequence = 0
+    while count is None or sequence < count:
+        sequence += 1
+        yield kiss.ax25.encode_ui(
+            destination, source, path or ['WIDE1-1'],
+            '>kiss.sim beacon {}'.format(sequence).encode('ascii'))
+
+
+class SimulatedTNC(object, metaclass=abc.ABCMeta):
+
+    """
+    Simulated KISS TNC. Subclasses implement `start()`, connecting to the
+    client and spawning the threads that send and receive.
+
+    :param frames: Iterable of AX.25 frames to send, e.g. from
+        `read_kiss_stream()` or `beacon_frames()`.
+    :param rate: Frames per second, or None to send as fast as possible.
+    :param jitter: Fraction by which each inter-frame delay varies.
+    :param fragment: If set, the maximum number of bytes sent at once, with
+        frames split into random-sized pieces up to that size.
+    :param kiss_port: KISS port the frames are sent on.
+    :param delay: Seconds to wait before sending the first frame, e.g. for
+        the client to open a `PTYTNC`, as pyserial flushes its input on open.
+    :param seed: Random seed, for reproducible jitter and fragmentation.
+    """
+
+    _logger = logging.getLogger(__name__)  # pylint: disable=R0801
+
+    def __init__(self, frames=(), rate: float=None, jitter: float=0.0,
+                 fragment: int=None, kiss_port: int=0, delay: float=0.0,
+                 seed=None) -> None:
+        self.frames = frames
+        self.rate = rate
+        self.jitter = jitter
+        self.fragment = fragment
+        self.delay = delay
+        self.sent = 0
+        self.received = []
+        self._framer = kiss.Framer(kiss_port)
+        self._random = random.Random(seed)
+        self._stopped = threading.Event()
+        self._threads = []
+        self._received_lock = threading.Lock()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @abc.abstractmethod
+    def start(self):
+        """Starts the simulated TNC."""
+
+    def stop(self):
+        """Stops sending and receiving."""
+        self._stopped.set()
+        for thread in self._threads:
+            thread.join()
+
+    def _spawn(self, target, *args):
+        thread = threading.Thread(target=target, args=args)
+        thread.daemon = True
+        thread.start()
+        self._threads.append(thread)
+
+    @property
+    def data_frames(self):
+        """AX.25 frames written by the client, without command bytes."""
+        with self._received_lock:
+            return [frame[1:] for frame in self.received
+                    if frame[0] & 0x0F == 0]
+
+    @property
+    def settings(self):
+        """
+        Settings written by the client, as (port, command, value) tuples,
+        e.g. (0, kiss.TX_DELAY, b'\\x28').
+        """
+        with self._received_lock:
+            return [
+                (frame[0] >> 4, bytes([frame[0] & 0x0F]), frame[1:])
+                for frame in self.received if frame[0] & 0x0F]
+
+    def _delay(self):
+        if not self.rate:
+            return 0
+        delay = 1.0 / self.rate
+        if self.jitter:
+            delay *= 1 + self._random.uniform(-self.jitter, self.jitter)
+        return max(delay, 0)
+
+    def _pieces(self, data):
+        if not self.fragment:
+            return [data]
+        pieces = []
+        position = 0
+        while position < len(data):
+            size = self._random.randint(1, self.fragment)
+            pieces.append(data[position:position + size])
+            position += size
+        return pieces
+
+    def _write_all(self, fileno, write, data):
+        """
+        Writes all of `data` with the non-blocking `write(data)`, giving up
+        if stopped. Returns False if stopped or the client went away.
+        """
+        view = memoryview(data)
+        while view:
+            try:
+                view = view[write(view):]
+            except BlockingIOError:
+                select.select([], [fileno], [], POLL_INTERVAL)
+                if self._stopped.is_set():
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def _send_loop(self, fileno, write):
+        """Sends all frames, pacing them by `rate`."""
+        if self._stopped.wait(self.delay):
+            return
+        for frame in self.frames:
+            if self._stopped.wait(self._delay()):
+                return
+            for piece in self._pieces(self._framer.encode(frame)):
+                if not self._write_all(fileno, write, piece):
+                    return
+            self.sent += 1
+
+    def _receive_loop(self, fileno, read):
+        """Records data from `read()` until stopped or end of file."""
+        deframer = kiss.Deframer()
+        while not self._stopped.is_set():
+            readable, _, _ = select.select([fileno], [], [], POLL_INTERVAL)
+            if not readable:
+                continue
+            try:
+                data = read(kiss.READ_BYTES)
+            except BlockingIOError:
+                continue
+            except OSError:
+                return
+            if not data:
+                return
+            frames = deframer.feed(data)
+            if frames:
+                with self._received_lock:
+                    self.received.extend(frames)
+
+
+class TCPTNC(SimulatedTNC):
+
+    """
+    Simulated KISS TNC on a local TCP port. Set `port` to 0 to listen on
+    any free port; `port` is updated once started.
+    """
+
+    def __init__(self, frames=(), host: str='127.0.0.1', port: int=0,
+                 **kwargs) -> None:
+        self.host = host
+        self.port = port
+        self._server = None
+        self._clients = []
+        super(TCPTNC, self).__init__(frames, **kwargs)
+
+    def start(self):
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind((self.host, self.port))
+        self._server.listen(1)
+        self._server.settimeout(POLL_INTERVAL)
+        self.port = self._server.getsockname()[1]
+        self._logger.info('Simulated TNC on %s:%s', self.host, self.port)
+        self._spawn(self._accept_loop)
+
+    def stop(self):
+        super(TCPTNC, self).stop()
+        for client in self._clients:
+            client.close()
+        if self._server:
+            self._server.close()
+
+    def _accept_loop(self):
+        while not self._stopped.is_set():
+            try:
+                client, address = self._server.accept()
+            except socket.timeout:
+                continue
+            self._logger.debug('Client connected from %s', address)
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            client.setblocking(False)
+            self._clients.append(client)
+            self._spawn(self._send_loop, client.fileno(), client.send)
+            self._spawn(self._receive_loop, client.fileno(), client.recv)
+
+
+class PTYTNC(SimulatedTNC):
+
+    """
+    Simulated KISS TNC on a pseudo-terminal. `port` is the device path to
+    open with `SerialKISS` once started.
+    """
+
+    def __init__(self, frames=(), **kwargs) -> None:
+        self.port = None
+        self._master = None
+        self._slave = None
+        super(PTYTNC, self).__init__(frames, **kwargs)
+
+    def start(self):
+        self._master, self._slave = pty.openpty()
+        tty.setraw(self._slave)
+        os.set_blocking(self._master, False)
+        self.port = os.ttyname(self._slave)
+        self._logger.info('Simulated TNC on %s', self.port)
+        self._spawn(self._send_loop, self._master, self._write)
+        self._spawn(self._receive_loop, self._master, self._read)
+
+    def stop(self):
+        super(PTYTNC, self).stop()
+        for fileno in (self._master, self._slave):
+            if fileno is not None:
+                os.close(fileno)
+        self._master = self._slave = None
+
+    def _write(self, data):
+        return os.write(self._master, data)
+
+    def _read(self, read_bytes):
+        return os.read(self._master, read_bytes)
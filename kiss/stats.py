@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Python KISS Module Statistics.
+
+Every KISS interface keeps a `Stats` object with plain integer counters and
+a fixed-bucket histogram of frame latency, the time from the chunk holding a
+frame's first byte to the one holding its closing FEND. Updating them costs
+an attribute increment, so they are always on.
+
+Usage::
+
+    kiss_conn.stats.snapshot()
+
+    with kiss.StatsServer({'tnc0': kiss_conn.stats}, port=9100):
+        ...  # curl http://127.0.0.1:9100/metrics
+
+"""
+
+import bisect
+import http.server
+import logging
+import threading
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+# Upper bounds, in seconds, of the frame latency histogram buckets.
+LATENCY_BUCKETS = (
+    0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# Counter names and descriptions, in export order.
+COUNTERS = (
+    ('bytes_in', 'Bytes read from the KISS interface.'),
+    ('bytes_out', 'Bytes written to the KISS interface.'),
+    ('frames_in', 'Frames read from the KISS interface.'),
+    ('frames_out', 'Frames written to the KISS interface.'),
+    ('frames_dropped', 'Frames discarded by filters.'),
+    ('frames_duplicate', 'Duplicate frames discarded.'),
+    ('frames_aborted', 'Malformed frames aborted by FESC FEND.'),
+    ('escape_errors', 'Invalid FESC escape sequences.'),
+    ('buffer_overflows', 'Frames reset for exceeding the reassembly buffer.'),
+    ('queue_drops', 'Frames dropped by a full reader queue.'),
+    ('nmea_passthrough', 'NMEA passthrough reads.'),
+    ('reconnects', 'Reconnects to the KISS interface.'),
+)
+
+
+class Histogram(object):
+
+    """
+    Fixed-bucket histogram. `counts[i]` counts observations no greater than
+    `buckets[i]`, with a final overflow bucket.
+    """
+
+    __slots__ = ('buckets', 'counts', 'sum')
+
+    def __init__(self, buckets=LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value, count=1):
+        """Records `count` observations of `value`."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += count
+        self.sum += value * count
+
+    @property
+    def count(self):
+        """Total number of observations."""
+        return sum(self.counts)
+
+    def snapshot(self):
+        """
+        Returns cumulative bucket counts keyed by upper bound, with
+        'inf' for the overflow bucket, and the sum and count.
+
+        :rtype: dict
+        """
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets + ('inf',), self.counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {'buckets': buckets, 'sum': self.sum, 'count': cumulative}
+
+
+class Stats(object):
+
+    """
+    KISS interface counters and frame latency histogram.
+
+    Counters are updated without locking; a snapshot taken while another
+    thread is reading or writing may be off by the frames in flight.
+    """
+
+    __slots__ = tuple(name for name, _ in COUNTERS) + ('latency',)
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self):
+        """Zeroes all counters and the histogram."""
+        for name, _ in COUNTERS:
+            setattr(self, name, 0)
+        self.latency = Histogram()
+
+    def snapshot(self):
+        """
+        Returns the current counters and latency histogram.
+
+        :rtype: dict
+        """
+        snapshot = {name: getattr(self, name) for name, _ in COUNTERS}
+        snapshot['latency'] = self.latency.snapshot()
+        return snapshot
+
+    def prometheus(self, labels=None, prefix='kiss'):
+        """
+        Formats the stats in the Prometheus text exposition format.
+
+        :param labels: Dict of labels for every sample, e.g. the interface.
+        :param prefix: Metric name prefix.
+        :rtype: str
+        """
+        return ''.join(_prometheus({'': self}, prefix, labels))
+
+
+def _label_string(labels):
+    if not labels:
+        return ''
+    return '{{{}}}'.format(','.join(
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace(
+            '"', '\\"').replace('\n', '\\n'))
+        for name, value in sorted(labels.items())))
+
+
+def _prometheus(stats, prefix, labels=None, label='interface'):
+    """
+    Yields Prometheus text lines for a dict of name to Stats, grouping the
+    samples of each metric under one HELP and TYPE.
+    """
+    def sample_labels(name, extra=None):
+        sample = dict(labels or {})
+        if name:
+            sample[label] = name
+        sample.update(extra or {})
+        return _label_string(sample)
+
+    for counter, description in COUNTERS:
+        metric = '{}_{}_total'.format(prefix, counter)
+        yield '# HELP {} {}\n'.format(metric, description)
+        yield '# TYPE {} counter\n'.format(metric)
+        for name, interface_stats in stats.items():
+            yield '{}{} {}\n'.format(
+                metric, sample_labels(name), getattr(interface_stats, counter))
+
+    metric = '{}_frame_latency_seconds'.format(prefix)
+    yield '# HELP {} Time from first byte to closing FEND.\n'.format(metric)
+    yield '# TYPE {} histogram\n'.format(metric)
+    for name, interface_stats in stats.items():
+        latency = interface_stats.latency.snapshot()
+        for bound, count in latency['buckets'].items():
+            bound = '+Inf' if bound == 'inf' else repr(bound)
+            yield '{}_bucket{} {}\n'.format(
+                metric, sample_labels(name, {'le': bound}), count)
+        yield '{}_sum{} {}\n'.format(
+            metric, sample_labels(name), repr(latency['sum']))
+        yield '{}_count{} {}\n'.format(
+            metric, sample_labels(name), latency['count'])
+
+
+class StatsServer(object):
+
+    """
+    Serves KISS interface stats in Prometheus text format over HTTP, from a
+    background thread.
+
+    :param stats: Dict of interface name to `Stats`, e.g.
+        {'tnc0': kiss_conn.stats}. May be added to while serving.
+    :param host: Address to listen on.
+    :param port: Port to listen on, or 0 for any free port; `port` is updated
+        once started.
+    """
+
+    _logger = logging.getLogger(__name__)  # pylint: disable=R0801
+
+    def __init__(self, stats, host: str='127.0.0.1', port: int=9100,
+                 prefix: str='kiss') -> None:
+        self.stats = stats
+        self.host = host
+        self.port = port
+        self.prefix = prefix
+        self._server = None
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def metrics(self):
+        """
+        Returns the stats of all interfaces in Prometheus text format.
+
+        :rtype: str
+        """
+        return ''.join(_prometheus(dict(self.stats), self.prefix))
+
+    def start(self):
+        """Starts serving `/metrics`."""
+        stats_server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+
+            """Serves `/metrics`."""
+
+            def do_GET(self):  # NOQA pylint: disable=C0103
+                """Handles GET requests."""
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = stats_server.metrics().encode('utf-8')
+                self.send_response(200)
+                self.send_header(
+                    'Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):  # pylint: disable=W0221
+                stats_server._logger.debug(*args)  # NOQA pylint: disable=W0212
+
+        self._server = http.server.HTTPServer((self.host, self.port), Handler)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        self._logger.info('Serving stats on %s:%s', self.host, self.port)
+
+    def stop(self):
+        """Stops serving."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
@@ -3,6 +3,9 @@
 
 """Python KISS Module Utility Functions Definitions."""
 
+import array
+import itertools
+
 import kiss
 
 __author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
@@ -10,6 +13,20 @@ __copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint:
 __license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
 
 
+# The optional compiled extension, see `kiss.SPEEDUPS`.
+_speedups = None
+if kiss.SPEEDUPS:
+    try:
+        from kiss import _speedups  # NOQA pylint: disable=E0611
+    except ImportError:
+        pass
+
+
+# (old, new) replacements made, in order, by the pure-Python codecs below.
+ESCAPES = ((kiss.FESC, kiss.FESC_TFESC), (kiss.FEND, kiss.FESC_TFEND))
+RECOVERIES = ((kiss.FESC_TFEND, kiss.FEND), (kiss.FESC_TFESC, kiss.FESC))
+
+
 def escape_special_codes(raw_codes):
     """
     Escape special codes, per KISS spec.
@@ -37,15 +54,115 @@ def recover_special_codes(escaped_codes):
     replaced by FESC code and FESC_TFEND is replaced by FEND code."
     - http://en.wikipedia.org/wiki/KISS_(TNC)#Description
     """
+    # FESC_TFEND must be recovered first, otherwise an escaped FESC followed
+    # by a literal TFEND would be recovered twice.
     return escaped_codes.replace(
-        kiss.FESC_TFESC,
-        kiss.FESC
-    ).replace(
         kiss.FESC_TFEND,
         kiss.FEND
+    ).replace(
+        kiss.FESC_TFESC,
+        kiss.FESC
     )
 
 
+# The pure-Python codecs, replaced by their `kiss._speedups` versions when
+# available. Both return bytes for bytes.
+py_escape_special_codes = escape_special_codes
+py_recover_special_codes = recover_special_codes
+if _speedups is not None:
+    escape_special_codes = _speedups.escape_special_codes  # NOQA pylint: disable=C0103
+    recover_special_codes = _speedups.recover_special_codes  # NOQA pylint: disable=C0103
+
+
+def _offsets(lengths):
+    """
+    Returns the `len(lengths) + 1` boundaries of frames of `lengths` laid end
+    to end.
+    """
+    return array.array(
+        'L', itertools.accumulate(itertools.chain((0,), lengths)))
+
+
+def _replace_each(frames, replacements):
+    """
+    Applies `bytes.replace` for each (old, new) pair to every frame, calling
+    it through `map` so no Python function is called per frame.
+    """
+    try:
+        for old, new in replacements:
+            frames = map(bytes.replace, frames, itertools.repeat(old),
+                         itertools.repeat(new))
+        return list(frames)
+    except TypeError:
+        # Frames other than bytes, e.g. bytearray or memoryview.
+        return None
+
+
+def escape_many(frames):
+    """
+    Escape special codes in a batch of frames, per KISS spec.
+
+    The escaped frames are returned in one contiguous buffer, frame `i` being
+    `buffer[offsets[i]:offsets[i + 1]]`. Batches without any FEND or FESC
+    are returned without escaping or copying each frame.
+
+    :param frames: List of frames to escape.
+    :type frames: list
+    :returns: Tuple of the escaped buffer and `len(frames) + 1` offsets.
+    :rtype: tuple
+    """
+    buffer = b''.join(frames)
+    if kiss.FEND in buffer or kiss.FESC in buffer:
+        frames = _replace_each(frames, ESCAPES) or list(
+            map(py_escape_special_codes, frames))
+        buffer = b''.join(frames)
+    return buffer, _offsets(map(len, frames))
+
+
+def recover_many(frames):
+    """
+    Recover special codes in a batch of frames, per KISS spec, each frame on
+    its own.
+
+    The recovered frames are returned in one contiguous buffer, frame `i`
+    being `buffer[offsets[i]:offsets[i + 1]]`. Batches without any FESC are
+    returned without recovering or copying each frame.
+
+    :param frames: List of escaped frames to recover.
+    :type frames: list
+    :returns: Tuple of the recovered buffer and `len(frames) + 1` offsets.
+    :rtype: tuple
+    """
+    buffer = b''.join(frames)
+    if kiss.FESC in buffer:
+        frames = _replace_each(frames, RECOVERIES) or list(
+            map(py_recover_special_codes, frames))
+        buffer = b''.join(frames)
+    return buffer, _offsets(map(len, frames))
+
+
+# The pure-Python batch codecs, replaced by their `kiss._speedups` versions
+# when available.
+py_escape_many = escape_many
+py_recover_many = recover_many
+if _speedups is not None:
+    def escape_many(frames):  # NOQA pylint: disable=E0102
+        """
+        Escape special codes in a batch of frames, per KISS spec, in one
+        pass. See `py_escape_many`.
+        """
+        offsets = array.array('L', (0,)) * (len(frames) + 1)
+        return _speedups.escape_many(frames, offsets), offsets
+
+    def recover_many(frames):  # NOQA pylint: disable=E0102
+        """
+        Recover special codes in a batch of frames, per KISS spec, in one
+        pass. See `py_recover_many`.
+        """
+        offsets = array.array('L', (0,)) * (len(frames) + 1)
+        return _speedups.recover_many(frames, offsets), offsets
+
+
 def extract_ui(frame):
     """
     Extracts the UI component of an individual frame.
@@ -58,19 +175,26 @@ def extract_ui(frame):
     start_ui = frame.split(
         b''.join([kiss.FEND, kiss.DATA_FRAME]))
     end_ui = start_ui[0].split(b''.join([kiss.SLOT_TIME, kiss.UI_PROTOCOL_ID]))
-    return ''.join([chr(x >> 1) for x in end_ui[0]])
+    return end_ui[0].translate(kiss.ax25.CALLSIGN_TABLE).decode('ascii')
 
 
-def strip_df_start(frame):
+def strip_df_start(frame, port=0):
     """
-    Strips KISS DATA_FRAME start (0x00) and newline from frame.
+    Strips KISS DATA_FRAME start (0x00, or 0xN0 on port N) and newline from
+    frame.
 
     :param frame: APRS/AX.25 frame.
+    :param port: KISS port the frame was received on.
     :type frame: str
+    :type port: int
     :returns: APRS/AX.25 frame sans DATA_FRAME start (0x00).
     :rtype: str
     """
-    return frame.lstrip(kiss.DATA_FRAME).strip()
+    # Only the one command byte: 0xN0 is also a valid shifted callsign
+    # character on some ports, e.g. 'P' (0xA0) on port 10.
+    if frame[:1] == bytes([port << 4]):
+        frame = frame[1:]
+    return frame.strip()
 
 
 def strip_nmea(frame):
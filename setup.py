@@ -8,11 +8,16 @@ Source:: https://github.com/ampledata/kiss
 """
 
 import os
+import re
 import setuptools
 import sys
 
 __title__ = 'kiss'
-__version__ = '7.0.0'
+# Single-sourced from kiss.__version__, without importing the package.
+with open(os.path.join(
+        os.path.dirname(__file__), 'kiss', '__init__.py')) as init:
+    __version__ = re.search(
+        r"^__version__ = '([^']+)'", init.read(), re.M).group(1)
 __author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
 __copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
 __license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
@@ -38,6 +43,11 @@ setuptools.setup(
     packages=['kiss'],
     package_data={'': ['LICENSE']},
     package_dir={'kiss': 'kiss'},
+    # Optional: without a compiler, the pure-Python implementations are used.
+    ext_modules=[
+        setuptools.Extension(
+            'kiss._speedups', ['kiss/_speedups.c'], optional=True)
+    ],
     license=open('LICENSE').read(),
     long_description=open('README.rst').read(),
     url='https://github.com/ampledata/kiss',
@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for AsyncTCPKISS Class."""
+
+import asyncio
+import threading
+import unittest
+
+from .context import kiss
+from .context import kiss_test_classes  # pylint: disable=R0801
+
+from . import constants  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class AsyncTCPKISSTestCase(kiss_test_classes.KISSTestClass):  # NOQA pylint: disable=R0904
+
+    """Test class for AsyncTCPKISS."""
+
+    def setUp(self):
+        """Setup."""
+        self.test_frames = open(constants.TEST_FRAMES, 'rb')
+        self.test_frame = self.test_frames.readlines()[0].strip()
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        """Teardown."""
+        self.test_frames.close()
+        self.loop.close()
+        asyncio.set_event_loop(None)
+
+    def test_write_and_frames(self):
+        """Tests writing-to and iterating frames from a local TCP server."""
+        kiss_frame = b''.join([
+            kiss.FEND,
+            kiss.DATA_FRAME,
+            kiss.escape_special_codes(self.test_frame),
+            kiss.FEND
+        ])
+        received = []
+
+        async def handle_client(reader, writer):
+            received.append(await reader.readexactly(len(kiss_frame)))
+            # Send the frame back twice, split mid-frame, then hang up.
+            writer.write(kiss_frame[:7])
+            await writer.drain()
+            writer.write(kiss_frame[7:] + kiss_frame)
+            writer.close()
+
+        async def run():
+            server = await asyncio.start_server(
+                handle_client, '127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+
+            ks = kiss.AsyncTCPKISS('127.0.0.1', port, strip_df_start=True)
+            await ks.start()
+            await ks.write(self.test_frame)
+            frames = [frame async for frame in ks.frames()]
+
+            server.close()
+            await server.wait_closed()
+            return frames
+
+        frames = self.loop.run_until_complete(run())
+        self.assertEqual([kiss_frame], received)
+        self.assertEqual([self.test_frame, self.test_frame], frames)
+
+    def test_write_many_and_settings(self):
+        """Tests queued writes are sent through the transport."""
+        expected = b''.join([
+            kiss.Framer().encode_many([b'one', b'two']),
+            kiss.Framer(0, kiss.TX_DELAY).encode(b'\x28'),
+        ])
+        received = []
+
+        async def handle_client(reader, writer):
+            received.append(await reader.readexactly(len(expected)))
+            writer.close()
+
+        async def run():
+            server = await asyncio.start_server(
+                handle_client, '127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+
+            ks = kiss.AsyncTCPKISS('127.0.0.1', port)
+            await ks.start()
+            ks.write_many([b'one', b'two'])
+            ks.write_setting('TX_DELAY', 0x28)
+            frames = [frame async for frame in ks.frames()]
+
+            server.close()
+            await server.wait_closed()
+            return ks, frames
+
+        ks, frames = self.loop.run_until_complete(asyncio.wait_for(run(), 5))
+        self.assertEqual([expected], received)
+        self.assertEqual([], frames)
+        self.assertEqual(len(expected), ks.stats.bytes_out)
+
+        with self.assertRaises(kiss.SocketClosetError):
+            ks.write_many([b'three'])
+
+    def test_write_flush_interval(self):
+        """Tests `flush_interval` flushes from the event loop's thread."""
+        expected = kiss.Framer().encode_many([b'one', b'two'])
+        received = []
+        flushed_in = []
+
+        async def handle_client(reader, writer):
+            received.append(await reader.readexactly(len(expected)))
+            writer.close()
+
+        async def run():
+            server = await asyncio.start_server(
+                handle_client, '127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+
+            ks = kiss.AsyncTCPKISS('127.0.0.1', port)
+            ks.flush_size = 1000
+            ks.flush_interval = 0.01
+            await ks.start()
+
+            flush_handler = ks._flush_handler  # NOQA pylint: disable=W0212
+
+            def _flush_handler(buffers):
+                flushed_in.append(threading.current_thread())
+                flush_handler(buffers)
+
+            ks._flush_handler = _flush_handler  # NOQA pylint: disable=W0212
+            ks.write_many([b'one', b'two'])
+            frames = [frame async for frame in ks.frames()]
+
+            server.close()
+            await server.wait_closed()
+            return frames
+
+        frames = self.loop.run_until_complete(asyncio.wait_for(run(), 5))
+        self.assertEqual([expected], received)
+        self.assertEqual([], frames)
+        self.assertEqual([threading.current_thread()], flushed_in)
+
+    def test_pause_reading(self):
+        """Tests reading is paused while frames are queued, and resumed."""
+        kiss_frame = kiss.Framer().encode(self.test_frame)
+
+        async def handle_client(reader, writer):
+            for _ in range(3):
+                writer.write(kiss_frame)
+                await writer.drain()
+                await asyncio.sleep(0.02)
+            writer.close()
+            await reader.read()
+
+        async def run():
+            server = await asyncio.start_server(
+                handle_client, '127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+
+            ks = kiss.AsyncTCPKISS(
+                '127.0.0.1', port, strip_df_start=True, max_queued=1)
+            await ks.start()
+            await asyncio.sleep(0.05)
+            paused = ks._reading_paused  # pylint: disable=W0212
+            frames = [frame async for frame in ks.frames()]
+
+            server.close()
+            await server.wait_closed()
+            return paused, frames
+
+        paused, frames = self.loop.run_until_complete(
+            asyncio.wait_for(run(), 5))
+        self.assertTrue(paused)
+        self.assertEqual([self.test_frame] * 3, frames)
+
+    def test_pause_writing(self):
+        """Tests `write()` waits while the transport pauses writing."""
+        kiss_frame = kiss.Framer().encode(self.test_frame)
+        received = []
+
+        async def handle_client(reader, writer):
+            received.append(await reader.readexactly(len(kiss_frame)))
+            await reader.read()
+            writer.close()
+
+        async def run():
+            server = await asyncio.start_server(
+                handle_client, '127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+
+            ks = kiss.AsyncTCPKISS('127.0.0.1', port)
+            await ks.start()
+            ks.pause_writing()
+            write = asyncio.ensure_future(ks.write(self.test_frame))
+            await asyncio.sleep(0.05)
+            waited = not write.done()
+            ks.resume_writing()
+            await write
+            ks.stop()
+            frames = [frame async for frame in ks.frames()]
+
+            server.close()
+            await server.wait_closed()
+            return waited, frames
+
+        waited, frames = self.loop.run_until_complete(
+            asyncio.wait_for(run(), 5))
+        self.assertTrue(waited)
+        self.assertEqual([kiss_frame], received)
+        self.assertEqual([], frames)
+
+    def test_stop_after_loop_closed(self):
+        """Tests `stop()` does nothing once the event loop is closed."""
+        class ClosedLoopTransport(object):
+            """Transport whose event loop has closed."""
+            def is_closing(self):  # pylint: disable=R0201
+                return False
+
+            def close(self):  # pylint: disable=R0201
+                raise RuntimeError('Event loop is closed')
+
+        ks = kiss.AsyncTCPKISS('127.0.0.1', 8001)
+        ks._loop = self.loop  # pylint: disable=W0212
+        ks.transport = ClosedLoopTransport()
+        self.loop.close()
+        ks.stop()
+
+    def test_write_not_connected(self):
+        """Tests writing before connecting raises an error."""
+        ks = kiss.AsyncTCPKISS('127.0.0.1', 8001)
+        with self.assertRaises(kiss.SocketClosetError):
+            self.loop.run_until_complete(ks.write(self.test_frame))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for KISS AX.25 Module."""
+
+import unittest
+
+from .context import kiss
+from .context import kiss_test_classes  # pylint: disable=R0801
+
+from . import constants  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class AX25FrameTestCase(kiss_test_classes.KISSTestClass):  # NOQA pylint: disable=R0904
+
+    """Test class for AX25Frame."""
+
+    def setUp(self):
+        """Setup."""
+        self.test_frames = open(constants.TEST_FRAMES, 'rb')
+        self.test_frame = self.test_frames.readlines()[0].strip()
+
+    def tearDown(self):
+        """Teardown."""
+        self.test_frames.close()
+
+    def test_decode(self):
+        """Tests decoding the AX.25 header."""
+        frame = kiss.AX25Frame(self.test_frame)
+        self.assertEqual('APRX24', frame.destination)
+        self.assertEqual('W2GMD-6', frame.source)
+        self.assertEqual(['WIDE1-1'], frame.path)
+        self.assertEqual(0x03, frame.control)
+        self.assertEqual(0xF0, frame.pid)
+        self.assertEqual(23, frame.header_length)
+        self.assertEqual(b'!3745.75N', bytes(frame.info[:9]))
+
+    def test_from_kiss(self):
+        """Tests wrapping a frame that starts with its command byte."""
+        frame = kiss.AX25Frame.from_kiss(
+            b''.join([kiss.DATA_FRAME, self.test_frame]))
+        self.assertEqual('W2GMD-6', frame.source)
+        self.assertEqual(
+            'W2GMD-6>APRX24,WIDE1-1:!3745.75N', str(frame)[:32])
+
+    def test_repeated_path(self):
+        """Tests digipeaters that have repeated the frame are marked."""
+        frame = bytearray(self.test_frame)
+        frame[20] |= kiss.ax25.H_BIT
+        self.assertEqual(['WIDE1-1*'], kiss.AX25Frame(frame).path)
+
+    def test_invalid_address(self):
+        """Tests frames without an address field terminator."""
+        frame = kiss.AX25Frame(b'\x82' * 20)
+        with self.assertRaises(kiss.FrameError):
+            frame.control
+
+    def test_truncated(self):
+        """Tests truncated frames raise FrameError, not IndexError."""
+        for accessor in (lambda frame: frame.source, str):
+            with self.assertRaises(kiss.FrameError):
+                accessor(kiss.AX25Frame(b'abc'))
+
+        # Cut off right after the address field.
+        frame = kiss.AX25Frame(self.test_frame[:21])
+        self.assertEqual(['WIDE1-1'], frame.path)
+        for name in ('control', 'pid', 'header_length', 'info'):
+            with self.assertRaises(kiss.FrameError):
+                getattr(frame, name)
+
+    def test_slots(self):
+        """Tests frames do not carry a per-instance `__dict__`."""
+        with self.assertRaises(AttributeError):
+            kiss.AX25Frame(self.test_frame).extra = True
+
+
+if __name__ == '__main__':
+    unittest.main()
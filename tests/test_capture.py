@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for KISS Capture Files."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from .context import kiss
+from .context import kiss_test_classes  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class CaptureTestCase(kiss_test_classes.KISSTestClass):  # NOQA pylint: disable=R0904
+
+    """Test class for KISS Capture Files."""
+
+    def setUp(self):
+        """Setup."""
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'test.kisscap')
+        self.frames = [
+            kiss.ax25.encode_ui(
+                'APRS', 'W2GMD-6', info=b'\xc0\xdb' + str(i).encode())
+            for i in range(100)]
+
+    def tearDown(self):
+        """Teardown."""
+        shutil.rmtree(self.tmp)
+
+    def _write(self, path=None):
+        with kiss.KISSFileWriter(path or self.path, index_interval=10) as cap:
+            for i, frame in enumerate(self.frames):
+                cap.write(frame, i % 3, kiss.capture.RX + i % 2, 1000 + i)
+
+    def _read(self, path=None, **kwargs):
+        with kiss.KISSFileReader(path or self.path) as reader:
+            return [(timestamp, port, direction, bytes(frame))
+                    for timestamp, port, direction, frame
+                    in reader.frames(**kwargs)]
+
+    def test_round_trip(self):
+        """Tests reading back written frames as memoryviews."""
+        self._write()
+        with kiss.KISSFileReader(self.path) as reader:
+            records = list(reader)
+            self.assertEqual(100, len(records))
+            self.assertIsInstance(records[0][3], memoryview)
+            self.assertEqual((1001.0, 1, 1), records[1][:3])
+            self.assertEqual(self.frames, [bytes(r[3]) for r in records])
+            self.assertEqual(10, len(reader.index_offsets))
+            del records
+
+    def test_seek(self):
+        """Tests reading a time range, seeking with the index."""
+        self._write()
+        records = self._read(start=1042.0, end=1050.0)
+        self.assertEqual(self.frames[42:50], [r[3] for r in records])
+        with kiss.KISSFileReader(self.path) as reader:
+            self.assertEqual(reader.index_offsets[4], reader.seek(1042.0))
+
+    def test_missing_index(self):
+        """Tests seeking without the index file."""
+        self._write()
+        os.remove(self.path + '.idx')
+        self.assertEqual(
+            self.frames[42:], [r[3] for r in self._read(start=1042.0)])
+        kiss.capture.rebuild_index(self.path, index_interval=10)
+        with kiss.KISSFileReader(self.path) as reader:
+            self.assertEqual(10, len(reader.index_offsets))
+
+    def test_truncated(self):
+        """Tests a record cut short by an interrupted write is ignored."""
+        self._write()
+        with open(self.path, 'r+b') as capture:
+            capture.truncate(os.path.getsize(self.path) - 3)
+        self.assertEqual(self.frames[:99], [r[3] for r in self._read()])
+
+    def test_append(self):
+        """Tests appending to an existing capture."""
+        self._write()
+        with kiss.KISSFileWriter(self.path) as capture:
+            capture.write(b'more', timestamp=2000)
+        records = self._read()
+        self.assertEqual(101, len(records))
+        self.assertEqual((2000.0, 0, 0, b'more'), records[-1])
+
+    def test_not_a_capture(self):
+        """Tests opening a file that isn't a capture."""
+        with open(self.path, 'wb') as capture:
+            capture.write(b'\xc0\x00not a capture\xc0')
+        with self.assertRaises(kiss.FrameError):
+            kiss.KISSFileReader(self.path)
+
+    def test_empty(self):
+        """Tests opening a capture before its header is written."""
+        open(self.path, 'wb').close()
+        with self.assertRaises(kiss.FrameError):
+            kiss.KISSFileReader(self.path)
+
+    def test_kiss_stream(self):
+        """Tests importing and exporting raw KISS byte streams."""
+        self._write()
+        raw = os.path.join(self.tmp, 'test.kiss')
+        with kiss.KISSFileReader(self.path) as reader:
+            self.assertEqual(
+                50, kiss.capture.export_kiss(reader, raw, kiss.capture.RX))
+
+        imported = os.path.join(self.tmp, 'imported.kisscap')
+        with kiss.KISSFileWriter(imported) as writer:
+            self.assertEqual(
+                50, kiss.capture.import_kiss(raw, writer, timestamp=5))
+        records = self._read(imported)
+        self.assertEqual(self.frames[::2], [r[3] for r in records])
+        self.assertEqual([i % 3 for i in range(0, 100, 2)],
+                         [r[1] for r in records])
+
+    def test_pcap(self):
+        """Tests importing and exporting DLT_AX25_KISS pcap files."""
+        self._write()
+        pcap = os.path.join(self.tmp, 'test.pcap')
+        with kiss.KISSFileReader(self.path) as reader:
+            self.assertEqual(100, kiss.capture.export_pcap(reader, pcap))
+
+        with open(pcap, 'rb') as exported:
+            data = exported.read()
+        self.assertEqual(b'\xd4\xc3\xb2\xa1\x02\x00\x04\x00', data[:8])
+        self.assertEqual(kiss.capture.DLT_AX25_KISS, data[20])
+
+        imported = os.path.join(self.tmp, 'imported.kisscap')
+        with kiss.KISSFileWriter(imported) as writer:
+            self.assertEqual(100, kiss.capture.import_pcap(pcap, writer))
+        self.assertEqual(
+            [(t, p, 0, f) for t, p, _, f in self._read()],
+            self._read(imported))
+
+
+    def test_pcap_empty_record(self):
+        """Tests zero-length pcap records are skipped, not treated as EOF."""
+        pcap = os.path.join(self.tmp, 'test.pcap')
+        with open(pcap, 'wb') as out:
+            out.write(kiss.capture._PCAP_HEADER.pack(  # NOQA pylint: disable=W0212
+                kiss.capture._PCAP_MAGIC, 2, 4, 0, 0, 65535,  # NOQA pylint: disable=W0212
+                kiss.capture.DLT_AX25_KISS))
+            for seconds, frame in ((1, b'\x00one'), (2, b''), (3, b'\x10two')):
+                out.write(kiss.capture._PCAP_RECORD.pack(  # NOQA pylint: disable=W0212
+                    seconds, 0, len(frame), len(frame)))
+                out.write(frame)
+            out.write(kiss.capture._PCAP_RECORD.pack(4, 0, 10, 10))  # NOQA pylint: disable=W0212
+            out.write(b'\x00cut')
+
+        with kiss.KISSFileWriter(self.path) as writer:
+            self.assertEqual(2, kiss.capture.import_pcap(pcap, writer))
+        self.assertEqual([(1.0, 0, 0, b'one'), (3.0, 1, 0, b'two')],
+                         self._read())
+
+if __name__ == '__main__':
+    unittest.main()
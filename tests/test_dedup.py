@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for KISS Duplicate Suppression."""
+
+import unittest
+
+from .context import kiss
+from .context import kiss_test_classes  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+def _frame(path, info=b'>hi', port=0):
+    return bytes([port << 4]) + kiss.ax25.encode_ui(
+        'APRS', 'W2GMD-6', path, info)
+
+
+class DedupTestCase(kiss_test_classes.KISSTestClass):  # NOQA pylint: disable=R0904
+
+    """Test class for KISS Duplicate Suppression."""
+
+    def test_frame_key(self):
+        """Tests frame keys ignore the path and port."""
+        key = kiss.dedup.frame_key(_frame([]))
+        self.assertEqual(key, kiss.dedup.frame_key(_frame(['WIDE1-1'])))
+        self.assertEqual(
+            key, kiss.dedup.frame_key(_frame(['N2XYZ*', 'WIDE2-1'], port=1)))
+        self.assertNotEqual(key, kiss.dedup.frame_key(_frame([], b'>ho')))
+        self.assertNotEqual(key, kiss.dedup.frame_key(
+            b'\x00' + kiss.ax25.encode_ui('APRS', 'W2GMD-7', info=b'>hi')))
+        self.assertIsNone(kiss.dedup.frame_key(_frame([])[:10]))
+        self.assertIsNone(kiss.dedup.frame_key(b'\x00' + b'\x82' * 100))
+
+    def test_ttl(self):
+        """Tests keys expire after `ttl` seconds."""
+        cache = kiss.DedupCache(ttl=30, size=8)
+        self.assertFalse(cache.seen(1, 100.0))
+        self.assertTrue(cache.seen(1, 110.0))
+        self.assertFalse(cache.seen(2, 120.0))
+        # Not refreshed by the repeat at 110.
+        self.assertFalse(cache.seen(1, 130.0))
+        self.assertTrue(cache.seen(2, 130.0))
+        self.assertEqual(2, len(cache))
+        self.assertEqual(2, cache.hits)
+        self.assertEqual(3, cache.misses)
+
+    def test_size(self):
+        """Tests the oldest keys are evicted once full."""
+        cache = kiss.DedupCache(ttl=30, size=4)
+        for key in range(6):
+            cache.seen(key, 100.0)
+        self.assertEqual(4, len(cache))
+        self.assertNotIn(1, cache)
+        self.assertIn(2, cache)
+        self.assertIn(5, cache)
+        cache.clear()
+        self.assertFalse(cache.seen(5, 100.0))
+
+    def test_read(self):
+        """Tests duplicates are dropped before dispatch."""
+        data = b''.join(kiss.Framer(port).encode(frame[1:]) for port, frame in (
+            (0, _frame(['WIDE1-1'])),
+            (1, _frame(['N2XYZ*', 'WIDE2-1'], port=1)),
+            (0, _frame([], b'>ho')),
+            (1, _frame([])[:1] + b'\x28')))
+        ks = kiss.KISS()
+        ks.dedup = kiss.DedupCache()
+        port_frames = []
+        ks.port_callbacks[1] = port_frames.append
+        ks._read_handler = lambda read_bytes=None: data
+        frames = ks.read(readmode=False)
+
+        self.assertEqual([_frame(['WIDE1-1']), _frame([], b'>ho')], frames)
+        self.assertEqual([b'\x10\x28'], port_frames)
+        self.assertEqual(1, ks.stats.frames_duplicate)
+        self.assertEqual(1, ks.dedup.hits)
+        self.assertEqual(2, ks.dedup.misses)
+
+
+if __name__ == '__main__':
+    unittest.main()
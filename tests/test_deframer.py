@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for KISS Deframer Class."""
+
+import unittest
+
+from .context import kiss
+from .context import kiss_test_classes  # pylint: disable=R0801
+
+from . import constants  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class DeframerTestCase(kiss_test_classes.KISSTestClass):  # NOQA pylint: disable=R0904
+
+    """Test class for KISS Deframer."""
+
+    def setUp(self):
+        """Setup."""
+        self.test_frames = open(constants.TEST_FRAMES, 'rb')
+        self.test_frame = self.test_frames.readlines()[0].strip()
+
+    def tearDown(self):
+        """Teardown."""
+        self.test_frames.close()
+
+    def _encode(self, frame):
+        return b''.join([
+            kiss.FEND,
+            kiss.DATA_FRAME,
+            kiss.escape_special_codes(frame),
+            kiss.FEND
+        ])
+
+    def test_feed_single_frame(self):
+        """Tests deframing one complete frame."""
+        deframer = kiss.Deframer()
+        frames = deframer.feed(self._encode(self.test_frame))
+        self.assertEqual(
+            [b''.join([kiss.DATA_FRAME, self.test_frame])], frames)
+
+    def test_feed_special_codes(self):
+        """Tests recovering FEND and FESC bytes within a frame."""
+        frame = b''.join([b'A', kiss.FEND, b'B', kiss.FESC, kiss.FESC_TFEND])
+        deframer = kiss.Deframer()
+        frames = deframer.feed(self._encode(frame))
+        self.assertEqual([b''.join([kiss.DATA_FRAME, frame])], frames)
+
+    def test_feed_byte_at_a_time(self):
+        """Tests frames and escapes split across every chunk boundary."""
+        frame = b''.join([
+            self.test_frame, kiss.FEND, kiss.FESC, kiss.FESC_TFESC])
+        data = self._encode(frame) * 3
+        deframer = kiss.Deframer(buffer_size=4)
+        frames = []
+        for i in range(len(data)):
+            frames.extend(deframer.feed(data[i:i + 1]))
+        self.assertEqual([b''.join([kiss.DATA_FRAME, frame])] * 3, frames)
+
+    def test_feed_partial_frame(self):
+        """Tests a partial frame is held until its closing FEND arrives."""
+        data = self._encode(self.test_frame)
+        deframer = kiss.Deframer()
+        self.assertEqual([], deframer.feed(data[:10]))
+        self.assertEqual(9, len(deframer))
+        self.assertEqual(1, len(deframer.feed(memoryview(data)[10:])))
+        self.assertEqual(0, len(deframer))
+
+    def test_feed_empty_frames(self):
+        """Tests back-to-back FENDs do not produce empty frames."""
+        deframer = kiss.Deframer()
+        self.assertEqual([], deframer.feed(kiss.FEND * 5))
+
+    def test_feed_aborted_frame(self):
+        """Tests a FEND following a FESC aborts the frame."""
+        data = b''.join([
+            kiss.FEND, b'\x00abc', kiss.FESC, kiss.FEND, b'\x00ok', kiss.FEND])
+        deframer = kiss.Deframer()
+        self.assertEqual([b'\x00ok'], deframer.feed(data))
+
+    def test_max_frame_size(self):
+        """Tests oversize frames are discarded up to the next FEND."""
+        deframer = kiss.Deframer(
+            buffer_size=4, max_frame_size=256, stats=kiss.Stats())
+        noise = kiss.FESC_TFEND * 300
+        frames = []
+        for i in range(0, len(noise), 7):
+            frames.extend(deframer.feed(noise[i:i + 7]))
+        self.assertEqual([], frames)
+        self.assertEqual(0, len(deframer))
+
+        frames = deframer.feed(self._encode(self.test_frame))
+        self.assertEqual([b''.join([kiss.DATA_FRAME, self.test_frame])], frames)
+        self.assertEqual(1, deframer.stats.buffer_overflows)
+        self.assertEqual(256, len(deframer._buffer))
+
+    def test_max_frame_size_lowered(self):
+        """Tests lowering `max_frame_size` discards a longer partial frame."""
+        ks = kiss.KISS()
+        ks._read_handler = lambda read_bytes=None: b'\xc0\x00' + b'A' * 500
+        self.assertEqual([], ks.read(readmode=False))
+        ks.max_frame_size = 100
+        ks._read_handler = lambda read_bytes=None: b'B' * 10 + kiss.FEND
+        self.assertEqual([], ks.read(readmode=False))
+        self.assertEqual(1, ks.stats.buffer_overflows)
+
+    def test_read(self):
+        """Tests `KISS.read` returns deframed frames."""
+        data = self._encode(self.test_frame) * 2
+        chunks = [data[:15], data[15:]]
+        ks = kiss.KISS(strip_df_start=True)
+        ks._read_handler = lambda read_bytes=None: chunks.pop(0)
+        self.assertEqual([], ks.read(readmode=False))
+        self.assertEqual(
+            [self.test_frame, self.test_frame], ks.read(readmode=False))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for KISS Digipeater."""
+
+import asyncio
+import time
+import unittest
+
+from .context import kiss
+from .context import kiss_test_classes  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+def _frame(path, info=b'>hi', port=0):
+    return bytes([port << 4]) + kiss.ax25.encode_ui(
+        'APRS', 'W2GMD-6', path, info)
+
+
+class DigipeaterTestCase(kiss_test_classes.KISSTestClass):  # NOQA pylint: disable=R0904
+
+    """Test class for KISS Digipeater."""
+
+    def setUp(self):
+        """Setup."""
+        self.written = []
+        self.ks = kiss.KISS()
+        self.ks._write_handler = self.written.append
+        self.digi = kiss.Digipeater(
+            self.ks, 'N0CALL-1', aliases=['RELAY'], wide_aliases=['WIDE', 'NJ'])
+
+    def _sent(self):
+        """Returns the frames written, with their command byte."""
+        return kiss.Deframer().feed(b''.join(self.written))
+
+    def _assert_digipeated(self, path, expected, port=0):
+        self.written.clear()
+        self.digi.dedup.clear()
+        self.assertTrue(self.digi.digipeat(_frame(path, port=port)))
+        self.assertEqual([_frame(expected, port=port)], self._sent())
+
+    def test_digipeat(self):
+        """Tests rewriting the next hop of the path."""
+        self._assert_digipeated(['WIDE1-1'], ['N0CALL-1*'])
+        self._assert_digipeated(['WIDE1-1', 'WIDE2-1'], ['N0CALL-1*', 'WIDE2-1'])
+        self._assert_digipeated(['WIDE2-2'], ['WIDE2-1'])
+        self._assert_digipeated(['N2XYZ*', 'WIDE2-1'], ['N2XYZ*', 'N0CALL-1*'])
+        self._assert_digipeated(['NJ2-2'], ['NJ2-1'])
+        self._assert_digipeated(['RELAY', 'WIDE2-2'], ['N0CALL-1*', 'WIDE2-2'])
+        self._assert_digipeated(['N0CALL-1', 'N2XYZ'], ['N0CALL-1*', 'N2XYZ'])
+        self._assert_digipeated(['WIDE1-1'], ['N0CALL-1*'], port=2)
+
+    def test_async(self):
+        """Tests digipeating on an AsyncTCPKISS interface."""
+        expected = kiss.Framer().encode(
+            kiss.ax25.encode_ui('APRS', 'W2GMD-6', ['N0CALL-1*'], b'>hi'))
+        received = []
+
+        async def handle_client(reader, writer):
+            received.append(await reader.readexactly(len(expected)))
+            writer.close()
+
+        async def run():
+            server = await asyncio.start_server(
+                handle_client, '127.0.0.1', 0)
+            ks = kiss.AsyncTCPKISS(
+                '127.0.0.1', server.sockets[0].getsockname()[1])
+            await ks.start()
+            digi = kiss.Digipeater(ks, 'N0CALL-1')
+            self.assertTrue(digi.digipeat(_frame(['WIDE1-1'])))
+            frames = [frame async for frame in ks.frames()]
+            server.close()
+            await server.wait_closed()
+            return digi, frames
+
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        digi, frames = loop.run_until_complete(asyncio.wait_for(run(), 5))
+        self.assertEqual([expected], received)
+        self.assertEqual([], frames)
+        self.assertEqual(1, digi.stats.frames_out)
+
+    def test_not_digipeated(self):
+        """Tests frames not addressed to us are ignored."""
+        for path in ([], ['N2XYZ*'], ['N2XYZ', 'WIDE1-1'], ['WIDE3-3'],
+                     ['WIDE2*'], ['N0CALL-2'], ['TRACE2-2']):
+            self.assertFalse(self.digi.digipeat(_frame(path)), path)
+        self.assertFalse(self.digi.digipeat(b'\x01\x28'))
+        self.assertFalse(self.digi.digipeat(_frame(['WIDE1-1'])[:20]))
+        self.assertEqual([], self.written)
+
+    def test_dupe(self):
+        """Tests a frame is only digipeated once."""
+        self.assertTrue(self.digi.digipeat(_frame(['WIDE2-2'])))
+        self.assertFalse(self.digi.digipeat(_frame(['N2XYZ*', 'WIDE2-1'])))
+        self.assertEqual(1, len(self.written))
+        self.assertEqual(1, self.digi.stats.frames_duplicate)
+
+    def test_viscous(self):
+        """Tests viscous delay drops frames repeated by others meanwhile."""
+        self.digi.viscous_delay = 0.05
+        self.assertTrue(self.digi.digipeat(_frame(['WIDE1-1'])))
+        self.assertFalse(self.digi.digipeat(_frame(['N2XYZ*'])))
+        self.assertTrue(self.digi.digipeat(_frame(['WIDE1-1'], b'>ho')))
+        self.assertEqual([], self.written)
+
+        deadline = time.time() + 5
+        while not self.written and time.time() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.1)
+        self.assertEqual([_frame(['N0CALL-1*'], b'>ho')], self._sent())
+        self.assertEqual(1, self.digi.stats.frames_out)
+        self.assertEqual(1, self.digi.stats.frames_duplicate)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for KISS Filters Module."""
+
+import unittest
+
+from .context import kiss
+from .context import kiss_test_classes  # pylint: disable=R0801
+
+from . import constants  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class FiltersTestCase(kiss_test_classes.KISSTestClass):  # NOQA pylint: disable=R0904
+
+    """Test class for KISS Filters."""
+
+    def setUp(self):
+        """Setup."""
+        self.test_frames = open(constants.TEST_FRAMES, 'rb')
+        self.test_frame = self.test_frames.readlines()[0].strip()
+        # W2GMD-6>APRX24,WIDE1-1 on KISS port 0.
+        self.kiss_frame = b''.join([kiss.DATA_FRAME, self.test_frame])
+
+    def tearDown(self):
+        """Teardown."""
+        self.test_frames.close()
+
+    def _matches(self, *filters):
+        check = kiss.compile_filters(filters)
+        return check(self.kiss_frame, len(self.kiss_frame))
+
+    def test_by_source(self):
+        """Tests matching the source callsign."""
+        self.assertTrue(self._matches(kiss.by_source('W2GMD-6')))
+        self.assertTrue(self._matches(kiss.by_source('w2gmd-*')))
+        self.assertTrue(self._matches(kiss.by_source('W2G*')))
+        self.assertFalse(self._matches(kiss.by_source('W2GMD')))
+        self.assertFalse(self._matches(kiss.by_source('W2GMDX*')))
+        self.assertFalse(self._matches(kiss.by_source('APRX24')))
+
+    def test_by_destination(self):
+        """Tests matching the destination callsign."""
+        self.assertTrue(self._matches(kiss.by_destination('APRX24')))
+        self.assertFalse(self._matches(kiss.by_destination('APRS')))
+
+    def test_by_pid_and_port(self):
+        """Tests matching the PID after the path, and the KISS port."""
+        self.assertTrue(self._matches(kiss.by_pid(0xF0), kiss.by_port(0)))
+        self.assertFalse(self._matches(kiss.by_pid(0xCF)))
+        self.assertFalse(self._matches(kiss.by_pid(0xF0), kiss.by_port(1)))
+
+    def test_undecided(self):
+        """Tests filters wait for enough of the frame to decide."""
+        check = kiss.compile_filters([kiss.by_pid(0xF0)])
+        self.assertIsNone(check(self.kiss_frame, 15))
+        self.assertTrue(check(self.kiss_frame, 24))
+
+    def test_deframer_discards(self):
+        """Tests the Deframer only emits frames matching its filter."""
+        framer = kiss.Framer()
+        data = framer.encode_many([
+            self.test_frame,
+            b''.join([self.test_frame[:7], b'\x9c\x60\x86\x82\x98\x98\x60',
+                      self.test_frame[14:], kiss.FEND])
+        ])
+        deframer = kiss.Deframer(frame_filter=kiss.compile_filters(
+            [kiss.by_source('W2GMD-*')]))
+        frames = []
+        for i in range(0, len(data), 3):
+            frames.extend(deframer.feed(data[i:i + 3]))
+        self.assertEqual([self.kiss_frame], frames)
+
+    def test_read_filters(self):
+        """Tests `KISS.read` applies filters."""
+        data = b''.join([
+            kiss.Framer(port=0).encode(self.test_frame),
+            kiss.Framer(port=1).encode(self.test_frame),
+        ])
+        ks = kiss.KISS()
+        ks._read_handler = lambda read_bytes=None: data
+        frames = ks.read(readmode=False, filters=[kiss.by_port(1)])
+        self.assertEqual([b''.join([b'\x10', self.test_frame])], frames)
+
+
+if __name__ == '__main__':
+    unittest.main()
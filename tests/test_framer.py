@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for KISS Framer Class."""
+
+import unittest
+
+from .context import kiss
+from .context import kiss_test_classes  # pylint: disable=R0801
+
+from . import constants  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class FramerTestCase(kiss_test_classes.KISSTestClass):  # NOQA pylint: disable=R0904
+
+    """Test class for KISS Framer."""
+
+    def setUp(self):
+        """Setup."""
+        self.test_frames = open(constants.TEST_FRAMES, 'rb')
+        self.test_frame = self.test_frames.readlines()[0].strip()
+
+    def tearDown(self):
+        """Teardown."""
+        self.test_frames.close()
+
+    def test_encode(self):
+        """Tests encoding a frame without special codes."""
+        framer = kiss.Framer()
+        self.assertEqual(
+            b''.join([kiss.FEND, kiss.DATA_FRAME, self.test_frame, kiss.FEND]),
+            framer.encode(self.test_frame))
+
+    def test_encode_special_codes(self):
+        """Tests encoding a frame containing FEND and FESC bytes."""
+        frame = b''.join([kiss.FEND, b'A', kiss.FESC, kiss.TFEND, kiss.FEND])
+        framer = kiss.Framer()
+        self.assertEqual(
+            b''.join([
+                kiss.FEND, kiss.DATA_FRAME, kiss.FESC_TFEND, b'A',
+                kiss.FESC_TFESC, kiss.TFEND, kiss.FESC_TFEND, kiss.FEND]),
+            framer.encode(frame))
+
+    def test_encode_port_and_command(self):
+        """Tests the port number is encoded in the command byte."""
+        self.assertEqual(
+            b'\xC0\x31\x0A\xC0',
+            kiss.Framer(port=3, command=kiss.TX_DELAY).encode(b'\x0A'))
+        self.assertEqual(
+            kiss.KISS_OFF[:3],
+            kiss.Framer(port=3, command=kiss.RETURN).encode(b''))
+        with self.assertRaises(ValueError):
+            kiss.Framer(port=16)
+
+    def test_encode_many(self):
+        """Tests encoding frames back-to-back into one buffer."""
+        frames = [self.test_frame, kiss.FEND, kiss.FESC * 2]
+        framer = kiss.Framer(port=1)
+        self.assertEqual(
+            b''.join([framer.encode(frame) for frame in frames]),
+            framer.encode_many(frames))
+        self.assertEqual(b'', framer.encode_many([]))
+
+    def test_round_trip(self):
+        """Tests encoded frames are recovered by the Deframer."""
+        frames = [
+            self.test_frame,
+            b''.join([kiss.FESC, kiss.FEND, kiss.FESC_TFEND, kiss.FESC]),
+        ]
+        deframer = kiss.Deframer()
+        self.assertEqual(
+            [b''.join([kiss.DATA_FRAME, frame]) for frame in frames],
+            deframer.feed(kiss.Framer().encode_many(frames)))
+
+
+if __name__ == '__main__':
+    unittest.main()
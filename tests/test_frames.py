@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for KISS frames() Iterator and Generator Stages."""
+
+import socket
+import unittest
+
+from .context import kiss
+from .context import kiss_test_classes  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+def _frame(path, info=b'>hi', source='W2GMD-6'):
+    return kiss.ax25.encode_ui('APRS', source, path, info)
+
+
+class FramesTestCase(kiss_test_classes.KISSTestClass):  # NOQA pylint: disable=R0904
+
+    """Test class for KISS frames() Iterator and Generator Stages."""
+
+    def setUp(self):
+        """Setup."""
+        self.ks = kiss.TCPKISS('localhost', 8001)
+        self.ks.interface, self.peer = socket.socketpair()
+        self.peer.settimeout(5)
+
+    def tearDown(self):
+        """Teardown."""
+        self.ks.interface.close()
+        self.ks.interface = None
+        self.peer.close()
+
+    def test_frames(self):
+        """Tests frames are yielded across chunks and restarts."""
+        kiss_frames = [kiss.Framer().encode(_frame([], str(i).encode()))
+                       for i in range(3)]
+        # The second frame is split between two reads.
+        self.peer.sendall(kiss_frames[0] + kiss_frames[1][:10])
+
+        frames = self.ks.frames()
+        self.assertEqual(b'\x00' + _frame([], b'0'), next(frames))
+        frames.close()
+
+        self.peer.sendall(kiss_frames[1][10:] + kiss_frames[2])
+        self.peer.shutdown(socket.SHUT_WR)
+        self.assertEqual(
+            [b'\x00' + _frame([], str(i).encode()) for i in (1, 2)],
+            list(self.ks.frames()))
+
+    def test_frames_unread(self):
+        """Tests frames not consumed from one chunk are yielded next."""
+        self.peer.sendall(kiss.Framer().encode_many(
+            [_frame([], str(i).encode()) for i in range(3)]))
+        for frame in self.ks.frames():
+            self.assertEqual(b'\x00' + _frame([], b'0'), frame)
+            break
+        self.assertEqual(
+            b'\x00' + _frame([], b'1'), next(self.ks.frames()))
+        self.assertEqual(
+            [b'\x00' + _frame([], b'2')], self.ks.read(readmode=False))
+
+    def test_read_keeps_partial_frames(self):
+        """Tests read(readmode=False) keeps partial frames between calls."""
+        kiss_frame = kiss.Framer().encode(_frame([]))
+        self.peer.sendall(kiss_frame[:10])
+        self.assertEqual([], self.ks.read(readmode=False))
+        self.peer.sendall(kiss_frame[10:])
+        self.assertEqual(
+            [b'\x00' + _frame([])], self.ks.read(readmode=False))
+
+    def test_pipeline(self):
+        """Tests composing generator stages over frames()."""
+        for path, source in ((['WIDE1-1'], 'W2GMD-6'),
+                             (['N2XYZ*', 'WIDE2-1'], 'W2GMD-6'),
+                             ([], 'N0CALL')):
+            self.peer.sendall(kiss.Framer().encode(_frame(path, source=source)))
+        self.peer.sendall(kiss.Framer(0, kiss.TX_DELAY).encode(b'\x28'))
+        self.peer.shutdown(socket.SHUT_WR)
+
+        cache = kiss.DedupCache()
+        frames = kiss.ax25.decode_frames(kiss.dedup.drop_duplicates(
+            kiss.filter_frames(
+                self.ks.frames(), [kiss.by_source('W2GMD-*')]), cache))
+        self.assertEqual(
+            ['W2GMD-6>APRS,WIDE1-1:>hi'], [str(frame) for frame in frames])
+        self.assertEqual(1, cache.hits)
+
+        self.assertEqual(
+            [b'\x01'], list(kiss.filter_frames([b'\x01'], None)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for KISS APRS-IS IGate."""
+
+import socket
+import threading
+import time
+import unittest
+
+from .context import kiss
+from .context import kiss_test_classes  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+def _kiss_frame(path, info, source='W2GMD-6'):
+    return b'\x00' + kiss.ax25.encode_ui('APRS', source, path, info)
+
+
+class StandInServer(object):
+
+    """Local stand-in for an APRS-IS server, recording received lines."""
+
+    def __init__(self):
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(('127.0.0.1', 0))
+        self.server.listen(5)
+        self.server.settimeout(5)
+        self.address = self.server.getsockname()
+        self.lines = []
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    def serve(self, close_after=None):
+        """Accepts one client, recording lines until `close_after` lines."""
+        client, _ = self.server.accept()
+        client.settimeout(5)
+        self.connections += 1
+        data = b''
+        count = 0
+        with client:
+            while close_after is None or count < close_after:
+                try:
+                    read_data = client.recv(1000)
+                except OSError:
+                    return
+                if not read_data:
+                    return
+                data += read_data
+                while b'\r\n' in data:
+                    line, data = data.split(b'\r\n', 1)
+                    with self.lock:
+                        self.lines.append(line)
+                    count += 1
+
+    def spawn(self, close_after=None):
+        """Serves one client on a thread."""
+        thread = threading.Thread(target=self.serve, args=(close_after,))
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def wait_for(self, count):
+        """Waits for `count` lines."""
+        deadline = time.time() + 5
+        while len(self.lines) < count and time.time() < deadline:
+            time.sleep(0.01)
+        return self.lines
+
+    def close(self):
+        """Stops listening."""
+        self.server.close()
+
+
+class IGateTestCase(kiss_test_classes.KISSTestClass):  # NOQA pylint: disable=R0904
+
+    """Test class for KISS APRS-IS IGate."""
+
+    def setUp(self):
+        """Setup."""
+        self.aprsis = StandInServer()
+        self.uplink = kiss.igate.APRSISUplink(
+            'N0CALL-10', kiss.igate.passcode('N0CALL'),
+            servers=[self.aprsis.address], aprs_filter='r/40/-74/50')
+        self.uplink.reconnect_delay = 0.01
+
+    def tearDown(self):
+        """Teardown."""
+        self.uplink.stop()
+        self.aprsis.close()
+
+    def test_passcode(self):
+        """Tests the APRS-IS passcode ignores the SSID."""
+        self.assertEqual(13023, kiss.igate.passcode('N0CALL'))
+        self.assertEqual(13023, kiss.igate.passcode('n0call-10'))
+
+    def test_to_tnc2(self):
+        """Tests formatting frames as TNC2 lines."""
+        frame = kiss.ax25.encode_ui(
+            'APRS', 'W2GMD-6', ['WIDE1-1*', 'WIDE2-2*', 'WIDE3-1'],
+            b'>kiss\r\ntrailer')
+        self.assertEqual(
+            b'W2GMD-6>APRS,WIDE1-1,WIDE2-2*,WIDE3-1:>kiss',
+            kiss.igate.to_tnc2(frame))
+        self.assertEqual(
+            b'W2GMD-6>APRS,WIDE1-1,WIDE2-2*,WIDE3-1,qAR,N0CALL-10:>kiss',
+            kiss.igate.to_tnc2(frame, 'N0CALL-10'))
+
+        # Not UI, and not PID 0xF0.
+        self.assertIsNone(kiss.igate.to_tnc2(
+            frame[:35] + b'\x10' + frame[36:]))
+        self.assertIsNone(kiss.igate.to_tnc2(frame[:36] + b'\xCC'))
+
+    def test_gate(self):
+        """Tests the IGate drops duplicates and packets not to be gated."""
+        igate = kiss.igate.IGate(self.uplink)
+        self.assertTrue(igate.gate(_kiss_frame(['WIDE1-1'], b'>one')))
+        # The same packet through another digipeater.
+        self.assertFalse(igate.gate(_kiss_frame(['N2XYZ*'], b'>one')))
+        self.assertFalse(igate.gate(_kiss_frame(['NOGATE'], b'>two')))
+        self.assertFalse(igate.gate(_kiss_frame(['RFONLY*'], b'>two')))
+        self.assertFalse(igate.gate(b'\x01\x28'))
+        self.assertTrue(igate.gate(_kiss_frame([], b'>two')))
+        self.assertEqual(6, igate.stats.frames_in)
+        self.assertEqual(3, igate.stats.frames_dropped)
+        self.assertEqual(1, igate.stats.frames_duplicate)
+        self.assertEqual(1, igate.dedup.hits)
+
+        igate = kiss.igate.IGate(self.uplink, dupe_window=0)
+        self.assertTrue(igate.gate(_kiss_frame([], b'>one')))
+        self.assertTrue(igate.gate(_kiss_frame([], b'>one')))
+
+    def test_uplink(self):
+        """Tests logging in and sending queued lines."""
+        self.aprsis.spawn()
+        igate = kiss.igate.IGate(self.uplink)
+        for i in range(5):
+            igate(_kiss_frame(['WIDE1-1'], '>{}'.format(i).encode()))
+        with self.uplink:
+            lines = self.aprsis.wait_for(6)
+        self.assertEqual(
+            'user N0CALL-10 pass 13023 vers kiss {} filter r/40/-74/50'.format(
+                kiss.__version__).encode(),
+            lines[0])
+        self.assertEqual(
+            [b'W2GMD-6>APRS,WIDE1-1,qAR,N0CALL-10:>' + str(i).encode()
+             for i in range(5)],
+            lines[1:])
+        self.assertEqual(5, self.uplink.stats.frames_out)
+
+    def test_stop_closes_wakeup(self):
+        """Tests each start and stop cycle closes its wakeup sockets."""
+        for _ in range(2):
+            self.uplink.start()
+            wakeup = (self.uplink._wakeup_r, self.uplink._wakeup_w)  # NOQA pylint: disable=W0212
+            self.uplink.stop()
+            self.assertEqual([-1, -1], [sock.fileno() for sock in wakeup])
+        self.uplink.send(b'N0CALL>APRS:>one')
+
+    def test_reconnect(self):
+        """Tests lines are sent after the server closes the connection."""
+        self.aprsis.spawn(close_after=2)
+        self.uplink.start()
+        self.assertTrue(self.uplink.wait_connected(5))
+        self.uplink.send(b'N0CALL>APRS:>one')
+        self.aprsis.wait_for(2)
+
+        self.aprsis.spawn()
+        deadline = time.time() + 5
+        while self.uplink.stats.reconnects < 1 and time.time() < deadline:
+            time.sleep(0.01)
+        self.uplink.send(b'N0CALL>APRS:>two')
+        lines = self.aprsis.wait_for(4)
+        self.assertEqual(2, self.aprsis.connections)
+        self.assertEqual(b'N0CALL>APRS:>two', lines[-1])
+        self.assertEqual(1, self.uplink.stats.reconnects)
+
+    def test_failover(self):
+        """Tests the next server of the pool is tried."""
+        unused = socket.socket()
+        unused.bind(('127.0.0.1', 0))
+        self.uplink.servers.insert(0, unused.getsockname())
+        unused.close()
+        self.aprsis.spawn()
+        self.uplink.send(b'N0CALL>APRS:>one')
+        self.uplink.start()
+        lines = self.aprsis.wait_for(2)
+        self.assertEqual(b'N0CALL>APRS:>one', lines[1])
+        self.assertEqual(self.aprsis.address, self.uplink.server)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -44,6 +44,58 @@ class KISSUtilTestCase(kiss_test_classes.KISSTestClass):  # NOQA pylint: disable
         self._logger.debug('fesc=%s', fesc)
         self.assertEqual(fesc, kiss.FESC_TFESC)
 
+    def test_recover_special_codes(self):
+        """
+        Tests `kiss.recover_special_codes` util function.
+        """
+        raw_codes = b''.join([kiss.FESC, kiss.TFEND, kiss.FEND, kiss.FESC])
+        escaped_codes = kiss.escape_special_codes(raw_codes)
+        self.assertEqual(raw_codes, kiss.recover_special_codes(escaped_codes))
+
+    def test_escape_many(self):
+        """
+        Tests `kiss.escape_many` util function.
+        """
+        frames = [
+            self.test_frame, kiss.FEND, b'', kiss.FESC * 3, self.test_frame]
+        buffer, offsets = kiss.escape_many(frames)
+        self.assertEqual(len(frames) + 1, len(offsets))
+        for i, frame in enumerate(frames):
+            self.assertEqual(
+                kiss.escape_special_codes(frame),
+                buffer[offsets[i]:offsets[i + 1]])
+
+    def test_recover_many(self):
+        """
+        Tests `kiss.recover_many` util function.
+        """
+        frames = [
+            kiss.FESC_TFEND, self.test_frame, kiss.FESC_TFESC * 2, b'',
+            b''.join([kiss.FESC_TFESC, kiss.TFEND])]
+        buffer, offsets = kiss.recover_many(frames)
+        for i, frame in enumerate(frames):
+            self.assertEqual(
+                kiss.recover_special_codes(frame),
+                buffer[offsets[i]:offsets[i + 1]])
+
+    def test_recover_many_dangling_fesc(self):
+        """
+        Tests `kiss.recover_many` with an escape split across frames.
+        """
+        frames = [b''.join([b'A', kiss.FESC]), b''.join([kiss.TFEND, b'B'])]
+        buffer, offsets = kiss.recover_many(frames)
+        self.assertEqual(frames[0], buffer[offsets[0]:offsets[1]])
+        self.assertEqual(frames[1], buffer[offsets[1]:offsets[2]])
+
+    def test_many_types(self):
+        """
+        Tests the pure-Python batch codecs with frames other than bytes.
+        """
+        frames = [self.test_frame, kiss.FEND + kiss.FESC, b'']
+        for many in (kiss.util.py_escape_many, kiss.util.py_recover_many):
+            self.assertEqual(
+                many(frames), many(list(map(bytearray, frames))))
+
     def test_extract_ui(self):
         """
         Tests `kiss.extract_ui` util function.
@@ -52,6 +104,16 @@ class KISSUtilTestCase(kiss_test_classes.KISSTestClass):  # NOQA pylint: disable
         self._logger.debug('frame_ui=%s', frame_ui)
         self.assertEqual('APRX240W2GMD 6WIDE1 1', frame_ui)
 
+    def test_strip_df_start_port(self):
+        """
+        Tests `kiss.strip_df_start` strips only the command byte when the
+        destination starts with the same byte, e.g. 'P' on port 10.
+        """
+        frame = kiss.ax25.encode_ui('PP1ABC', 'W2GMD-6', info=b'>hi')
+        self.assertEqual(0xA0, frame[0])
+        self.assertEqual(
+            frame, kiss.strip_df_start(bytes([0xA0]) + frame, port=10))
+
 
 if __name__ == '__main__':
     unittest.main()
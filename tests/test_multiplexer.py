@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for KISS Multiplexer Class."""
+
+import socket
+import threading
+import unittest
+
+from .context import kiss
+from .context import kiss_test_classes  # pylint: disable=R0801
+
+from . import constants  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class MultiplexerTestCase(kiss_test_classes.KISSTestClass):  # NOQA pylint: disable=R0904
+
+    """Test class for KISS Multiplexer."""
+
+    def setUp(self):
+        """Setup."""
+        self.test_frames = open(constants.TEST_FRAMES, 'rb')
+        self.test_frame = self.test_frames.readlines()[0].strip()
+        self.kiss_frame = b''.join([
+            kiss.FEND,
+            kiss.DATA_FRAME,
+            kiss.escape_special_codes(self.test_frame),
+            kiss.FEND
+        ])
+        self.peers = []
+        self.interfaces = []
+        for _ in range(3):
+            local, peer = socket.socketpair()
+            ks = kiss.TCPKISS('localhost', 8001, strip_df_start=True)
+            ks.interface = local
+            self.peers.append(peer)
+            self.interfaces.append(ks)
+
+    def tearDown(self):
+        """Teardown."""
+        self.test_frames.close()
+        for peer in self.peers:
+            peer.close()
+        for ks in self.interfaces:
+            ks.interface.close()
+            ks.interface = None
+
+    def test_poll(self):
+        """Tests frames are dispatched to each interface's callback."""
+        received = {0: [], 1: [], 2: []}
+        with kiss.Multiplexer() as mux:
+            for i, ks in enumerate(self.interfaces):
+                mux.register(ks, received[i].append)
+
+            self.peers[0].sendall(self.kiss_frame)
+            self.peers[2].sendall(self.kiss_frame * 2)
+
+            dispatched = 0
+            while dispatched < 3:
+                dispatched += mux.poll(timeout=1)
+
+        self.assertEqual([self.test_frame], received[0])
+        self.assertEqual([], received[1])
+        self.assertEqual([self.test_frame] * 2, received[2])
+
+    def test_peer_closed(self):
+        """Tests interfaces are unregistered when the peer hangs up."""
+        with kiss.Multiplexer() as mux:
+            mux.register(self.interfaces[0], lambda frame: None)
+            self.peers[0].close()
+            mux.poll(timeout=1)
+            self.assertEqual(0, len(mux))
+
+    def test_peer_closed_reconnect(self):
+        """Tests reconnecting interfaces are unregistered, not reconnected."""
+        self.interfaces[0].reconnect = True
+        with kiss.Multiplexer() as mux:
+            mux.register(self.interfaces[0], lambda frame: None)
+            mux.register(self.interfaces[1], lambda frame: None)
+            self.peers[0].close()
+            mux.poll(timeout=1)
+            self.assertEqual(1, len(mux))
+            self.assertEqual(0, self.interfaces[0].stats.reconnects)
+
+        # Once unregistered, reads reconnect as usual.
+        self.assertFalse(self.interfaces[0]._multiplexed)  # NOQA pylint: disable=W0212
+
+    def test_stop(self):
+        """Tests `stop()` wakes `run()` from another thread."""
+        with kiss.Multiplexer() as mux:
+            mux.register(self.interfaces[0], lambda frame: None)
+            runner = threading.Thread(target=mux.run)
+            runner.start()
+            mux.stop()
+            runner.join(timeout=5)
+            self.assertFalse(runner.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
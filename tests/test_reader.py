@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for KISS Threaded Reader."""
+
+import socket
+import threading
+import time
+import unittest
+
+from .context import kiss
+from .context import kiss_test_classes  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class ReaderTestCase(kiss_test_classes.KISSTestClass):  # NOQA pylint: disable=R0904
+
+    """Test class for KISS Threaded Reader."""
+
+    def setUp(self):
+        """Setup."""
+        self.frames = [
+            kiss.ax25.encode_ui('APRS', 'W2GMD-6', info=str(i).encode())
+            for i in range(5)]
+        self.ks = kiss.TCPKISS('localhost', 8001, strip_df_start=True)
+        self.ks.interface, self.peer = socket.socketpair()
+
+    def tearDown(self):
+        """Teardown."""
+        self.ks.stop()
+        self.ks.stop_reader(timeout=5)
+        self.ks.interface.close()
+        self.ks.interface = None
+        self.peer.close()
+
+    def _wait_for(self, condition):
+        deadline = time.time() + 5
+        while not condition() and time.time() < deadline:
+            time.sleep(0.01)
+
+    def _slow_consumer(self, policy, expected):
+        """
+        Blocks the only worker on the first frame, then sends four more
+        frames to a queue with room for two.
+        """
+        received = []
+        entered = threading.Event()
+        release = threading.Event()
+
+        def callback(frame):
+            entered.set()
+            release.wait(5)
+            received.append(frame)
+
+        framer = kiss.Framer()
+        self.ks.start_reader(callback, queue_size=2, policy=policy)
+        self.peer.sendall(framer.encode(self.frames[0]))
+        entered.wait(5)
+        self.peer.sendall(framer.encode_many(self.frames[1:]))
+        self._wait_for(lambda: self.ks.stats.frames_in == 5)
+        release.set()
+        self._wait_for(lambda: len(received) == expected)
+        self.ks.stop()
+        self.ks.stop_reader(timeout=5)
+        return received
+
+    def test_stop_stuck_worker(self):
+        """Tests `stop_reader(timeout)` returns despite a stuck worker."""
+        release = threading.Event()
+        self.addCleanup(release.set)
+        self.ks.start_reader(
+            lambda frame: release.wait(10), queue_size=1, policy='block')
+        self.peer.sendall(kiss.Framer().encode_many(self.frames[:2]))
+        self._wait_for(lambda: self.ks._reader_queue.full())  # NOQA pylint: disable=W0212
+
+        self.ks.stop()
+        start = time.time()
+        self.ks.stop_reader(timeout=0.5)
+        self.assertLess(time.time() - start, 2)
+        self.assertIsNone(self.ks._reader)  # pylint: disable=W0212
+
+    def test_callbacks(self):
+        """Tests frames and port callbacks are run on the workers."""
+        received = []
+        port_received = []
+        self.ks.port_callbacks[1] = port_received.append
+        self.ks.start_reader(received.append, workers=3)
+        self.peer.sendall(kiss.Framer().encode_many(self.frames))
+        self.peer.sendall(kiss.Framer(1).encode(self.frames[0]))
+        self._wait_for(lambda: len(received) == 5 and port_received)
+
+        self.assertEqual(sorted(self.frames), sorted(received))
+        self.assertEqual(self.frames[:1], port_received)
+        self.assertNotIn(
+            threading.current_thread().name,
+            [thread.name for thread in self.ks._workers])
+
+    def test_drop_newest(self):
+        """Tests frames read while the queue is full are dropped."""
+        self.assertEqual(self.frames[:3], self._slow_consumer('drop_newest', 3))
+        self.assertEqual(2, self.ks.stats.queue_drops)
+
+    def test_drop_oldest(self):
+        """Tests the oldest queued frames make room for new ones."""
+        self.assertEqual(
+            [self.frames[0]] + self.frames[3:],
+            self._slow_consumer('drop_oldest', 3))
+        self.assertEqual(2, self.ks.stats.queue_drops)
+
+    def test_block(self):
+        """Tests no frames are dropped when blocking."""
+        self.assertEqual(self.frames, self._slow_consumer('block', 5))
+        self.assertEqual(0, self.ks.stats.queue_drops)
+
+    def test_policy(self):
+        """Tests an unknown policy is rejected."""
+        with self.assertRaises(ValueError):
+            self.ks.start_reader(print, policy='drop_all')
+
+
+if __name__ == '__main__':
+    unittest.main()
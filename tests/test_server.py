@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for KISS TCP Server Class."""
+
+import socket
+import time
+import unittest
+
+from .context import kiss
+from .context import kiss_test_classes  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class KISSServerTestCase(kiss_test_classes.KISSTestClass):  # NOQA pylint: disable=R0904
+
+    """Test class for KISS TCP Server."""
+
+    def setUp(self):
+        """Setup."""
+        self.frames = [
+            kiss.ax25.encode_ui('APRS', 'W2GMD-6', info=str(i).encode())
+            for i in range(5)]
+        self.upstream = kiss.TCPKISS('localhost', 8001)
+        self.upstream.interface, self.tnc = socket.socketpair()
+        self.tnc.settimeout(5)
+        self.server = kiss.KISSServer(self.upstream, port=0, max_queued=2)
+
+    def tearDown(self):
+        """Teardown."""
+        self.server.stop()
+        self.upstream.interface.close()
+        self.upstream.interface = None
+        self.tnc.close()
+
+    def _connect(self, count):
+        clients = []
+        for _ in range(count):
+            client = socket.create_connection(('127.0.0.1', self.server.port))
+            client.settimeout(5)
+            self.addCleanup(client.close)
+            clients.append(client)
+        deadline = time.time() + 5
+        while len(self.server) < count and time.time() < deadline:
+            time.sleep(0.01)
+        return clients
+
+    def _recv_exactly(self, sock, length):
+        data = b''
+        while len(data) < length:
+            data += sock.recv(length - len(data))
+        return data
+
+    def test_broadcast(self):
+        """Tests upstream frames are sent to every client."""
+        self.server.start()
+        clients = self._connect(3)
+        data = kiss.Framer(2).encode(self.frames[0])
+        self.tnc.sendall(data)
+        for client in clients:
+            self.assertEqual(data, self._recv_exactly(client, len(data)))
+
+    def test_stop_closes_wakeup(self):
+        """Tests each start and stop cycle closes its wakeup sockets."""
+        for _ in range(2):
+            self.server.start()
+            wakeup = (self.server._wakeup_r, self.server._wakeup_w)  # NOQA pylint: disable=W0212
+            self.server.stop()
+            self.assertEqual([-1, -1], [sock.fileno() for sock in wakeup])
+        self.server.broadcast(self.frames[0])
+
+    def test_client_writes(self):
+        """Tests client frames are interleaved onto the upstream."""
+        self.server.listen()
+        clients = []
+        for _ in range(2):
+            clients.append(
+                socket.create_connection(('127.0.0.1', self.server.port)))
+            self.addCleanup(clients[-1].close)
+            while len(self.server) < len(clients):
+                self.server.poll(1)
+
+        clients[0].sendall(kiss.Framer().encode_many(self.frames[:3]))
+        clients[1].sendall(kiss.Framer(1, kiss.TX_DELAY).encode(b'\x28'))
+        time.sleep(0.1)
+        self.server.poll(1)
+
+        expected = b''.join([
+            kiss.Framer().encode(self.frames[0]),
+            kiss.Framer(1, kiss.TX_DELAY).encode(b'\x28'),
+            kiss.Framer().encode(self.frames[1]),
+            kiss.Framer().encode(self.frames[2]),
+        ])
+        self.assertEqual(expected, self._recv_exactly(self.tnc, len(expected)))
+        self.assertEqual(4, self.server.stats.frames_in)
+
+    def test_bounded_queues(self):
+        """Tests frames beyond `max_queued` are dropped per client."""
+        self.server.listen()
+        client = socket.create_connection(('127.0.0.1', self.server.port))
+        self.addCleanup(client.close)
+        client.settimeout(5)
+        while not len(self.server):
+            self.server.poll(1)
+
+        for frame in self.frames:
+            self.server.broadcast(b'\x00' + frame)
+        self.server.poll(1)
+
+        data = kiss.Framer().encode_many(self.frames[:2])
+        self.assertEqual(data, self._recv_exactly(client, len(data)))
+        self.assertEqual(3, self.server.stats.queue_drops)
+
+
+if __name__ == '__main__':
+    unittest.main()
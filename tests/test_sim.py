@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for KISS TNC Simulator Module."""
+
+import os
+import tempfile
+import time
+import unittest
+
+import kiss.sim
+
+from .context import kiss
+from .context import kiss_test_classes  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class SimulatedTNCTestCase(kiss_test_classes.KISSTestClass):  # NOQA pylint: disable=R0904
+
+    """Test class for KISS TNC Simulator."""
+
+    def setUp(self):
+        """Setup."""
+        self.frames = list(kiss.sim.beacon_frames('W2GMD-6', count=20))
+
+    def _read_frames(self, ks, count):
+        frames = []
+        while len(frames) < count:
+            frames.extend(ks.read(readmode=False))
+        return frames
+
+    def _wait_for(self, condition):
+        deadline = time.time() + 5
+        while not condition() and time.time() < deadline:
+            time.sleep(0.01)
+
+    def test_tcp(self):
+        """Tests a TCPKISS client against a fragmenting, jittery TNC."""
+        with kiss.sim.TCPTNC(
+                self.frames, rate=1000, jitter=0.5, fragment=7,
+                seed=1) as tnc:
+            ks = kiss.TCPKISS('127.0.0.1', tnc.port, strip_df_start=True)
+            ks.start()
+            self.assertEqual(self.frames, self._read_frames(ks, 20))
+
+            ks.write(self.frames[0])
+            ks.write_setting('TX_DELAY', 40)
+            self._wait_for(lambda: len(tnc.received) == 2)
+            ks.stop()
+            ks.interface.close()
+            ks.interface = None
+
+        self.assertEqual(20, tnc.sent)
+        self.assertEqual([self.frames[0]], tnc.data_frames)
+        self.assertEqual([(0, kiss.TX_DELAY, b'\x28')], tnc.settings)
+
+    def test_pty(self):
+        """Tests a SerialKISS client against a pseudo-terminal TNC."""
+        with kiss.sim.PTYTNC(
+                self.frames, fragment=50, delay=0.5, seed=1) as tnc:
+            ks = kiss.SerialKISS(tnc.port, 9600, strip_df_start=True)
+            ks.start(TX_DELAY=40)
+            self.assertEqual(self.frames, self._read_frames(ks, 20))
+
+            ks.write(self.frames[1])
+            self._wait_for(lambda: len(tnc.received) == 2)
+            ks.stop()
+
+        self.assertEqual([self.frames[1]], tnc.data_frames)
+        self.assertEqual([(0, kiss.TX_DELAY, b'\x28')], tnc.settings)
+
+    def test_pty_blocking_read(self):
+        """Tests blocking serial reads, and waking them on `stop()`."""
+        with kiss.sim.PTYTNC(
+                self.frames, rate=200, fragment=50, delay=0.5, seed=1) as tnc:
+            ks = kiss.SerialKISS(
+                tnc.port, 9600, strip_df_start=True, blocking_read=True)
+            self.assertEqual(96, ks.read_bytes)
+            ks.start_no_config()
+            self.assertIsNone(ks.interface.timeout)
+
+            received = []
+            ks.start_reader(received.append)
+            self._wait_for(lambda: len(received) == 20)
+            ks.stop()
+            ks.stop_reader(timeout=5)
+
+        self.assertEqual(self.frames, received)
+        self.assertIsNone(ks._reader)
+
+    def test_read_kiss_stream(self):
+        """Tests reading frames back from a raw KISS capture."""
+        with tempfile.NamedTemporaryFile(
+                suffix='.kiss', delete=False) as capture:
+            capture.write(kiss.Framer().encode_many(self.frames))
+        path = capture.name
+        self.addCleanup(os.remove, path)
+        self.assertEqual(self.frames, kiss.sim.read_kiss_stream(path))
+
+    def test_abstract(self):
+        """Tests the base simulated TNC can't be instantiated."""
+        with self.assertRaises(TypeError):
+            kiss.sim.SimulatedTNC(self.frames)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for KISS Speedups Extension."""
+
+import random
+import unittest
+
+from .context import kiss
+from .context import kiss_test_classes  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+SPEEDUPS = kiss.util._speedups  # pylint: disable=W0212
+
+# Bytes the codecs and deframer act upon, drawn often to cover edge cases.
+SPECIAL = b'\xC0\xDB\xDC\xDD'
+
+
+def _noise(rng, length):
+    """Random bytes, a third of them special."""
+    return bytes(
+        rng.choice(SPECIAL) if rng.random() < 0.33 else rng.randrange(256)
+        for _ in range(length))
+
+
+@unittest.skipIf(SPEEDUPS is None, 'kiss._speedups is not built')
+class SpeedupsTestCase(kiss_test_classes.KISSTestClass):  # NOQA pylint: disable=R0904
+
+    """Test class for KISS Speedups Extension."""
+
+    def setUp(self):
+        """Setup."""
+        self.rng = random.Random(2017)
+
+    def test_codecs(self):
+        """Tests the escape codecs match the pure-Python versions."""
+        for length in list(range(8)) * 50 + [100, 1000]:
+            data = _noise(self.rng, length)
+            self.assertEqual(
+                kiss.util.py_escape_special_codes(data),
+                SPEEDUPS.escape_special_codes(data))
+            self.assertEqual(
+                kiss.util.py_recover_special_codes(data),
+                SPEEDUPS.recover_special_codes(data))
+            self.assertEqual(
+                kiss.util.py_recover_special_codes(data),
+                SPEEDUPS.recover_special_codes(memoryview(data)))
+        self.assertEqual(b'\xDB\xDC', SPEEDUPS.escape_special_codes(
+            bytearray(b'\xC0')))
+
+    def test_batch_codecs(self):
+        """Tests the batch codecs match the pure-Python versions."""
+        for count in (0, 1, 2, 10, 100):
+            frames = [_noise(self.rng, self.rng.randint(0, 40))
+                      for _ in range(count)]
+            for many, py_many in (
+                    (kiss.util.escape_many, kiss.util.py_escape_many),
+                    (kiss.util.recover_many, kiss.util.py_recover_many)):
+                self.assertEqual(py_many(frames), many(frames))
+                self.assertEqual(
+                    py_many(frames), many(list(map(memoryview, frames))))
+
+        with self.assertRaises(ValueError):
+            SPEEDUPS.escape_many([b'a'], kiss.util.array.array('L', [0]))
+        with self.assertRaises(TypeError):
+            SPEEDUPS.recover_many(
+                [b'a', None], kiss.util.array.array('L', [0] * 3))
+
+    def _assert_same(self, data, max_frame_size):
+        """Feeds both backends the same randomly sized chunks."""
+        python = kiss.Deframer(
+            buffer_size=8, stats=kiss.Stats(), max_frame_size=max_frame_size)
+        compiled = kiss.Deframer(
+            buffer_size=8, stats=kiss.Stats(), max_frame_size=max_frame_size)
+        position = 0
+        while position < len(data):
+            size = self.rng.randint(0, 40)
+            chunk = data[position:position + size]
+            position += size
+            self.assertEqual(
+                python._feed_python(chunk),
+                compiled._feed_speedups(memoryview(chunk)))
+            self.assertEqual(
+                (python._length, python._escape, python._discard,
+                 bytes(python._view[:python._length])),
+                (compiled._length, compiled._escape, compiled._discard,
+                 bytes(compiled._view[:compiled._length])))
+
+        expected = python.stats.snapshot()
+        actual = compiled.stats.snapshot()
+        self.assertEqual(
+            expected.pop('latency')['count'], actual.pop('latency')['count'])
+        self.assertEqual(expected, actual)
+
+    def test_deframe(self):
+        """Tests the deframer matches the pure-Python version."""
+        for max_frame_size in (None, 16, 64):
+            for _ in range(20):
+                self._assert_same(
+                    _noise(self.rng, 2000), max_frame_size)
+
+    def test_deframe_traffic(self):
+        """Tests the deframer on well-formed frames."""
+        frames = [_noise(self.rng, self.rng.randint(1, 300))
+                  for _ in range(200)]
+        stream = b''.join(kiss.Framer().encode(frame) for frame in frames)
+        self._assert_same(stream, None)
+        self.assertEqual(
+            [b'\x00' + frame for frame in frames],
+            kiss.Deframer()._feed_speedups(stream))
+
+    def test_filters(self):
+        """Tests deframers with a filter use the pure-Python backend."""
+        deframer = kiss.Deframer(
+            frame_filter=kiss.filters.compile_filters([kiss.by_port(1)]))
+        frames = deframer.feed(
+            kiss.Framer(0).encode(b'a') + kiss.Framer(1).encode(b'b'))
+        self.assertEqual([b'\x10b'], frames)
+
+
+if __name__ == '__main__':
+    unittest.main()
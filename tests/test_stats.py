@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for KISS Stats Module."""
+
+import unittest
+import urllib.request
+
+from .context import kiss
+from .context import kiss_test_classes  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class StatsTestCase(kiss_test_classes.KISSTestClass):  # NOQA pylint: disable=R0904
+
+    """Test class for KISS Stats."""
+
+    def setUp(self):
+        """Setup."""
+        self.test_frame = kiss.ax25.encode_ui('APRS', 'W2GMD-6', info=b'>hi')
+        self.kiss_frame = kiss.Framer().encode(self.test_frame)
+
+    def test_read_counters(self):
+        """Tests counting frames, bytes, errors and drops on read."""
+        data = b''.join([
+            self.kiss_frame,
+            kiss.FEND, b'\x00abc', kiss.FESC, kiss.FEND,
+            kiss.FEND, b'\x00a', kiss.FESC, b'Z', kiss.FEND,
+        ])
+        ks = kiss.KISS()
+        ks._read_handler = lambda read_bytes=None: data
+        frames = ks.read(readmode=False)
+
+        stats = ks.stats.snapshot()
+        self.assertEqual(2, len(frames))
+        self.assertEqual(len(data), stats['bytes_in'])
+        self.assertEqual(2, stats['frames_in'])
+        self.assertEqual(1, stats['frames_aborted'])
+        self.assertEqual(1, stats['escape_errors'])
+        self.assertEqual(2, stats['latency']['count'])
+
+        ks._read_handler = lambda read_bytes=None: self.kiss_frame
+        ks.read(readmode=False, filters=[kiss.by_source('N0CALL')])
+        self.assertEqual(1, ks.stats.frames_dropped)
+
+    def test_write_counters(self):
+        """Tests counting frames and bytes written."""
+        written = []
+        ks = kiss.KISS()
+        ks._write_handler = written.append
+        ks.write(self.test_frame)
+        ks.write_many([self.test_frame] * 2)
+        self.assertEqual(3, ks.stats.frames_out)
+        self.assertEqual(sum(map(len, written)), ks.stats.bytes_out)
+
+    def test_latency(self):
+        """Tests latency spans the chunks a frame arrives in."""
+        deframer = kiss.Deframer(stats=kiss.Stats())
+        deframer.feed(self.kiss_frame[:5])
+        deframer._started -= 0.2
+        deframer.feed(self.kiss_frame[5:])
+        latency = deframer.stats.latency.snapshot()
+        self.assertEqual(0, latency['buckets'][0.1])
+        self.assertEqual(1, latency['buckets'][0.5])
+        self.assertGreaterEqual(latency['sum'], 0.2)
+
+    def test_stats_server(self):
+        """Tests serving stats in Prometheus text format."""
+        ks = kiss.KISS()
+        ks._write_handler = lambda frame: None
+        ks.write(self.test_frame)
+        with kiss.StatsServer({'tnc0': ks.stats}, port=0) as server:
+            url = 'http://127.0.0.1:{}/metrics'.format(server.port)
+            body = urllib.request.urlopen(url).read().decode('utf-8')
+
+        self.assertIn('# TYPE kiss_frames_out_total counter', body)
+        self.assertIn('kiss_frames_out_total{interface="tnc0"} 1\n', body)
+        self.assertIn(
+            'kiss_frame_latency_seconds_bucket{interface="tnc0",le="+Inf"} 0',
+            body)
+        self.assertIn('kiss_frame_latency_seconds_count{interface="tnc0"} 0',
+                      body)
+
+
+if __name__ == '__main__':
+    unittest.main()
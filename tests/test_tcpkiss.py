@@ -3,6 +3,8 @@
 
 """Tests for TCPKISS Class."""
 
+import socket
+import threading
 import unittest
 
 import aprs
@@ -40,6 +42,224 @@ class TCPKISSTestCase(kiss_test_classes.KISSTestClass):
         """Teardown."""
         self.test_frames.close()
 
+    def test_read_zero_copy(self):
+        """Tests reading frames through the reusable receive buffer."""
+        frame = self.test_frame.split(b'\n')[0]
+        kiss_frame = b''.join([
+            kiss.FEND,
+            kiss.DATA_FRAME,
+            kiss.escape_special_codes(frame),
+            kiss.FEND
+        ])
+
+        ks = kiss.TCPKISS(
+            host=self.random_host, port=self.random_port, zero_copy=True)
+        ks.interface, peer = socket.socketpair()
+
+        peer.sendall(kiss_frame[:20])
+        self.assertEqual([], ks.read(read_bytes=20, readmode=False))
+        peer.sendall(kiss_frame[20:] + kiss_frame)
+
+        frames = []
+        while len(frames) < 2:
+            frames.extend(ks.read(read_bytes=20, readmode=False))
+
+        self.assertEqual([b''.join([kiss.DATA_FRAME, frame])] * 2, frames)
+        self.assertIsInstance(frames[0], bytes)
+
+        peer.close()
+        ks.interface.close()
+        ks.interface = None
+
+    def _socketpair_kiss(self):
+        ks = kiss.TCPKISS(host=self.random_host, port=self.random_port)
+        ks.interface, peer = socket.socketpair()
+        ks._write_handler = ks.interface.sendall
+        self.addCleanup(peer.close)
+        return ks, peer
+
+    def _recv_exactly(self, peer, length):
+        data = b''
+        while len(data) < length:
+            data += peer.recv(length - len(data))
+        return data
+
+    def test_write_many(self):
+        """Tests writing a batch of frames in one flush."""
+        frames = [self.random(20).encode(), kiss.FEND, kiss.FESC]
+        kiss_frames = b''.join([
+            b''.join([kiss.FEND, kiss.DATA_FRAME,
+                      kiss.escape_special_codes(frame), kiss.FEND])
+            for frame in frames
+        ])
+        ks, peer = self._socketpair_kiss()
+        ks.write_many(frames)
+        self.assertEqual(
+            kiss_frames, self._recv_exactly(peer, len(kiss_frames)))
+
+    def test_write_flush_size(self):
+        """Tests writes are queued until `flush_size` bytes are queued."""
+        ks, peer = self._socketpair_kiss()
+        ks.flush_size = 100
+        peer.setblocking(False)
+
+        ks.write(b'A' * 40)
+        ks.write(b'B' * 40)
+        with self.assertRaises(BlockingIOError):
+            peer.recv(1000)
+
+        ks.write(b'C' * 40)
+        peer.setblocking(True)
+        self.assertEqual(129, len(self._recv_exactly(peer, 129)))
+
+    def test_write_flush_interval(self):
+        """Tests queued writes are flushed after `flush_interval`."""
+        ks, peer = self._socketpair_kiss()
+        ks.flush_size = 1000
+        ks.flush_interval = 0.01
+        ks.write(b'A' * 40)
+        peer.settimeout(5)
+        self.assertEqual(43, len(self._recv_exactly(peer, 43)))
+
+    def test_flush_partial_sends(self):
+        """Tests flushing resumes after partial sends."""
+        sent = []
+
+        class ShortSocket(object):
+            """Socket that sends at most 5 bytes per call."""
+            @staticmethod
+            def sendmsg(buffers):
+                data = b''.join(buffers)[:5]
+                sent.append(data)
+                return len(data)
+
+        ks = kiss.TCPKISS(host=self.random_host, port=self.random_port)
+        ks.interface = ShortSocket()
+        ks.flush_size = 1000
+        ks.write_many([b'abc', b'defgh', b'ij'])
+        ks.flush()
+        ks.interface = None
+
+        self.assertEqual(
+            b'\xc0\x00abc\xc0\xc0\x00defgh\xc0\xc0\x00ij\xc0',
+            b''.join(sent))
+
+    def test_write_port(self):
+        """Tests frames are written with the port in the command byte."""
+        ks, peer = self._socketpair_kiss()
+        ks.write(b'abc', port=2)
+        self.assertEqual(b'\xc0\x20abc\xc0', self._recv_exactly(peer, 6))
+
+    def test_write_setting_port(self):
+        """Tests settings are written with the port in the command byte."""
+        ks, peer = self._socketpair_kiss()
+        ks.write_setting('TX_DELAY', 40, port=1)
+        self.assertEqual(b'\xc0\x11\x28\xc0', self._recv_exactly(peer, 4))
+
+    def test_read_port_callbacks(self):
+        """Tests frames are routed to the callback for their port."""
+        ks, peer = self._socketpair_kiss()
+        ks.strip_df_start = True
+        port_1 = []
+        ks.port_callbacks[1] = port_1.append
+
+        peer.sendall(b'\xc0\x00zero\xc0\xc0\x10one\xc0\xc0\x20two\xc0')
+        frames = []
+        while len(frames) + len(port_1) < 3:
+            frames.extend(ks.read(readmode=False))
+
+        self.assertEqual([b'zero', b'two'], frames)
+        self.assertEqual([b'one'], port_1)
+
+    def test_read_closed(self):
+        """Tests reading raises SocketClosetError once the peer closes."""
+        ks, peer = self._socketpair_kiss()
+        peer.sendall(b'\xc0\x00abc\xc0')
+        self.assertEqual([b'\x00abc'], ks.read(readmode=False))
+        peer.close()
+        with self.assertRaises(kiss.SocketClosetError):
+            ks.read(readmode=False)
+
+    def test_read_idle_timeout(self):
+        """Tests reading raises SocketClosetError after `idle_timeout`."""
+        ks, _ = self._socketpair_kiss()
+        ks.idle_timeout = 0.05
+        ks.interface.settimeout(ks.idle_timeout)
+        with self.assertRaises(kiss.SocketClosetError):
+            ks.read(readmode=False)
+
+    def test_reconnect_read(self):
+        """Tests reading resumes on a new connection after the peer closes."""
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.addCleanup(server.close)
+        server.bind(('127.0.0.1', 0))
+        server.listen(2)
+        server.settimeout(5)
+
+        ks = kiss.TCPKISS(
+            '127.0.0.1', server.getsockname()[1], strip_df_start=True,
+            reconnect=True, keepalive=30)
+        ks.start()
+        self.addCleanup(ks.stop)
+        self.assertEqual(
+            1, ks.interface.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE))
+
+        def serve():
+            first, _ = server.accept()
+            first.sendall(b'\xc0\x00one\xc0\xc0\x00tr')
+            first.close()
+            second, _ = server.accept()
+            self.addCleanup(second.close)
+            second.sendall(b'\xc0\x00two\xc0')
+
+        serving = threading.Thread(target=serve)
+        serving.start()
+        frames = []
+        while len(frames) < 2:
+            frames.extend(ks.read(readmode=False))
+        serving.join()
+
+        self.assertEqual([b'one', b'two'], frames)
+        self.assertEqual(1, ks.stats.reconnects)
+
+    def test_reconnect_write(self):
+        """Tests frames being flushed are resent after reconnecting."""
+        sent = []
+
+        class BrokenSocket(object):
+            """Socket that sends 3 bytes and then fails."""
+            calls = 0
+
+            def sendmsg(self, buffers):
+                self.calls += 1
+                if self.calls > 1:
+                    raise BrokenPipeError()
+                return 3
+
+            def close(self):
+                """Closes nothing."""
+                pass
+
+        class GoodSocket(object):
+            """Socket that sends everything."""
+            @staticmethod
+            def sendmsg(buffers):
+                sent.append(b''.join(buffers))
+                return len(sent[-1])
+
+        ks = kiss.TCPKISS(
+            host=self.random_host, port=self.random_port, reconnect=True)
+        ks.interface = BrokenSocket()
+        ks._connect = lambda: setattr(ks, 'interface', GoodSocket())
+        ks.flush_size = 1000
+        ks.write_many([b'abc'])
+        ks.write(b'def')
+        ks.flush()
+        ks.interface = None
+
+        self.assertEqual([b'\xc0\x00abc\xc0\xc0\x00def\xc0'], sent)
+        self.assertEqual(1, ks.stats.reconnects)
+
     @mocketize
     def _test_write(self):
         frame = "%s>%s:%s" % (
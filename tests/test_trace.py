@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for KISS Trace Logging."""
+
+import logging
+import unittest
+
+from .context import kiss
+from .context import kiss_test_classes  # pylint: disable=R0801
+
+__author__ = 'Greg Albrecht W2GMD <oss@undef.net>'  # NOQA pylint: disable=R0801
+__copyright__ = 'Copyright 2017 Greg Albrecht and Contributors'  # NOQA pylint: disable=R0801
+__license__ = 'Apache License, Version 2.0'  # NOQA pylint: disable=R0801
+
+
+class TraceTestCase(kiss_test_classes.KISSTestClass):  # NOQA pylint: disable=R0904
+
+    """Test class for KISS Trace Logging."""
+
+    def setUp(self):
+        """Setup."""
+        self.frames = [
+            kiss.ax25.encode_ui('APRS', 'W2GMD-6', info=str(i).encode())
+            for i in range(10)]
+
+    def test_trace_sample(self):
+        """Tests 1 in N frames read and written are logged."""
+        data = kiss.Framer(port=1).encode_many(self.frames[:7])
+        chunks = [data[:40], data[40:]]
+        ks = kiss.KISS()
+        ks.trace_sample = 3
+        ks._read_handler = lambda read_bytes=None: chunks.pop(0)
+        ks._write_handler = lambda frame: None
+
+        with self.assertLogs('kiss.classes.trace', logging.INFO) as logs:
+            ks.read(readmode=False)
+            ks.read(readmode=False)
+            ks.write_many(self.frames[:4], port=2)
+
+        self.assertEqual(4, len(logs.output))
+        self.assertIn('direction=rx port=1 command=0x00', logs.output[0])
+        self.assertIn(repr(self.frames[3]), logs.output[1])
+        self.assertIn(repr(self.frames[6]), logs.output[2])
+        self.assertIn('direction=tx port=2', logs.output[3])
+        self.assertIn(repr(self.frames[2]), logs.output[3])
+
+    def test_trace_needs_debug(self):
+        """Tests `trace` is only enabled along with DEBUG logging."""
+        ks = kiss.KISS()
+        level = ks._logger.level
+        self.addCleanup(ks._logger.setLevel, level)
+
+        ks._logger.setLevel(logging.INFO)
+        ks.trace = True
+        self.assertFalse(ks.trace)
+
+        ks._logger.setLevel(logging.DEBUG)
+        ks.trace = True
+        self.assertTrue(ks.trace)
+
+
+if __name__ == '__main__':
+    unittest.main()